@@ -348,9 +348,9 @@ class CMIP6_MIPTable():
         if table_freq is None:
             raise ValueError()
         elif table_freq == 'clim':
-            self.frequency = CMIP6DateFrequency('mon')
+            self.frequency = CMIP6DateFrequency.from_struct('mon')
         else:
-            self.frequency = CMIP6DateFrequency(table_freq)
+            self.frequency = CMIP6DateFrequency.from_struct(table_freq)
         if self.table_qualifier == 'Z':
             self.spatial_avg = 'zonal_mean'
         else:
@@ -538,7 +538,7 @@ class CMIP6_DRSFilename(CMIP6_VariantLabel, CMIP6_MIPTable, CMIP6_GridLabel):
                 raise util.DataclassParseError(("Inconsistent filename parse: "
                     f"cannot determine if '{self.filename}' represents static data."))
         else:
-            self.date_range = util.DateRange(self.start_date, self.end_date)
+            self.date_range = util.DateRange.from_struct(self.start_date, self.end_date)
             if self.frequency.is_static: # frequency inferred from table_id
                 raise util.DataclassParseError(("Inconsistent filename parse: "
                     f"cannot determine if '{self.filename}' represents static data."))
@@ -935,6 +935,8 @@ class MDTFFramework(MDTFObjectBase):
     def parse_flags(self, cli_obj):
         if cli_obj.config.get('dry_run', False):
             cli_obj.config['test_mode'] = True
+        if cli_obj.config.get('disable_type_checks', False):
+            util.set_dataclass_type_checks(False)
 
         if cli_obj.config.get('disable_preprocessor', False):
             _log.warning(("User disabled metadata checks and unit conversion in "
@@ -1157,7 +1159,9 @@ class MDTFFramework(MDTFObjectBase):
             self.cases = new_d
             util.transfer_log_cache(close=True)
 
+            pipeline = ConfigManager().get('pipeline_pods', False)
             for case_name, case in self.cases.items():
+                run_mgr = None
                 if not case.failed:
                     if type(case).__name__ ==  'NoPPDataSource':
                         _log.info("### %s: Skipping Data Preprocessing for case '%s'."
@@ -1167,15 +1171,38 @@ class MDTFFramework(MDTFObjectBase):
                     else:
                         _log.info("### %s: requesting data for case '%s'.",
                                   self.full_name, case_name)
-                        case.request_data()
+                        if pipeline:
+                            # start each POD as soon as its own data is ready
+                            run_mgr = self.RuntimeManager(
+                                case, self.EnvironmentManager,
+                                OutMgrClass=self.OutputManager
+                            )
+                            run_mgr.setup()
+                            run_mgr.set_signal_handlers()
+                            try:
+                                case.request_data(
+                                    on_pod_ready=run_mgr.submit_pod,
+                                    on_poll=run_mgr.poll_pods
+                                )
+                            except SystemExit:
+                                # killed during the data request, which replaces
+                                # the signal handlers: stop PODs already started
+                                run_mgr.runtime_terminate()
+                                raise
+                        else:
+                            case.request_data()
                 else:
                     _log.info(("### %s: initialization for case '%s' failed; skipping "
                                f"data request."), self.full_name, case_name)
 
-                if not case.failed:
+                if not case.failed or run_mgr is not None:
                     _log.info("### %s: running case '%s'.", self.full_name, case_name)
-                    run_mgr = self.RuntimeManager(case, self.EnvironmentManager)
-                    run_mgr.setup()
+                    if run_mgr is None:
+                        run_mgr = self.RuntimeManager(
+                            case, self.EnvironmentManager,
+                            OutMgrClass=self.OutputManager
+                        )
+                        run_mgr.setup()
                     run_mgr.run()
                 else:
                     _log.info(("### %s: Data request for case '%s' failed; skipping "
@@ -1226,7 +1253,8 @@ class MDTFFramework(MDTFObjectBase):
 
             if not any(p.failed for p in self.pods.values()):
                 _log.info("### %s: running pods '%s'.", self.full_name, [p for p in pod_dict.keys()])
-                run_mgr = self.RuntimeManager(self.pods, self.EnvironmentManager, self)
+                run_mgr = self.RuntimeManager(self.pods, self.EnvironmentManager, self,
+                                              OutMgrClass=self.OutputManager)
                 run_mgr.setup()
                 run_mgr.run(self)
             else:
@@ -1244,6 +1272,26 @@ class MDTFFramework(MDTFObjectBase):
 # --------------------------------------------------------------------
 
 
+def log_resource_usage(pods):
+    """Log the resources used by each of *pods* that was run, as recorded by
+    the RuntimeManager, starting with the POD that used the most CPU time.
+    """
+    def _mb(x):
+        return 'n/a' if x is None else f"{x / (1024 * 1024):.1f} mb"
+
+    usage = [(p.name, getattr(p, 'resource_usage', None)) for p in pods]
+    usage = [(name, u) for name, u in usage if u]
+    if not usage:
+        return
+    usage.sort(key=(lambda t: t[1]['user_time'] + t[1]['sys_time']), reverse=True)
+    _log.info("\tResources used by each POD:")
+    for name, u in usage:
+        _log.info((f"\t  {name}: {u['wall_time']:.1f} s wall, "
+            f"{u['user_time'] + u['sys_time']:.1f} s CPU, "
+            f"{_mb(u['max_rss'])} peak RSS, {_mb(u['read_bytes'])} read, "
+            f"{_mb(u['write_bytes'])} written"))
+
+
 def print_summary(fmwk):
     def summary_info_tuple(case):
         """Debug information; will clean this up.
@@ -1277,12 +1325,14 @@ def print_summary(fmwk):
                     _log.info((f"\tThe following PODs raised errors: "
                         f"{', '.join(tup[0])}"))
             _log.info(f"\tOutput written to {tup[2]}")
+            log_resource_usage(getattr(fmwk.cases[case_name], 'pods', dict()).values())
     else:
         _log.info(f"Exiting normally.")
         for case_name, tup in d.items():
             _log.info(f"Summary for {case_name}:")
             _log.info(f"\tAll PODs exited normally.")
             _log.info(f"\tOutput written to {tup[2]}")
+            log_resource_usage(getattr(fmwk.cases[case_name], 'pods', dict()).values())
 
 
 def print_multirun_summary(fmwk):
@@ -1312,10 +1362,12 @@ def print_multirun_summary(fmwk):
                     _log.info((f"\tThe following PODs raised errors: "
                                f"{', '.join(tup[0])}"))
             _log.info(f"\tOutput written to {tup[2]}")
+            log_resource_usage([fmwk.pods[case_name]])
     else:
         _log.info(f"Exiting normally.")
         for case_name, tup in d.items():
             _log.info(f"Summary for {case_name}:")
             _log.info(f"\tAll PODs exited normally.")
             _log.info(f"\tOutput written to {tup[2]}")
+            log_resource_usage([fmwk.pods[case_name]])
         fmwk.status = ObjectStatus.SUCCEEDED
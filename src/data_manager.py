@@ -9,6 +9,7 @@ import os
 import textwrap
 import typing
 from abc import ABC
+import numpy as np
 import pandas as pd
 
 from src import util, core, varlistentry_util, diagnostic, pod_setup, preprocessor
@@ -339,6 +340,119 @@ class DataframeQueryColumnSpec(metaclass=util.MDTFABCMeta):
             (self.expt_cols, self.pod_expt_cols, self.var_expt_cols))
 
 
+class DataframeCatalogIndex():
+    """Lookup structures for a catalog DataFrame used by
+    :class:`DataframeQueryDataSourceBase`, built lazily the first time they're
+    needed and reused for all subsequent queries against the same catalog.
+
+    - A hash index on each string-valued column used in an equality clause,
+      mapping column values to the positions of the rows containing them, so
+      that queries on attributes like variable_id or realm cost O(matches)
+      instead of a scan of the full catalog.
+    - Categorical columns containing the values of the experiment key
+      (:meth:`DataFrameQueryColumnGroup.expt_key`) for each row of the catalog,
+      so that query results can be grouped by experiment without calling a
+      Python function on each row.
+    - int64 arrays encoding the start and end dates of each
+      :class:`~src.util.DateRange` column, for vectorized overlap tests.
+    """
+    def __init__(self, df, col_spec):
+        self.df = df
+        self.col_spec = col_spec
+        self._col_indices = dict()
+        self._expt_keys = None
+        self._daterange_bounds = dict()
+
+    def col_index(self, col_name):
+        """Return a dict mapping the values of column *col_name* to arrays of
+        row positions, or None if the column doesn't only contain strings.
+        """
+        if col_name not in self._col_indices:
+            col = self.df[col_name]
+            if pd.api.types.infer_dtype(col, skipna=True) == 'string':
+                self._col_indices[col_name] = col.groupby(col, sort=False).indices
+            else:
+                self._col_indices[col_name] = None
+        return self._col_indices[col_name]
+
+    def lookup(self, query_d):
+        """Return a sorted array of the positions of the rows whose values
+        equal those in *query_d*, a dict mapping column names to strings.
+        """
+        pos_list = []
+        for col_name, val in query_d.items():
+            pos = self.col_index(col_name).get(val, None)
+            if pos is None:
+                return np.array([], dtype=np.intp)
+            pos_list.append(pos)
+        pos_list.sort(key=len)
+        positions = pos_list[0]
+        for pos in pos_list[1:]:
+            positions = np.intersect1d(positions, pos, assume_unique=True)
+        return np.sort(positions)
+
+    @staticmethod
+    def _encode_datetimes(dts):
+        """Encode a sequence of :py:class:`~datetime.datetime` objects as an
+        int64 numpy array (microseconds since the Unix epoch), for vectorized
+        comparisons. Covers the full range of :py:class:`~datetime.datetime`,
+        including the endpoints of :data:`~src.util.FXDateRange`.
+        """
+        return np.array(dts, dtype='datetime64[us]').astype(np.int64)
+
+    def daterange_bounds(self, col_name):
+        """Return a tuple of int64 arrays encoding the start and end of the
+        :class:`~src.util.DateRange` in each row of column *col_name*.
+        """
+        if col_name not in self._daterange_bounds:
+            col = self.df[col_name]
+            self._daterange_bounds[col_name] = (
+                self._encode_datetimes([dtr.lower for dtr in col]),
+                self._encode_datetimes([dtr.upper for dtr in col])
+            )
+        return self._daterange_bounds[col_name]
+
+    def daterange_overlaps(self, col_name, date_range):
+        """Return a boolean array selecting the rows whose
+        :class:`~src.util.DateRange` in column *col_name* overlaps
+        *date_range*. Equivalent to calling
+        :meth:`~src.util.DateRange.overlaps` on each row, but vectorized:
+        DateRanges are half-open intervals [lower, upper), so the test is
+        ``start < date_range.upper`` and ``end > date_range.lower``.
+        """
+        start, end = self.daterange_bounds(col_name)
+        lower, upper = self._encode_datetimes([date_range.lower, date_range.upper])
+        return (start < upper) & (end > lower)
+
+    @property
+    def expt_keys(self):
+        """Tuple of Categoricals containing the values of the (case-, pod- and
+        var-wide) experiment keys for each row of the catalog. String
+        conversion matches :meth:`DataFrameQueryColumnGroup.expt_key`.
+        """
+        if self._expt_keys is None:
+            keys = []
+            for col_group in (self.col_spec.expt_cols,
+                self.col_spec.pod_expt_cols, self.col_spec.var_expt_cols):
+                col_strs = [
+                    [str(x) for x in self.df[col].astype(object)] \
+                    for col in col_group.key_cols
+                ]
+                if col_strs:
+                    key = ['|'.join(row_strs) for row_strs in zip(*col_strs)]
+                else:
+                    key = [''] * len(self.df)
+                keys.append(pd.Categorical(key))
+            self._expt_keys = tuple(keys)
+        return self._expt_keys
+
+    def expt_key_groupers(self, positions):
+        """Return the experiment key values for the rows at *positions*, in a
+        form that can be passed to DataFrame.groupby.
+        """
+        return [k.take(positions) for k in self.expt_keys]
+
+
 class DataframeQueryDataSourceBase(DataSourceBase, metaclass=util.MDTFABCMeta):
     """DataSource which queries a data catalog made available as a pandas
     DataFrame, and includes logic for selecting experiment based on column values.
@@ -406,6 +520,84 @@ class DataframeQueryDataSourceBase(DataSourceBase, metaclass=util.MDTFABCMeta):
         else:
             return f"(`{col_name}` == @{_attrs}.{query_attr_name})"
 
+    @property
+    def catalog_index(self):
+        """:class:`DataframeCatalogIndex` for the current catalog; rebuilt if the
+        catalog DataFrame is replaced.
+        """
+        cat_index = self.__dict__.get('_catalog_index', None)
+        if cat_index is None or cat_index.df is not self.df:
+            cat_index = DataframeCatalogIndex(self.df, self.col_spec)
+            self.__dict__['_catalog_index'] = cat_index
+        return cat_index
+
+    def daterange_overlaps(self, col_name, date_range):
+        """Return a boolean array selecting the rows of the catalog whose
+        :class:`~src.util.DateRange` in column *col_name* overlaps
+        *date_range*; see :meth:`DataframeCatalogIndex.daterange_overlaps`.
+        """
+        try:
+            return self.catalog_index.daterange_overlaps(col_name, date_range)
+        except (AttributeError, TypeError, ValueError) as exc:
+            # catalog entries aren't all DateRanges; fall back to the slow path
+            self.log.debug("Can't vectorize date range query on '%s': %r.",
+                           col_name, exc)
+            return self.df[col_name].map(lambda dtr: dtr.overlaps(date_range)).to_numpy(dtype=bool)
+
+    def _select_catalog(self, query_d):
+        """Return the rows of the catalog matching the attribute values in
+        *query_d*.
+
+        Equality tests on string-valued columns are done by lookup in the hash
+        indices of :attr:`catalog_index`. Filtering on DateRange is done
+        separately, due to limitations on pd.query()/pd.eval() -- arbitrary
+        method calls not supported -- by comparing against cached numeric
+        start/end values. Remaining clauses are translated with
+        :meth:`_query_clause` and evaluated with DataFrame.query() on the
+        selected rows.
+        """
+        cat_index = self.catalog_index
+        index_d = dict()
+        clauses = []
+        for k, v in query_d.items():
+            clause = self._query_clause(k, k, v)
+            if not clause:
+                continue
+            if isinstance(v, str) and k not in ('min_frequency', 'max_frequency') \
+                and cat_index.col_index(k) is not None:
+                index_d[k] = v
+            else:
+                clauses.append(clause)
+        query_str = '&'.join(clauses)
+
+        row_sel = None
+        for col_name, v in query_d.items():
+            if isinstance(v, util.DateRange):
+                if col_name not in self.df:
+                    # e.g., for sample model data where date_range not in catalog
+                    continue
+                # select files whose date range overlaps analysis date range
+                # (in case we're dealing with chunked/multi-file data)
+                col_sel = self.daterange_overlaps(col_name, v)
+                row_sel = col_sel if row_sel is None else (row_sel & col_sel)
+
+        if index_d:
+            positions = cat_index.lookup(index_d)
+            if row_sel is not None:
+                positions = positions[row_sel[positions]]
+            catalog_df = self.df.iloc[positions]
+        elif row_sel is not None:
+            catalog_df = self.df[row_sel]
+        else:
+            catalog_df = self.df
+
+        if not query_str:
+            return catalog_df
+        return catalog_df.query(
+            query_str,
+            local_dict={'d': util.NameSpace.fromDict(query_d)}
+        )
+
     def _query_catalog(self, var):
         """Construct and execute the query to determine whether data matching
         var is present in the catalog.
@@ -414,35 +606,26 @@ class DataframeQueryDataSourceBase(DataSourceBase, metaclass=util.MDTFABCMeta):
         (returning a dataframe with results) from the processing of those
         results, in order to simplify overriding by child classes.
         """
-        # contruct query string for non-DateRange attributes
         query_d = util.WormDict()
         query_d.update(dc.asdict(self.attrs))
         field_synonyms = getattr(self, '_query_attrs_synonyms', dict())
         query_d.update(var.query_attrs(field_synonyms))
-        clauses = [self._query_clause(k, k, v) for k,v in query_d.items()]
-        query_str = '&'.join(c for c in clauses if c)
-
-        # filtering on DateRange is done here, separately, due to limitations on
-        # pd.query()/pd.eval() -- arbitrary method calls not supported, at least
-        # not efficiently. TODO: better implementation with <=/>= separate
-        # start/end date columns.
-        catalog_df = self.df
-        for col_name, v in query_d.items():
-            if isinstance(v, util.DateRange):
-                if col_name not in catalog_df:
-                    # e.g., for sample model data where date_range not in catalog
-                    continue
-                # select files whose date range overlaps analysis date range
-                # (in case we're dealing with chunked/multi-file data)
-                row_sel = catalog_df.apply(
-                    (lambda r: r[col_name].overlaps(v)),
-                    axis=1
-                )
-                catalog_df = catalog_df[row_sel]
+        return self._select_catalog(query_d)
 
-        return catalog_df.query(
-            query_str,
-            local_dict={'d': util.NameSpace.fromDict(query_d)}
+    def _group_by_expt(self, query_df):
+        """Group the rows of *query_df*, the result of :meth:`_query_catalog`,
+        by their experiment key (:meth:`DataframeQueryColumnSpec.expt_key`),
+        using the precomputed keys in :attr:`catalog_index`.
+        """
+        cat_index = self.catalog_index
+        positions = self.df.index.get_indexer(query_df.index)
+        if (positions < 0).any():
+            # query_df rows not from the catalog; compute keys row by row
+            return query_df.groupby(
+                by=(lambda idx: self.col_spec.expt_key(query_df, idx))
+            )
+        return query_df.groupby(
+            by=cat_index.expt_key_groupers(positions), observed=True, sort=True
         )
 
     def check_group_daterange(self, group_df, expt_key=None, log=_log):
@@ -495,9 +678,7 @@ class DataframeQueryDataSourceBase(DataSourceBase, metaclass=util.MDTFABCMeta):
         query_df = self._query_catalog(var)
         # assign set of sets of catalog row indices to var's data attr
         # filter out empty entries = queries that failed.
-        expt_groups = query_df.groupby(
-            by=(lambda idx: self.col_spec.expt_key(query_df, idx))
-        )
+        expt_groups = self._group_by_expt(query_df)
         var.data = util.ConsistentDict()
         for expt_key, group in expt_groups:
             group = self.check_group_daterange(group, expt_key=expt_key, log=var.log)
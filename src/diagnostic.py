@@ -4,6 +4,7 @@
 from abc import ABC
 import os
 import dataclasses as dc
+import importlib.util
 import io
 import itertools
 import typing
@@ -733,11 +734,11 @@ class MultirunVarlist(Varlist, ABC):
         convention won't be found by the POD.
         """
         if var.is_static:
-            f_name = f"{self.name}.{var.name}.static.nc"
+            f_name = f"{self.name}.{var.name}.static{pod.data_file_suffix}"
             return os.path.join(pod.POD_WK_DIR, f_name)
         else:
             freq = var.T.frequency.format_local()
-            f_name = f"{self.name}.{var.name}.{freq}.nc"
+            f_name = f"{self.name}.{var.name}.{freq}{pod.data_file_suffix}"
             return os.path.join(pod.POD_WK_DIR, freq, f_name)
 
     @classmethod
@@ -828,9 +829,13 @@ class Diagnostic(core.MDTFObjectBase, util.PODLoggerMixin):
     driver: str = ""
     program: str = ""
     runtime_requirements: dict = dc.field(default_factory=dict)
+    runtime_resources: dict = dc.field(default_factory=dict)
     pod_env_vars: util.ConsistentDict = dc.field(default_factory=util.ConsistentDict)
     log_file: io.IOBase = dc.field(default=None, init=False)
+    output_done: bool = dc.field(default=False, init=False)
+    resource_usage: dict = dc.field(default_factory=dict, init=False)
     nc_largefile: bool = False
+    data_format: str = "netcdf"
 
     varlist: Varlist = None
     preprocessor: typing.Any = dc.field(default=None, compare=False)
@@ -844,6 +849,8 @@ class Diagnostic(core.MDTFObjectBase, util.PODLoggerMixin):
     # recognized interpreters for supported script types; can ovverride with
     # explict 'program' attribute in settings
     _interpreters = {'.py': 'python', '.ncl': 'ncl', '.R': 'Rscript'}
+    # recognized values of data_format setting, and corresponding file suffixes
+    _data_formats = {'netcdf': '.nc', 'zarr': '.zarr'}
 
     def __post_init__(self, *args, **kwargs):
         core.MDTFObjectBase.__post_init__(self)
@@ -947,6 +954,7 @@ class Diagnostic(core.MDTFObjectBase, util.PODLoggerMixin):
         self.setup_pod_directories()
         self.set_entry_point()
         self.set_interpreter()
+        self.set_data_format()
         config = core.ConfigManager()
         if config.get('overwrite_file_metadata', False):
             self.log.warning(('User has disabled preprocessing functionality that '
@@ -1033,6 +1041,35 @@ class Diagnostic(core.MDTFObjectBase, util.PODLoggerMixin):
             self.log.debug("Set program for %s to '%s'.",
                 self.full_name, self.program)
 
+    def set_data_format(self):
+        """Determine the format of the preprocessed model data provided to the
+        POD: netCDF (the default), or a Zarr store per variable if the POD's
+        settings declare ``"data_format": "zarr"``. Zarr is only provided to
+        PODs run with python, and only if the zarr package is available to the
+        framework; otherwise we fall back to netCDF.
+        """
+        self.data_format = str(self.data_format).lower()
+        if self.data_format not in self._data_formats:
+            raise util.PodConfigError((f"Unsupported data_format "
+                f"'{self.data_format}'; must be one of "
+                f"{list(self._data_formats)}."), self)
+        if self.data_format == 'zarr':
+            if not self.program.startswith('python'):
+                self.log.warning(("%s requested Zarr data but is run with '%s'; "
+                    "providing netCDF data instead."), self.full_name, self.program)
+                self.data_format = 'netcdf'
+            elif importlib.util.find_spec('zarr') is None:
+                self.log.warning(("%s requested Zarr data but the zarr package "
+                    "isn't installed; providing netCDF data instead."),
+                    self.full_name)
+                self.data_format = 'netcdf'
+        self.pod_env_vars['MDTF_DATA_FORMAT'] = self.data_format
+
+    @property
+    def data_file_suffix(self):
+        """File extension of the preprocessed model data provided to the POD."""
+        return self._data_formats.get(self.data_format, '.nc')
+
     def pre_run_setup(self):
         """Perform filesystem operations and checks prior to running the POD.
 
@@ -1316,6 +1353,7 @@ class MultirunDiagnostic(pod_setup.MultiRunPod, Diagnostic):
         # define the location of the POD driver script
         self.set_entry_point()
         self.set_interpreter()
+        self.set_data_format()
         # TODO: redefine convention as its own entry in the config file similarly to POD_LIST
         # all cases have same convention, so just use first entry for now
         # Will also assume that the date range is the same for all cases for now
@@ -5,9 +5,19 @@ PODs' code.
 import os
 import io
 import abc
+import asyncio
+import collections
+import concurrent.futures
 import dataclasses
+import datetime
 from distutils.spawn import find_executable
+import hashlib
+import importlib
+import json
+import shlex
 import signal
+import sys
+import time
 import typing
 import subprocess
 from src import util, core
@@ -71,6 +81,15 @@ class AbstractEnvironmentManager(abc.ABC):
         """
         pass
 
+    def activate_env_vars(self, env_name, env_vars):
+        """Return the environment variables *env_vars* modified as they would be
+        by activating the environment *env_name*, for environments that can be
+        activated without running the shell commands from
+        :meth:`activate_env_commands`. The default implementation returns
+        *env_vars* unchanged.
+        """
+        return env_vars
+
     @abc.abstractmethod
     def deactivate_env_commands(self, env_name):
         """Generate shell commands needed to deactivate/clean up the environment
@@ -222,13 +241,22 @@ class CondaEnvironmentManager(AbstractEnvironmentManager):
     to define and switch runtime environments.
     """
     env_name_prefix = '_MDTF_' # our envs start with this string to avoid conflicts
+    _cache_file_name = '.MDTF_conda_cache.json'
+    # env vars that differ between shells, independent of conda activation
+    _activation_ignore_vars = ('_', 'SHLVL', 'PWD', 'OLDPWD')
+    _activation_marker = '__MDTF_CONDA_ACTIVATED__'
 
     def __init__(self, log=_log):
         super(CondaEnvironmentManager, self).__init__(log=log)
 
         paths = core.PathManager()
+        config = core.ConfigManager()
         self.code_root = paths.CODE_ROOT
         self.conda_dir = os.path.join(self.code_root, 'src','conda')
+        self.use_cache = not config.get('disable_conda_cache', False)
+        self.cache_path = self._cache_path(paths)
+        self._cache = self.read_cache()
+        self._activation = dict()
         self.env_list = []
         for file_ in os.listdir(self.conda_dir):
             if file_.endswith('.yml'):
@@ -243,20 +271,36 @@ class CondaEnvironmentManager(AbstractEnvironmentManager):
         else:
             cmd = f"{self.conda_dir}/conda_init.sh {paths.get('conda_root','')}"
 
+        conda_info = self._cache['conda_info'].get(cmd, dict())
         try:
-            conda_info = util.run_shell_command(
-                cmd,
-                log=self.log
-            )
-            for line in conda_info:
-                key, val = line.split('=')
-                if key == '_CONDA_EXE':
-                    self.conda_exe = val
-                    assert os.path.exists(self.conda_exe)
-                elif key == '_CONDA_ROOT':
-                    self.conda_root = val
-        except Exception as exc:
-            raise util.PodRuntimeError("Can't find conda.") from exc
+            if os.path.getmtime(conda_info['_CONDA_EXE']) != conda_info['mtime']:
+                conda_info = dict()
+        except (OSError, KeyError):
+            conda_info = dict()
+        if conda_info:
+            self.log.debug("Using cached conda location %s.", conda_info['_CONDA_EXE'])
+            self.conda_exe = conda_info['_CONDA_EXE']
+            self.conda_root = conda_info['_CONDA_ROOT']
+        else:
+            try:
+                conda_info = util.run_shell_command(
+                    cmd,
+                    log=self.log
+                )
+                for line in conda_info:
+                    key, val = line.split('=')
+                    if key == '_CONDA_EXE':
+                        self.conda_exe = val
+                        assert os.path.exists(self.conda_exe)
+                    elif key == '_CONDA_ROOT':
+                        self.conda_root = val
+            except Exception as exc:
+                raise util.PodRuntimeError("Can't find conda.") from exc
+            self._cache['conda_info'][cmd] = {
+                '_CONDA_EXE': self.conda_exe, '_CONDA_ROOT': self.conda_root,
+                'mtime': os.path.getmtime(self.conda_exe)
+            }
+            self.write_cache()
 
         # find where environments are installed
         if 'conda_env_root' in paths and paths.conda_env_root:
@@ -276,6 +320,116 @@ class CondaEnvironmentManager(AbstractEnvironmentManager):
             self.log.warning(("Conda env '%s' not found (grepped for '%s'); "
                               "continuing."), env_name, conda_prefix)
             #self._call_conda_create(env_name)
+        elif self.use_cache:
+            self._activation[env_name] = self.activation_env_diff(env_name)
+
+    def _cache_path(self, paths):
+        """Path to the file caching conda's location and the environment
+        variables set by activating each env. This is kept in the working
+        directory, rather than in the framework's source code.
+        """
+        return os.path.join(paths.WORKING_DIR, self._cache_file_name)
+
+    def read_cache(self):
+        cache = {'conda_info': dict(), 'envs': dict()}
+        if self.use_cache and os.path.isfile(self.cache_path):
+            try:
+                with io.open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache.update(json.load(f))
+            except Exception as exc:
+                self.log.warning("Ignoring unreadable conda cache %s (%r).",
+                                 self.cache_path, exc)
+        return cache
+
+    def write_cache(self):
+        if not self.use_cache:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}"
+            util.write_json(self._cache, temp_path, log=self.log)
+            os.replace(temp_path, self.cache_path)
+        except OSError as exc:
+            self.log.warning("Couldn't write conda cache %s (%r).",
+                             self.cache_path, exc)
+
+    @staticmethod
+    def _env_mtime(conda_prefix):
+        """Latest modification time of the env at *conda_prefix*; conda-meta
+        is updated whenever packages are installed or removed.
+        """
+        return max(os.path.getmtime(path) for path in \
+            (conda_prefix, os.path.join(conda_prefix, 'conda-meta')) \
+            if os.path.exists(path))
+
+    @staticmethod
+    def _base_env_signature(keys, base_env):
+        """Hash of the values in *base_env* of the variables *keys*, which are
+        all the variables defined or unset by activating an env, so that a cached
+        diff is only reused from the same starting environment. This includes
+        variables that activation left unchanged, since it may change them if
+        they start from a different value.
+        """
+        str_ = json.dumps([(k, base_env.get(k)) for k in sorted(keys)])
+        return hashlib.sha1(str_.encode('utf-8')).hexdigest()
+
+    def activation_env_diff(self, env_name):
+        """Return the changes made to the environment variables by activating
+        *env_name*, as a dict mapping each variable to a ``[action, value]``
+        pair where action is 'set', 'prepend' or 'unset'. This is read from the
+        cache unless the env has been modified since it was cached; otherwise
+        it's found by activating the env in a shell. Returns None if the
+        changes can't be determined.
+        """
+        conda_prefix = os.path.join(self.conda_env_root, env_name)
+        try:
+            mtime = self._env_mtime(conda_prefix)
+        except (OSError, ValueError):
+            return None
+        base_env = dict(os.environ)
+        d = self._cache['envs'].get(conda_prefix, dict())
+        if d.get('mtime') == mtime and d.get('conda_exe') == self.conda_exe \
+            and 'keys' in d \
+            and d.get('base') == self._base_env_signature(d['keys'], base_env):
+            self.log.debug("Using cached activation of conda env '%s'.", env_name)
+            return d['diff']
+
+        cmd = ' && '.join(self.shell_activate_commands(env_name) + [
+            f"echo {self._activation_marker}",
+            (f"{shlex.quote(sys.executable)} -c "
+             "'import os, json; print(json.dumps(dict(os.environ)))'")
+        ])
+        try:
+            out = util.run_shell_command(cmd, env=base_env, log=self.log)
+            activated_env = json.loads(
+                ''.join(out[out.index(self._activation_marker) + 1:])
+            )
+        except Exception as exc:
+            self.log.warning(("Couldn't determine environment of conda env '%s' "
+                "(%r); activating it in each POD's shell instead."), env_name, exc)
+            return None
+        diff = dict()
+        for k, v in activated_env.items():
+            old_v = base_env.get(k)
+            if k in self._activation_ignore_vars or old_v == v:
+                continue
+            if old_v and v.endswith(old_v):
+                diff[k] = ['prepend', v[:-len(old_v)]]
+            else:
+                diff[k] = ['set', v]
+        for k in base_env:
+            if k not in activated_env and k not in self._activation_ignore_vars:
+                diff[k] = ['unset', None]
+        keys = sorted(
+            k for k in set(activated_env) | set(diff) \
+            if k not in self._activation_ignore_vars
+        )
+        self._cache['envs'][conda_prefix] = {
+            'mtime': mtime, 'conda_exe': self.conda_exe, 'keys': keys,
+            'base': self._base_env_signature(keys, base_env), 'diff': diff
+        }
+        self.write_cache()
+        return diff
 
     def _call_conda_create(self, env_name):
         if env_name.startswith(self.env_name_prefix):
@@ -331,8 +485,34 @@ class CondaEnvironmentManager(AbstractEnvironmentManager):
 
     def activate_env_commands(self, env_name):
         """Source conda_init.sh to set things that aren't set b/c we aren't
-        in an interactive shell.
+        in an interactive shell. Nothing needs to be run for envs whose
+        activation is cached: see :meth:`activate_env_vars`.
+        """
+        if self._activation.get(env_name) is not None:
+            return []
+        return self.shell_activate_commands(env_name)
+
+    def activate_env_vars(self, env_name, env_vars):
+        """Apply the cached changes made by activating *env_name* to a copy of
+        *env_vars*.
         """
+        diff = self._activation.get(env_name)
+        if diff is None:
+            return env_vars
+        env_vars = env_vars.copy()
+        for k, (action, v) in diff.items():
+            if action == 'unset':
+                env_vars.pop(k, None)
+            elif action == 'prepend' and env_vars.get(k):
+                env_vars[k] = v + env_vars[k]
+            elif action == 'prepend':
+                env_vars[k] = v.rstrip(os.pathsep)
+            else:
+                env_vars[k] = v
+        return env_vars
+
+    def shell_activate_commands(self, env_name):
+        """Shell commands that activate *env_name*."""
         # conda_init for bash defines conda as a shell function; will get error
         # if we try to call the conda executable directly
         conda_prefix = os.path.join(self.conda_env_root, env_name)
@@ -379,6 +559,7 @@ class SubprocessRuntimePODWrapper(object):
     env: typing.Any = None
     env_vars: dict = dataclasses.field(default_factory=dict)
     process: typing.Any = dataclasses.field(default=None, init=False)
+    start_time: float = dataclasses.field(default=0.0, init=False)
 
     def pre_run_setup(self):
         self.pod.log_file = io.open(
@@ -509,20 +690,221 @@ class SubprocessRuntimePODWrapper(object):
         # print(pod+" Elapsed time ",elapsed)
 
 
+@util.mdtf_dataclass
+class PodResourceUsage(object):
+    """Resources used by a POD's subprocess tree, as reported by
+    :func:`os.wait4` and ``/proc/<pid>/io``. Times are in seconds and sizes in
+    bytes. *max_rss* is the peak resident set size of the largest single
+    process in the tree. *read_bytes* and *write_bytes* count the storage I/O
+    of the whole tree, and are None if ``/proc`` isn't available. On linux,
+    *max_rss* is never less than the framework's own memory use at the time
+    the subprocess was forked.
+    """
+    wall_time: float = 0.0
+    user_time: float = 0.0
+    sys_time: float = 0.0
+    max_rss: int = 0
+    read_bytes: int = None
+    write_bytes: int = None
+
+
+def _read_proc_io(pid):
+    """Return the storage bytes read and written by process *pid* and its
+    reaped descendants, from ``/proc/<pid>/io``, or (None, None).
+    """
+    try:
+        with io.open(f"/proc/{pid}/io", 'r') as f:
+            d = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(d['read_bytes']), int(d['write_bytes'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def reap_pod(p, block=False):
+    """Reap the subprocess of the wrapped POD *p* if it has exited, recording
+    the resources it used as a :class:`PodResourceUsage` on the POD's
+    ``resource_usage`` attribute. Returns the subprocess' exit code, or None
+    if it's still running and *block* is False.
+    """
+    pid = p.process.pid
+    if p.process.returncode is not None:
+        return p.process.returncode
+    read_bytes = write_bytes = None
+    if hasattr(os, 'waitid'):
+        # wait without reaping, so the zombie's I/O counters can still be read
+        flags = os.WEXITED | os.WNOWAIT | (0 if block else os.WNOHANG)
+        try:
+            if os.waitid(os.P_PID, pid, flags) is None:
+                return None
+        except ChildProcessError:
+            return p.process.poll()
+        read_bytes, write_bytes = _read_proc_io(pid)
+    try:
+        pid_, status, rusage = os.wait4(pid, 0 if block else os.WNOHANG)
+    except ChildProcessError:
+        return p.process.poll()
+    if pid_ == 0:
+        return None
+    p.process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on linux, bytes on macOS
+    rss_units = 1 if sys.platform == 'darwin' else 1024
+    usage = PodResourceUsage(
+        wall_time=time.monotonic() - p.start_time,
+        user_time=rusage.ru_utime,
+        sys_time=rusage.ru_stime,
+        max_rss=rusage.ru_maxrss * rss_units,
+        read_bytes=read_bytes,
+        write_bytes=write_bytes
+    )
+    p.pod.resource_usage = dataclasses.asdict(usage)
+    p.pod.log.info("%s used %.1f s wall time, %.1f s CPU time, %.1f mb peak RSS.",
+        p.pod.full_name, usage.wall_time, usage.user_time + usage.sys_time,
+        usage.max_rss / (1024 * 1024))
+    return p.process.returncode
+
+
+def _physical_memory():
+    """Total physical memory of the local machine in bytes, or 0 if it can't
+    be determined.
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+class PodScheduler(object):
+    """Decides when the PODs run by :class:`SubprocessRuntimeManager` are
+    started, so that the local machine isn't oversubscribed.
+
+    At most *max_pods* PODs run at once, and a POD is only started if the
+    cores and memory it declares in the ``runtime_resources`` section of its
+    settings file (default 1 core and no memory requirement) fit within the
+    remaining *cores* and *memory* (in bytes) of the machine. A POD is always
+    started if nothing else is running, even if it requests more than the
+    machine has. Queued PODs are started in order of decreasing memory, then
+    core requirements, so that the heaviest PODs don't end up running last.
+
+    Smaller PODs further back in the queue may start ahead of a POD that doesn't
+    fit yet ("backfilling"), but only *max_backfill* times: after that, no PODs
+    behind it are started until it has started, so that heavy PODs can't be
+    starved by a stream of smaller ones.
+    """
+    def __init__(self, max_pods=0, cores=0, memory=0, max_backfill=2, log=_log):
+        n_cpus = os.cpu_count() or 1
+        self.max_pods = max_pods if max_pods > 0 else n_cpus
+        self.cores = cores if cores > 0 else n_cpus
+        self.memory = memory if memory > 0 else _physical_memory()
+        self.max_backfill = max(max_backfill, 0)
+        self.log = log
+        self._running = dict()
+        self._passed_over = collections.Counter()
+
+    @classmethod
+    def from_config(cls, log=_log):
+        config = core.ConfigManager()
+        return cls(
+            max_pods=config.get('max_concurrent_pods', 0),
+            cores=config.get('runtime_cores', 0),
+            memory=int(config.get('runtime_memory', 0) * 1024 ** 3),
+            log=log
+        )
+
+    def pod_resources(self, pod):
+        """Return a tuple of the number of cores and the memory (in bytes)
+        requested by *pod*.
+        """
+        d = getattr(pod, 'runtime_resources', None) or dict()
+        try:
+            cores = max(int(d.get('cores', 1)), 1)
+            memory = max(float(d.get('memory', 0)), 0) * 1024 ** 3
+        except (TypeError, ValueError):
+            self.log.warning("Ignoring malformed runtime_resources for %s: %s.",
+                pod.full_name, d)
+            cores, memory = 1, 0
+        return cores, int(memory)
+
+    def order(self, pods):
+        """Return the wrapped *pods* sorted in the order they should be started;
+        ties keep their original order.
+        """
+        def _key(p):
+            cores, memory = self.pod_resources(p.pod)
+            return (-memory, -cores)
+
+        return sorted(pods, key=_key)
+
+    @property
+    def n_running(self):
+        return len(self._running)
+
+    def can_start(self, p):
+        """Return True if the wrapped POD *p* can be started now."""
+        if not self._running:
+            return True
+        if len(self._running) >= self.max_pods:
+            return False
+        cores, memory = self.pod_resources(p.pod)
+        used_cores = sum(c for c, _ in self._running.values())
+        used_memory = sum(m for _, m in self._running.values())
+        if used_cores + cores > self.cores:
+            return False
+        if self.memory and memory and used_memory + memory > self.memory:
+            return False
+        return True
+
+    def iter_startable(self, queue):
+        """Generator yielding the wrapped PODs in *queue* (in the order given by
+        :meth:`order`) that can be started now. The caller must call
+        :meth:`start` on each POD it starts before requesting the next one.
+        """
+        blocked = []
+        for p in queue:
+            if self.can_start(p):
+                # p is being started ahead of PODs that don't fit
+                self._passed_over.update(id(b) for b in blocked)
+                yield p
+            else:
+                blocked.append(p)
+                if self._passed_over[id(p)] >= self.max_backfill:
+                    # reserve freed resources for p
+                    return
+
+    def start(self, p):
+        self._passed_over.pop(id(p), None)
+        self._running[id(p)] = self.pod_resources(p.pod)
+
+    def finish(self, p):
+        self._running.pop(id(p), None)
+
+
 class SubprocessRuntimeManager(AbstractRuntimeManager):
     """RuntimeManager class that runs each POD in a child subprocess spawned on
-    the local machine. Resource allocation is delegated to the local machine's
-    kernel's scheduler.
+    the local machine. The number of PODs running at once, and the cores and
+    memory they use, are limited by a :class:`PodScheduler`.
     """
     _PodWrapperClass = SubprocessRuntimePODWrapper
+    _poll_interval = 0.5 # seconds between checks for finished PODs
 
-    def __init__(self, case, EnvMgrClass):
+    def __init__(self, case, EnvMgrClass, OutMgrClass=None):
         config = core.ConfigManager()
         self.test_mode = config.test_mode
         # transfer all pods, even failed ones, because we need to call their
         self.pods = [self._PodWrapperClass(pod=p) for p in case.pods.values()]
         self.env_mgr = EnvMgrClass(log=case.log)
         self.case = case
+        self.scheduler = PodScheduler.from_config(log=case.log)
+        # OutputManager class, used to process each POD's output in the
+        # background as soon as it finishes; see submit_output()
+        self.OutMgrClass = OutMgrClass
+        self._output_executor = None
+        self._output_futures = []
+        # PODs waiting to start and currently running; see submit_pod()
+        self._queue = []
+        self._running = []
+        self._submitted = set()
+        self._torn_down = set()
+        self._env_vars_base = os.environ.copy()
 
         # Need to run bash explicitly because 'conda activate' sources
         # env vars (can't do that in posix sh). tcsh could also work.
@@ -542,7 +924,11 @@ class SubprocessRuntimeManager(AbstractRuntimeManager):
         for env in envs:
             self.env_mgr.create_environment(env)
 
-    def spawn_subprocess(self, p, env_vars_base):
+    def subprocess_commands(self, p, env_vars_base):
+        """Return a tuple of the shell command string that runs the wrapped
+        POD *p* (activating and deactivating its environment) and the
+        environment variables to run it with.
+        """
         run_cmds = p.validate_commands() + p.run_commands()
         if self.test_mode:
             run_cmds = ['echo "TEST MODE: call {}"'.format('; '.join(run_cmds))]
@@ -558,8 +944,12 @@ class SubprocessRuntimeManager(AbstractRuntimeManager):
         commands = ' && '.join([s for s in commands if s])
 
         assert os.path.isdir(p.pod.POD_WK_DIR)
-        env_vars = env_vars_base.copy()
+        env_vars = self.env_mgr.activate_env_vars(p.env, env_vars_base.copy())
         env_vars.update(p.env_vars)
+        return commands, env_vars
+
+    def spawn_subprocess(self, p, env_vars_base):
+        commands, env_vars = self.subprocess_commands(p, env_vars_base)
         # Need to run bash explicitly because 'conda activate' sources
         # env vars (can't do that in posix sh). tcsh could also work.
         return subprocess.Popen(
@@ -570,43 +960,172 @@ class SubprocessRuntimeManager(AbstractRuntimeManager):
             universal_newlines=True, bufsize=1
         )
 
-    def run(self):
-        # Call cleanup method if we're kiled
+    def set_signal_handlers(self):
+        """Call :meth:`runtime_terminate` if we're killed. Called by :meth:`run`,
+        and before the data request in pipelined mode so that PODs started by
+        :meth:`submit_pod` aren't orphaned.
+        """
         signal.signal(signal.SIGTERM, self.runtime_terminate)
         signal.signal(signal.SIGINT, self.runtime_terminate)
 
+    def run(self):
+        self.set_signal_handlers()
+
         test_list = [p for p in self.iter_active_pods()]
-        if not test_list:
+        if not test_list and not self._submitted:
             self.case.log.error('%s: no PODs met data requirements; returning',
                                 self.__class__.__name__)
             return
 
-        env_vars_base = os.environ.copy()
+        self.run_pods(os.environ.copy())
+        self.case.log.info('%s: completed all PODs.', self.__class__.__name__)
+        self.tear_down()
+
+    def start_pod(self, p, env_vars_base):
+        """Do setup for the wrapped POD *p* and spawn its subprocess. Returns
+        True if the subprocess was started.
+        """
+        p.pod.log.info('%s: run %s.', self.__class__.__name__, p.pod.full_name)
+        try:
+            p.pre_run_setup()
+        except Exception as exc:
+            p.setup_exception_handler(exc)
+            return False
+        try:
+            p.pod.log_file.write(f"### Start execution of {p.pod.full_name}\n")
+            p.pod.log_file.write(80 * '-' + '\n')
+            p.pod.log_file.flush()
+            p.start_time = time.monotonic()
+            p.process = self.spawn_subprocess(p, env_vars_base)
+        except Exception as exc:
+            p.runtime_exception_handler(exc)
+            return False
+        return True
+
+    def submit_pod(self, pod):
+        """Queue the :class:`~src.diagnostic.Diagnostic` *pod* to run as soon as
+        :attr:`scheduler` allows, and start any queued PODs that can run now.
+        Used in pipelined mode to start PODs while the data for others is still
+        being preprocessed; any PODs not submitted this way are run by
+        :meth:`run`.
+        """
+        for p in self.pods:
+            if p.pod is pod and id(p) not in self._submitted:
+                self._submitted.add(id(p))
+                self._queue = self.scheduler.order(self._queue + [p])
+        self.poll_pods()
+
+    def poll_pods(self):
+        """Free the resources of PODs whose subprocesses have exited and tear
+        them down, then start as many queued PODs as :attr:`scheduler` allows.
+        """
+        for p in list(self._running):
+            retcode = reap_pod(p)
+            if retcode is not None:
+                self._running.remove(p)
+                self.scheduler.finish(p)
+                self.finish_pod(p, retcode)
+        for p in self.scheduler.iter_startable(list(self._queue)):
+            self._queue.remove(p)
+            if self.start_pod(p, self._env_vars_base):
+                self.scheduler.start(p)
+                self._running.append(p)
+
+    def run_pods(self, env_vars_base):
+        """Run all active PODs, starting queued PODs as running ones finish and
+        free up the resources managed by :attr:`scheduler`, then tear down all
+        PODs.
+        """
+        # stdout and stderr go straight to the POD's log file; see
+        # AsyncioRuntimeManager for a version that tees them to the console.
+        self._env_vars_base = env_vars_base
         for p in self.iter_active_pods():
-            p.pod.log.info('%s: run %s.', self.__class__.__name__, p.pod.full_name)
-            try:
-                p.pre_run_setup()
-            except Exception as exc:
-                p.setup_exception_handler(exc)
-                continue
-            try:
-                p.pod.log_file.write(f"### Start execution of {p.pod.full_name}\n")
-                p.pod.log_file.write(80 * '-' + '\n')
-                p.pod.log_file.flush()
-                p.process = self.spawn_subprocess(p, env_vars_base)
-            except Exception as exc:
-                p.runtime_exception_handler(exc)
-                continue
-        # should use asyncio, instead wait for each process
-        # to terminate and close all log files
-        # TODO: stderr gets eaten with current setup; possible to do a proper
-        # tee if procs are run with asyncio? https://stackoverflow.com/a/59041913
+            if id(p) not in self._submitted:
+                self._submitted.add(id(p))
+                self._queue.append(p)
+        self._queue = self.scheduler.order(self._queue)
+        self.scheduler.log.info(("%s: running %d PODs, at most %d at once on %d "
+            "cores."), self.__class__.__name__,
+            len(self._queue) + len(self._running),
+            self.scheduler.max_pods, self.scheduler.cores)
+        while self._queue or self._running:
+            self.poll_pods()
+            if self._running:
+                time.sleep(self._poll_interval)
         for p in self.pods:
+            if id(p) in self._torn_down:
+                continue
             if p.process is not None:
-               p.process.wait()
+                reap_pod(p, block=True)
             p.tear_down()
-        self.case.log.info('%s: completed all PODs.', self.__class__.__name__)
-        self.tear_down()
+        self.wait_for_output()
+
+    def finish_pod(self, p, retcode):
+        """Tear down the wrapped POD *p* once its subprocess has exited with
+        code *retcode*, and start processing its output.
+        """
+        p.tear_down(retcode=retcode)
+        self._torn_down.add(id(p))
+        self.submit_output(p)
+
+    def output_manager(self, p):
+        """Return the OutputManager used to process the output of the wrapped
+        POD *p*, or None if no OutputManager class was given.
+        """
+        if self.OutMgrClass is None:
+            return None
+        if getattr(self, '_out_mgr', None) is None:
+            self._out_mgr = self.OutMgrClass(self.case)
+        return self._out_mgr
+
+    def make_pod_output(self, p):
+        """Process the output of the wrapped POD *p* once it has been torn down.
+        """
+        out_mgr = self.output_manager(p)
+        if out_mgr is None:
+            return
+        try:
+            out_mgr.make_pod_output(p.pod)
+        except Exception as exc:
+            p.pod.deactivate(exc)
+
+    def submit_output(self, p):
+        """Process the output of the wrapped POD *p* in a background thread,
+        if it ran successfully, so that this is done while the remaining PODs
+        run. The top-level html page is still assembled by the OutputManager
+        after all PODs have finished.
+        """
+        if self.OutMgrClass is None or p.pod.failed:
+            return
+        if self._output_executor is None:
+            self._output_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='output'
+            )
+        self._output_futures.append(
+            self._output_executor.submit(self.make_pod_output, p)
+        )
+
+    def wait_for_output(self):
+        """Block until the output of all PODs passed to :meth:`submit_output`
+        has been processed.
+        """
+        if self._output_executor is None:
+            return
+        concurrent.futures.wait(self._output_futures)
+        self._output_futures = []
+        self._output_executor.shutdown()
+        self._output_executor = None
+
+    def abort_output(self):
+        """Stop processing PODs' output and delete any partially written tar
+        file. Called by :meth:`runtime_terminate`.
+        """
+        if self._output_executor is not None:
+            self._output_executor.shutdown(wait=False, cancel_futures=True)
+        for p in self.pods:
+            out_mgr = self.output_manager(p)
+            if out_mgr is not None:
+                out_mgr.abort_archive()
 
     def tear_down(self):
         # cleanup all envs that were defined, just to be safe
@@ -621,6 +1140,7 @@ class SubprocessRuntimeManager(AbstractRuntimeManager):
         """
         # try to clean up everything
         util.signal_logger(self.__class__.__name__, signum, frame, log=self.case.log)
+        self.abort_output()
         for p in self.pods:
             util.signal_logger(self.__class__.__name__, signum, frame, log=p.pod.log)
             p.tear_down()
@@ -639,6 +1159,7 @@ class MultirunSubprocessRuntimePODWrapper(object):
     env: typing.Any = None
     env_vars: dict = dataclasses.field(default_factory=dict)
     process: typing.Any = dataclasses.field(default=None, init=False)
+    start_time: float = dataclasses.field(default=0.0, init=False)
 
     def pre_run_setup(self):
         self.pod.log_file = io.open(
@@ -797,18 +1318,28 @@ class MultirunSubprocessRuntimePODWrapper(object):
 
 class MultirunSubprocessRuntimeManager(SubprocessRuntimeManager):
     """RuntimeManager class that runs each POD in a child subprocess spawned on
-    the local machine. Resource allocation is delegated to the local machine's
-    kernel's scheduler.
+    the local machine. The number of PODs running at once, and the cores and
+    memory they use, are limited by a :class:`PodScheduler`.
     """
     _PodWrapperClass = MultirunSubprocessRuntimePODWrapper
 
-    def __init__(self, pod_dict, EnvMgrClass, parent):
+    def __init__(self, pod_dict, EnvMgrClass, parent, OutMgrClass=None):
         config = core.ConfigManager()
         self.test_mode = config.test_mode
         # transfer all pods, even failed ones, because we need to call their
         self.pods = [self._PodWrapperClass(pod=p) for p in pod_dict.values()]
         # init object-level logger
         self.env_mgr = EnvMgrClass(log=parent.log)
+        self.scheduler = PodScheduler.from_config(log=parent.log)
+        self.OutMgrClass = OutMgrClass
+        self._output_executor = None
+        self._output_futures = []
+        # PODs waiting to start and currently running; see submit_pod()
+        self._queue = []
+        self._running = []
+        self._submitted = set()
+        self._torn_down = set()
+        self._env_vars_base = os.environ.copy()
 
         # Need to run bash explicitly because 'conda activate' sources
         # env vars (can't do that in posix sh). tcsh could also work.
@@ -828,72 +1359,25 @@ class MultirunSubprocessRuntimeManager(SubprocessRuntimeManager):
         for env in envs:
             self.env_mgr.create_environment(env)
 
-    def spawn_subprocess(self, p, env_vars_base):
-        run_cmds = p.validate_commands() + p.run_commands()
-        if self.test_mode:
-            run_cmds = ['echo "TEST MODE: call {}"'.format('; '.join(run_cmds))]
-        commands = self.env_mgr.activate_env_commands(p.env) \
-            + run_cmds \
-            + self.env_mgr.deactivate_env_commands(p.env)
-        if self.test_mode:
-            for cmd in commands:
-                print('\tTEST MODE: call {}'.format(cmd))
-        else:
-            p.pod.log.info('\t'+p.run_msg())
-        # '&&' so we abort if any command in the sequence fails.
-        commands = ' && '.join([s for s in commands if s])
-
-        assert os.path.isdir(p.pod.POD_WK_DIR)
-        env_vars = env_vars_base.copy()
-        env_vars.update(p.env_vars)
-        # Need to run bash explicitly because 'conda activate' sources
-        # env vars (can't do that in posix sh). tcsh could also work.
-        return subprocess.Popen(
-            commands,
-            shell=True, executable=self.bash_exec,
-            env=env_vars, cwd=p.pod.POD_WK_DIR,
-            stdout=p.pod.log_file, stderr=p.pod.log_file,
-            universal_newlines=True, bufsize=1
-        )
-
     def run(self, parent):
-        # Call cleanup method if we're killed
-        signal.signal(signal.SIGTERM, self.runtime_terminate)
-        signal.signal(signal.SIGINT, self.runtime_terminate)
+        self.set_signal_handlers()
 
         test_list = [p for p in self.iter_active_pods()]
-        if not test_list:
+        if not test_list and not self._submitted:
             parent.log.error('%s: no PODs met data requirements; returning',
                              self.__class__.__name__)
             return
 
-        env_vars_base = os.environ.copy()
-        for p in self.iter_active_pods():
-            p.pod.log.info('%s: run %s.', self.__class__.__name__, p.pod.full_name)
-            try:
-                p.pre_run_setup()
-            except Exception as exc:
-                p.setup_exception_handler(exc)
-                continue
-            try:
-                p.pod.log_file.write(f"### Start execution of {p.pod.full_name}\n")
-                p.pod.log_file.write(80 * '-' + '\n')
-                p.pod.log_file.flush()
-                p.process = self.spawn_subprocess(p, env_vars_base)
-            except Exception as exc:
-                p.runtime_exception_handler(exc)
-                continue
-        # should use asyncio, instead wait for each process
-        # to terminate and close all log files
-        # TODO: stderr gets eaten with current setup; possible to do a proper
-        # tee if procs are run with asyncio? https://stackoverflow.com/a/59041913
-        for p in self.pods:
-            if p.process is not None:
-                p.process.wait()
-            p.tear_down()
-        p.pod.log.info('%s: completed all PODs.', self.__class__.__name__)
+        self.run_pods(os.environ.copy())
+        parent.log.info('%s: completed all PODs.', self.__class__.__name__)
         self.tear_down()
 
+    def output_manager(self, p):
+        # in multirun mode, each POD has its own OutputManager
+        if self.OutMgrClass is None:
+            return None
+        return self.OutMgrClass(p.pod)
+
     def tear_down(self):
         # cleanup all envs that were defined, just to be safe
         envs = set([p.env for p in self.pods if p.env])
@@ -907,6 +1391,7 @@ class MultirunSubprocessRuntimeManager(SubprocessRuntimeManager):
         """
         # try to clean up everything
         util.signal_logger(self.__class__.__name__, signum, frame, log=self.case.log)
+        self.abort_output()
         for p in self.pods:
             util.signal_logger(self.__class__.__name__, signum, frame, log=p.pod.log)
             p.tear_down()
@@ -914,3 +1399,622 @@ class MultirunSubprocessRuntimeManager(SubprocessRuntimeManager):
         self.tear_down()
         self.case.close_log_file()
         util.exit_handler(code=1)
+
+
+class AsyncioRuntimeManager(SubprocessRuntimeManager):
+    """RuntimeManager class that runs each POD in a child subprocess spawned on
+    the local machine, like :class:`SubprocessRuntimeManager`, but manages the
+    subprocesses with an :mod:`asyncio` event loop instead of polling them.
+
+    Each line the POD writes to stdout or stderr is prefixed with a timestamp
+    and copied to the POD's log file and to the console as it's written. Each
+    POD is torn down as soon as it exits.
+    """
+    _timestamp_format = '%H:%M:%S'
+    _stream_limit = 2 ** 20 # max length of a line of POD output, in bytes
+
+    def run_pods(self, env_vars_base):
+        """Run all active PODs in an event loop, subject to :attr:`scheduler`,
+        then tear down any PODs that weren't run.
+        """
+        self._streams = dict()
+        # subprocesses are reaped in threads, rather than by asyncio's child
+        # watcher, so that reap_pod() can record their resource usage
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.scheduler.max_pods) as waiter:
+            asyncio.run(self._run_pods(env_vars_base, waiter))
+        for p in self.pods:
+            if id(p) not in self._torn_down:
+                p.tear_down()
+        self.wait_for_output()
+
+    def poll_pods(self):
+        """PODs passed to :meth:`~SubprocessRuntimeManager.submit_pod` are
+        queued, and only started once :meth:`run` starts the event loop.
+        """
+        pass
+
+    async def _run_pods(self, env_vars_base, waiter):
+        for p in self.iter_active_pods():
+            if id(p) not in self._submitted:
+                self._submitted.add(id(p))
+                self._queue.append(p)
+        queue = self.scheduler.order(self._queue)
+        self._queue = []
+        running = dict()
+        self.scheduler.log.info(("%s: running %d PODs, at most %d at once on %d "
+            "cores."), self.__class__.__name__, len(queue),
+            self.scheduler.max_pods, self.scheduler.cores)
+        while queue or running:
+            for p in self.scheduler.iter_startable(list(queue)):
+                queue.remove(p)
+                if await self.start_pod_async(p, env_vars_base):
+                    self.scheduler.start(p)
+                    running[asyncio.ensure_future(self.wait_pod(p, waiter))] = p
+            if not running:
+                continue
+            done, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                p = running.pop(task)
+                self.scheduler.finish(p)
+                self.finish_pod(p, task.result())
+
+    async def start_pod_async(self, p, env_vars_base):
+        """Do setup for the wrapped POD *p* and spawn its subprocess. Returns
+        True if the subprocess was started.
+        """
+        p.pod.log.info('%s: run %s.', self.__class__.__name__, p.pod.full_name)
+        try:
+            p.pre_run_setup()
+        except Exception as exc:
+            p.setup_exception_handler(exc)
+            return False
+        try:
+            p.pod.log_file.write(f"### Start execution of {p.pod.full_name}\n")
+            p.pod.log_file.write(80 * '-' + '\n')
+            p.pod.log_file.flush()
+            p.start_time = time.monotonic()
+            p.process = await self.spawn_subprocess_async(p, env_vars_base)
+        except Exception as exc:
+            p.runtime_exception_handler(exc)
+            return False
+        return True
+
+    async def spawn_subprocess_async(self, p, env_vars_base):
+        commands, env_vars = self.subprocess_commands(p, env_vars_base)
+        process = subprocess.Popen(
+            commands,
+            shell=True, executable=self.bash_exec,
+            env=env_vars, cwd=p.pod.POD_WK_DIR,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        loop = asyncio.get_running_loop()
+        streams = []
+        for pipe in (process.stdout, process.stderr):
+            reader = asyncio.StreamReader(limit=self._stream_limit, loop=loop)
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe
+            )
+            streams.append(reader)
+        self._streams[id(p)] = streams
+        return process
+
+    async def wait_pod(self, p, waiter):
+        """Copy the output of the wrapped POD *p*'s subprocess until it exits,
+        and return its exit code.
+        """
+        stdout, stderr = self._streams.pop(id(p))
+        await asyncio.gather(
+            self.stream_output(p, stdout, 'stdout', sys.stdout),
+            self.stream_output(p, stderr, 'stderr', sys.stderr)
+        )
+        return await asyncio.get_running_loop().run_in_executor(
+            waiter, reap_pod, p, True
+        )
+
+    async def stream_output(self, p, stream, label, console):
+        """Copy each line read from *stream* to *p*'s log file and to *console*,
+        prefixed with the current time and *label*.
+        """
+        continued = False
+        while True:
+            try:
+                line = await stream.readuntil(b'\n')
+            except asyncio.IncompleteReadError as exc:
+                line = exc.partial # last line, without newline
+            except asyncio.LimitOverrunError as exc:
+                # line longer than _stream_limit; pass it on in pieces. Data
+                # is left in the buffer, so nothing is lost.
+                line = await stream.readexactly(exc.consumed)
+                continued = True
+            else:
+                if continued and line == b'\n':
+                    # newline ending a line passed on in pieces
+                    continued = False
+                    continue
+                continued = False
+            if not line:
+                break
+            line = line.decode('utf-8', errors='replace').rstrip('\n')
+            time_str = datetime.datetime.now().strftime(self._timestamp_format)
+            p.pod.log_file.write(f"{time_str} [{label}] {line}\n")
+            print(f"{time_str} {p.pod.name} [{label}] {line}", file=console,
+                flush=True)
+
+
+class MultirunAsyncioRuntimeManager(MultirunSubprocessRuntimeManager,
+                                    AsyncioRuntimeManager):
+    """:class:`AsyncioRuntimeManager` for multirun mode."""
+    pass
+
+
+class AbstractBatchScheduler(abc.ABC):
+    """Interface used by :class:`BatchRuntimeManager` to submit PODs as jobs to
+    a cluster's batch scheduler and to monitor them. *options* is a string of
+    extra command-line options passed to the submit command.
+    """
+    array_index_var = ""
+    """Environment variable holding the index of the current task in a job array."""
+
+    def __init__(self, options="", log=_log):
+        self.options = shlex.split(options or "")
+        self.log = log
+
+    @abc.abstractmethod
+    def directives(self, job_name, out_path, cores=1, memory=0, array_size=0):
+        """Return a list of header lines for a batch script, requesting *cores*
+        cores and *memory* bytes, writing the scheduler's output to *out_path*
+        and, if *array_size* is nonzero, running it as a job array of that many
+        tasks.
+        """
+        pass
+
+    @abc.abstractmethod
+    def submit(self, script_path):
+        """Submit the batch script at *script_path* and return its job ID."""
+        pass
+
+    @abc.abstractmethod
+    def poll(self, job_ids):
+        """Return a dict mapping each of *job_ids* to its exit code, or to None
+        if the job hasn't finished (or the scheduler doesn't know about it yet).
+        """
+        pass
+
+    @abc.abstractmethod
+    def cancel(self, job_ids):
+        """Cancel the jobs with IDs *job_ids*."""
+        pass
+
+    def task_id(self, job_id, index):
+        """Return the ID of task *index* of the job array with ID *job_id*."""
+        return f"{job_id}_{index}"
+
+
+class SlurmBatchScheduler(AbstractBatchScheduler):
+    """Submits jobs to `Slurm <https://slurm.schedmd.com/>`__."""
+    array_index_var = "SLURM_ARRAY_TASK_ID"
+    _running_states = ('PENDING', 'CONFIGURING', 'RUNNING', 'COMPLETING',
+        'REQUEUED', 'RESIZING', 'SUSPENDED')
+
+    def directives(self, job_name, out_path, cores=1, memory=0, array_size=0):
+        lines = [
+            f"#SBATCH --job-name={job_name}",
+            f"#SBATCH --output={out_path}",
+            "#SBATCH --ntasks=1",
+            f"#SBATCH --cpus-per-task={cores}"
+        ]
+        if memory:
+            lines.append(f"#SBATCH --mem={-(-memory // 1024 ** 2)}M")
+        if array_size:
+            lines.append(f"#SBATCH --array=0-{array_size - 1}")
+        return lines
+
+    def submit(self, script_path):
+        out = util.run_command(['sbatch', '--parsable'] + self.options \
+            + [script_path], log=self.log)
+        # output is "jobid[;cluster]"
+        return out[0].strip().split(';')[0]
+
+    def poll(self, job_ids):
+        d = dict.fromkeys(job_ids)
+        out = util.run_command(['sacct', '--noheader', '--parsable2',
+            '--allocations', '--format=JobID,State,ExitCode',
+            '--jobs=' + ','.join(job_ids)], log=self.log)
+        for line in out:
+            fields = line.strip().split('|')
+            if len(fields) < 3 or fields[0] not in d:
+                continue
+            state = fields[1].split()[0] if fields[1] else 'PENDING'
+            if state in self._running_states:
+                continue
+            try:
+                retcode = int(fields[2].split(':')[0])
+            except ValueError:
+                retcode = 1
+            if state != 'COMPLETED' and retcode == 0:
+                retcode = 1 # cancelled, timed out, out of memory, etc.
+            d[fields[0]] = retcode
+        return d
+
+    def cancel(self, job_ids):
+        if job_ids:
+            util.run_command(['scancel'] + list(job_ids), log=self.log)
+
+
+class PBSBatchScheduler(AbstractBatchScheduler):
+    """Submits jobs to PBS Professional, or OpenPBS."""
+    array_index_var = "PBS_ARRAY_INDEX"
+
+    def directives(self, job_name, out_path, cores=1, memory=0, array_size=0):
+        resources = f"select=1:ncpus={cores}"
+        if memory:
+            resources += f":mem={-(-memory // 1024 ** 2)}mb"
+        lines = [
+            f"#PBS -N {job_name[:15]}",
+            f"#PBS -o {out_path}",
+            "#PBS -j oe",
+            "#PBS -V",
+            f"#PBS -l {resources}"
+        ]
+        if array_size:
+            lines.append(f"#PBS -J 0-{array_size - 1}")
+        return lines
+
+    def submit(self, script_path):
+        out = util.run_command(['qsub'] + self.options + [script_path],
+            log=self.log)
+        return out[0].strip()
+
+    def poll(self, job_ids):
+        d = dict.fromkeys(job_ids)
+        out = util.run_command(['qstat', '-x', '-f', '-F', 'json'] \
+            + list(job_ids), log=self.log)
+        jobs = json.loads('\n'.join(out)).get('Jobs', dict())
+        for job_id, job in jobs.items():
+            if job_id not in d or job.get('job_state') not in ('F', 'X'):
+                continue
+            retcode = int(job.get('Exit_status', 1))
+            d[job_id] = retcode if retcode >= 0 else 1
+        return d
+
+    def cancel(self, job_ids):
+        if job_ids:
+            util.run_command(['qdel'] + list(job_ids), log=self.log)
+
+    def task_id(self, job_id, index):
+        # array job IDs are returned as "1234[].server"
+        return job_id.replace('[]', f"[{index}]", 1)
+
+
+class LocalBatchScheduler(AbstractBatchScheduler):
+    """Stand-in for a batch scheduler that runs each job as a background
+    process on the local machine, for testing and debugging batch scripts.
+    Job arrays are run as one process per task.
+    """
+    array_index_var = "MDTF_ARRAY_INDEX"
+
+    def __init__(self, options="", log=_log):
+        super(LocalBatchScheduler, self).__init__(options=options, log=log)
+        self._procs = dict()
+        self._count = 0
+
+    def directives(self, job_name, out_path, cores=1, memory=0, array_size=0):
+        lines = [
+            f"# job_name={job_name}", f"# output={out_path}",
+            f"# cores={cores}", f"# memory={memory}"
+        ]
+        if array_size:
+            lines.append(f"# array_size={array_size}")
+        return lines
+
+    def _array_size(self, script_path):
+        with io.open(script_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('# array_size='):
+                    return int(line.split('=', 1)[1])
+        return 0
+
+    def _out_path(self, script_path):
+        with io.open(script_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('# output='):
+                    return line.split('=', 1)[1].strip()
+        return os.devnull
+
+    def _spawn(self, job_id, script_path, env):
+        with io.open(self._out_path(script_path), 'a', encoding='utf-8') as out:
+            self._procs[job_id] = subprocess.Popen(
+                ['bash', script_path], env=env,
+                stdout=out, stderr=subprocess.STDOUT
+            )
+
+    def submit(self, script_path):
+        self._count += 1
+        job_id = f"local-{self._count}"
+        n_tasks = self._array_size(script_path)
+        if not n_tasks:
+            self._spawn(job_id, script_path, os.environ.copy())
+        for i in range(n_tasks):
+            env = os.environ.copy()
+            env[self.array_index_var] = str(i)
+            self._spawn(self.task_id(job_id, i), script_path, env)
+        return job_id
+
+    def poll(self, job_ids):
+        return {j: (self._procs[j].poll() if j in self._procs else None) \
+            for j in job_ids}
+
+    def cancel(self, job_ids):
+        for j in job_ids:
+            if j in self._procs and self._procs[j].poll() is None:
+                self._procs[j].kill()
+
+
+_batch_schedulers = {
+    'slurm': SlurmBatchScheduler,
+    'pbs': PBSBatchScheduler,
+    'local': LocalBatchScheduler
+}
+
+
+def batch_scheduler_class(name):
+    """Return the :class:`AbstractBatchScheduler` class selected by *name*:
+    either one of 'slurm', 'pbs' or 'local', or a class given as
+    ``'package.module:ClassName'``.
+    """
+    if name.lower() in _batch_schedulers:
+        return _batch_schedulers[name.lower()]
+    if ':' in name:
+        mod_name, cls_name = name.split(':', 1)
+        return getattr(importlib.import_module(mod_name), cls_name)
+    raise ValueError((f"Unrecognized batch_scheduler '{name}'; must be one of "
+        f"{', '.join(_batch_schedulers)} or 'package.module:ClassName'."))
+
+
+class BatchRuntimeManager(SubprocessRuntimeManager):
+    """RuntimeManager class that submits each POD as a job to a cluster's batch
+    scheduler, so that PODs can run on separate nodes. The POD's environment
+    activation and run commands are written to a batch script in its working
+    directory, and the job's output is copied into the POD's log file when it
+    finishes. If ``batch_job_array`` is set, all PODs are submitted as a single
+    job array instead, with each task requesting the largest resources of any
+    POD.
+
+    Submitting and polling jobs is done by the :class:`AbstractBatchScheduler`
+    selected with the ``batch_scheduler`` setting. If polling fails
+    ``_max_poll_failures`` times in a row, the outstanding jobs are cancelled
+    and their PODs are failed, rather than waiting forever.
+    """
+    _max_poll_failures = 10
+
+    def __init__(self, case, EnvMgrClass, OutMgrClass=None):
+        super(BatchRuntimeManager, self).__init__(case, EnvMgrClass,
+            OutMgrClass=OutMgrClass)
+        self.init_batch(case.log)
+
+    def init_batch(self, log):
+        config = core.ConfigManager()
+        cls_ = batch_scheduler_class(config.get('batch_scheduler', 'slurm'))
+        self.batch = cls_(options=config.get('batch_options', ""), log=log)
+        self.job_array = bool(config.get('batch_job_array', False))
+        self._poll_interval = float(config.get('batch_poll_interval', 30))
+        self._last_poll = None
+        self._poll_failures = 0
+        self._jobs = dict()
+
+    @staticmethod
+    def batch_paths(p):
+        """Return the paths of the batch script for the wrapped POD *p*, and of
+        the log file that the script's output is written to.
+        """
+        base = os.path.join(p.pod.POD_WK_DIR, p.pod.name)
+        return base + '.batch.sh', base + '.batch.log'
+
+    def write_batch_script(self, p, header=None):
+        """Write a bash script that runs the wrapped POD *p* in its working
+        directory, with its own environment variables, and send its output to
+        the log file given by :meth:`batch_paths`. *header* is an optional list
+        of scheduler directives. Returns the path of the script.
+        """
+        script_path, log_path = self.batch_paths(p)
+        # jobs inherit the submitting environment, so only export changes to it
+        commands, env_vars = self.subprocess_commands(p, os.environ.copy())
+        env_vars = {k: v for k, v in env_vars.items() if os.environ.get(k) != v}
+        lines = ['#!/bin/bash'] + (header or []) + [
+            f"exec >{shlex.quote(log_path)} 2>&1",
+            f"cd {shlex.quote(p.pod.POD_WK_DIR)}"
+        ]
+        lines.extend(f"export {k}={shlex.quote(v)}" for k, v in env_vars.items())
+        lines.append(commands)
+        with io.open(script_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.chmod(script_path, 0o755)
+        return script_path
+
+    def prepare_pod(self, p):
+        """Do setup for the wrapped POD *p* and write its batch script. Returns
+        True if successful.
+        """
+        p.pod.log.info('%s: run %s.', self.__class__.__name__, p.pod.full_name)
+        try:
+            p.pre_run_setup()
+        except Exception as exc:
+            p.setup_exception_handler(exc)
+            return False
+        try:
+            p.pod.log_file.write(f"### Start execution of {p.pod.full_name}\n")
+            p.pod.log_file.write(80 * '-' + '\n')
+            p.pod.log_file.flush()
+            if self.job_array:
+                self.write_batch_script(p)
+            else:
+                cores, memory = self.scheduler.pod_resources(p.pod)
+                _, log_path = self.batch_paths(p)
+                self.write_batch_script(p, header=self.batch.directives(
+                    f"MDTF_{p.pod.name}", log_path + '.out', cores, memory
+                ))
+        except Exception as exc:
+            p.runtime_exception_handler(exc)
+            return False
+        return True
+
+    def submit_job(self, p):
+        """Submit the batch script written for the wrapped POD *p*."""
+        script_path, _ = self.batch_paths(p)
+        try:
+            job_id = self.batch.submit(script_path)
+        except Exception as exc:
+            p.runtime_exception_handler(exc)
+            return
+        p.start_time = time.monotonic()
+        p.pod.log.info("Submitted %s as batch job %s.", p.pod.full_name, job_id)
+        self._jobs[job_id] = p
+
+    def submit_job_array(self, pods):
+        """Submit the batch scripts written for all wrapped *pods* as one job
+        array.
+        """
+        if not pods:
+            return
+        resources = [self.scheduler.pod_resources(p.pod) for p in pods]
+        batch_dir = os.path.dirname(pods[0].pod.POD_WK_DIR)
+        script_path = os.path.join(batch_dir, 'MDTF_job_array.sh')
+        lines = ['#!/bin/bash'] + self.batch.directives(
+            'MDTF_job_array', os.path.join(batch_dir, 'MDTF_job_array.out'),
+            max(c for c, _ in resources), max(m for _, m in resources),
+            array_size=len(pods)
+        )
+        lines.append('scripts=(' + ' '.join(
+            shlex.quote(self.batch_paths(p)[0]) for p in pods) + ')')
+        lines.append(
+            f'exec bash "${{scripts[${self.batch.array_index_var}]}}"'
+        )
+        with io.open(script_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        try:
+            job_id = self.batch.submit(script_path)
+        except Exception as exc:
+            for p in pods:
+                p.runtime_exception_handler(exc)
+            return
+        self.batch.log.info("Submitted %d PODs as batch job array %s.",
+            len(pods), job_id)
+        for i, p in enumerate(pods):
+            p.start_time = time.monotonic()
+            self._jobs[self.batch.task_id(job_id, i)] = p
+
+    def collect_pod_log(self, p):
+        """Append the output of the wrapped POD *p*'s batch job to its log file.
+        """
+        _, log_path = self.batch_paths(p)
+        for path in (log_path, log_path + '.out'):
+            if p.pod.log_file is None or not os.path.isfile(path):
+                continue
+            with io.open(path, 'r', encoding='utf-8', errors='replace') as f:
+                p.pod.log_file.write(f.read())
+
+    def poll_pods(self):
+        """Submit queued PODs as separate jobs (job arrays are only submitted
+        by :meth:`run`), then tear down PODs whose jobs have finished. The batch
+        scheduler is queried at most once every ``batch_poll_interval`` seconds,
+        however often this is called.
+        """
+        if not self.job_array:
+            for p in list(self._queue):
+                self._queue.remove(p)
+                if self.prepare_pod(p):
+                    self.submit_job(p)
+        if not self._jobs:
+            return
+        now = time.monotonic()
+        if self._last_poll is not None \
+            and now - self._last_poll < self._poll_interval:
+            return
+        self._last_poll = now
+        try:
+            states = self.batch.poll(list(self._jobs))
+        except Exception as exc:
+            self._poll_failures += 1
+            self.batch.log.warning("Couldn't poll batch jobs (attempt %d of %d): %r",
+                self._poll_failures, self._max_poll_failures, exc)
+            if self._poll_failures >= self._max_poll_failures:
+                self.fail_jobs(exc)
+            return
+        self._poll_failures = 0
+        for job_id, retcode in states.items():
+            if retcode is None:
+                continue
+            p = self._jobs.pop(job_id)
+            self.collect_pod_log(p)
+            self.finish_pod(p, retcode)
+
+    def fail_jobs(self, exc):
+        """Cancel all outstanding jobs and fail their PODs, after polling the
+        batch scheduler failed with *exc*.
+        """
+        self.batch.log.error("Giving up on %d batch jobs after %d failed polls.",
+            len(self._jobs), self._poll_failures)
+        try:
+            self.batch.cancel(list(self._jobs))
+        except Exception as cancel_exc:
+            self.batch.log.error("Couldn't cancel batch jobs: %r", cancel_exc)
+        for job_id, p in list(self._jobs.items()):
+            del self._jobs[job_id]
+            p.pod.deactivate(util.chain_exc(exc,
+                f"polling batch job {job_id} for {p.pod.full_name}.",
+                util.PodExecutionError))
+            self.collect_pod_log(p)
+            self.finish_pod(p, None)
+
+    def run_pods(self, env_vars_base):
+        """Submit all active PODs and wait for their jobs to finish, then tear
+        down all PODs.
+        """
+        for p in self.iter_active_pods():
+            if id(p) not in self._submitted:
+                self._submitted.add(id(p))
+                self._queue.append(p)
+        if self.job_array:
+            pods = [p for p in self._queue if self.prepare_pod(p)]
+            self._queue = []
+            self.submit_job_array(pods)
+        self.poll_pods()
+        self.batch.log.info("%s: waiting for %d batch jobs.",
+            self.__class__.__name__, len(self._jobs))
+        while self._jobs:
+            time.sleep(self._poll_interval)
+            self.poll_pods()
+        for p in self.pods:
+            if id(p) not in self._torn_down:
+                p.tear_down()
+        self.wait_for_output()
+
+    def runtime_terminate(self, signum=None, frame=None):
+        """Cancel any outstanding jobs, then clean up as in
+        :meth:`SubprocessRuntimeManager.runtime_terminate`.
+        """
+        try:
+            self.batch.cancel(list(self._jobs))
+        except Exception as exc:
+            self.batch.log.error("Couldn't cancel batch jobs: %r", exc)
+        super(BatchRuntimeManager, self).runtime_terminate(signum, frame)
+
+
+class MultirunBatchRuntimeManager(MultirunSubprocessRuntimeManager,
+                                  BatchRuntimeManager):
+    """:class:`BatchRuntimeManager` for multirun mode."""
+    def __init__(self, pod_dict, EnvMgrClass, parent, OutMgrClass=None):
+        super(MultirunBatchRuntimeManager, self).__init__(
+            pod_dict, EnvMgrClass, parent, OutMgrClass=OutMgrClass
+        )
+        self.init_batch(parent.log)
+
+    def runtime_terminate(self, signum=None, frame=None):
+        try:
+            self.batch.cancel(list(self._jobs))
+        except Exception as exc:
+            self.batch.log.error("Couldn't cancel batch jobs: %r", exc)
+        super(MultirunBatchRuntimeManager, self).runtime_terminate(signum, frame)
@@ -118,36 +118,11 @@ class MultirunDataframeQueryDataSourceBase(data_manager.DataframeQueryDataSource
         (returning a dataframe with results) from the processing of those
         results, in order to simplify overriding by child classes.
         """
-        # construct query string for non-DateRange attributes
         query_d = util.WormDict()
         query_d.update(dc.asdict(self.attrs))
         field_synonyms = getattr(self, '_query_attrs_synonyms', dict())
         query_d.update(var.query_attrs(field_synonyms))
-        clauses = [self._query_clause(k, k, v) for k,v in query_d.items()]
-        query_str = '&'.join(c for c in clauses if c)
-
-        # filtering on DateRange is done here, separately, due to limitations on
-        # pd.query()/pd.eval() -- arbitrary method calls not supported, at least
-        # not efficiently. TODO: better implementation with <=/>= separate
-        # start/end date columns.
-        catalog_df = self.df
-        for col_name, v in query_d.items():
-            if isinstance(v, util.DateRange):
-                if col_name not in catalog_df:
-                    # e.g., for sample model data where date_range not in catalog
-                    continue
-                # select files whose date range overlaps analysis date range
-                # (in case we're dealing with chunked/multi-file data)
-                row_sel = catalog_df.apply(
-                    (lambda r: r[col_name].overlaps(v)),
-                    axis=1
-                )
-                catalog_df = catalog_df[row_sel]
-
-        return catalog_df.query(
-            query_str,
-            local_dict={'d': util.NameSpace.fromDict(query_d)}
-        )
+        return self._select_catalog(query_d)
 
     def check_group_daterange(self, group_df, expt_key=None, log=_log):
         """Sort the files found for each experiment by date, verify that
@@ -199,9 +174,7 @@ class MultirunDataframeQueryDataSourceBase(data_manager.DataframeQueryDataSource
         query_df = self._query_catalog(var)
         # assign set of sets of catalog row indices to var's data attr
         # filter out empty entries = queries that failed.
-        expt_groups = query_df.groupby(
-            by=(lambda idx: self.col_spec.expt_key(query_df, idx))
-        )
+        expt_groups = self._group_by_expt(query_df)
         var.data = util.ConsistentDict()
         for expt_key, group in expt_groups:
             group = self.check_group_daterange(group, expt_key=expt_key, log=var.log)
@@ -3,10 +3,15 @@ the PODs' output files.
 """
 import os
 import abc
+import concurrent.futures
 import datetime
 import glob
 import io
+import shlex
 import shutil
+import subprocess
+import tarfile
+import time
 from src import util, core, verify_links
 
 import logging
@@ -16,6 +21,143 @@ class AbstractOutputManager(abc.ABC):
     """Abstract interface for any OutputManager."""
     def __init__(self, case): pass
 
+# Compressors for the output tar file, by name: the file extension to use, and
+# either the command of an external program that compresses stdin to stdout
+# ({threads} is replaced by the number of threads to use), or the compression
+# done by python's tarfile module ("gz" or "" for none).
+_tar_compressors = {
+    'gzip': ('.tar', None, 'gz'),
+    'pigz': ('.tar', 'pigz -p {threads} -c', None),
+    'zstd': ('.tar.zst', 'zstd -T{threads} -q -c', None),
+    'none': ('.tar', None, '')
+}
+
+class TarArchiveWriter(object):
+    """Writes a tar file as a stream, so that directories can be added to it as
+    they become ready instead of all at once, and compresses it with one of the
+    methods in ``_tar_compressors``. If an external compressor isn't available,
+    falls back to gzip.
+    """
+    # extensions of files left out of the archive
+    _exclude = ('.netCDF', '.nc', '.ps', '.PS', '.eps')
+    # extensions of directories left out of the archive (Zarr stores)
+    _exclude_dirs = ('.zarr', )
+
+    def __init__(self, path, compressor='gzip', threads=0, log=_log):
+        """Open the archive for writing.
+
+        Args:
+            path (str): Path of the archive, without extension.
+            compressor (str): Key in ``_tar_compressors``.
+            threads (int): Number of threads to pass to an external compressor.
+                Default (0) uses all available CPUs.
+            log: Logger.
+        """
+        ext, cmd, mode = _tar_compressors[self.resolve_compressor(compressor, log)]
+        self.path = path + ext
+        self.log = log
+        self._added = set()
+        self._deferred = []
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = io.open(self.path, 'wb')
+        self._process = None
+        if cmd is not None:
+            cmd = cmd.format(threads=(threads or os.cpu_count() or 1))
+            self._process = subprocess.Popen(
+                shlex.split(cmd), stdin=subprocess.PIPE, stdout=self._file
+            )
+            self._tar = tarfile.open(fileobj=self._process.stdin, mode='w|')
+        else:
+            self._tar = tarfile.open(fileobj=self._file, mode='w|' + mode)
+
+    @staticmethod
+    def resolve_compressor(compressor, log=_log):
+        """Return the key in ``_tar_compressors`` of the compression that will
+        actually be used for *compressor*: either *compressor* itself, or 'gzip'
+        if its external program isn't available.
+        """
+        if compressor not in _tar_compressors:
+            raise ValueError(f"Unknown tar compressor '{compressor}'.")
+        cmd = _tar_compressors[compressor][1]
+        if cmd is not None and shutil.which(cmd.split()[0]) is None:
+            log.warning("Couldn't find '%s'; compressing tar file with gzip.",
+                cmd.split()[0])
+            return 'gzip'
+        return compressor
+
+    def __contains__(self, path):
+        return path in self._added
+
+    def _filter(self, tarinfo):
+        if tarinfo.isfile() and tarinfo.name.endswith(self._exclude):
+            return None
+        if tarinfo.isdir() and tarinfo.name.endswith(self._exclude_dirs):
+            return None
+        return tarinfo
+
+    def add(self, path, arcname, deferred=None):
+        """Add the file or directory tree at *path* to the archive as *arcname*.
+        Files in the list *deferred* are skipped for now and added when the
+        archive is closed, for files (such as logs) that may still be written to.
+        """
+        deferred = set(deferred or [])
+        for f in deferred:
+            if os.path.exists(f):
+                self._deferred.append(
+                    (f, os.path.join(arcname, os.path.relpath(f, path)))
+                )
+        def _filter(tarinfo):
+            if os.path.join(path, os.path.relpath(tarinfo.name, arcname)) \
+                in deferred:
+                return None
+            return self._filter(tarinfo)
+        self._tar.add(path, arcname=arcname, filter=_filter)
+        self._added.add(path)
+
+    def close(self):
+        """Add any deferred files and finish writing the archive. If this fails,
+        the incomplete archive is deleted.
+        """
+        try:
+            for f, arcname in self._deferred:
+                self._tar.add(f, arcname=arcname, filter=self._filter)
+            self._deferred = []
+            self._tar.close()
+            if self._process is not None:
+                self._process.stdin.close()
+                retcode = self._process.wait()
+                if retcode != 0:
+                    raise util.MDTFCalledProcessError(retcode, self._process.args)
+        except Exception:
+            self.abort()
+            raise
+        self._file.close()
+
+    def abort(self):
+        """Stop writing the archive without finishing it: stop the external
+        compressor, if any, and delete the incomplete file. Does nothing if the
+        archive has already been closed.
+        """
+        if self._file.closed:
+            return
+        self.log.warning("Deleting incomplete tar file '%s'.", self.path)
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+        try:
+            # pipe to a killed compressor raises BrokenPipeError
+            self._tar.close()
+        except (OSError, ValueError):
+            pass
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
 def html_templating_dict(pod):
     """Returns the dict of recognized substitutions to perform in html templating
     for *pod*.
@@ -29,6 +171,17 @@ def html_templating_dict(pod):
     return d
 
 
+def resource_usage_report(pods):
+    """Returns a dict, keyed by POD name, of the status and resources used by
+    each of *pods*, as recorded by the RuntimeManager.
+    """
+    d = dict()
+    for pod in pods:
+        d[pod.name] = {'status': str(pod.status)}
+        d[pod.name].update(getattr(pod, 'resource_usage', None) or dict())
+    return d
+
+
 class HTMLSourceFileMixin:
     """Convienience method to define location of html templates in one place.
     """
@@ -88,6 +241,13 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
     """Performs cleanup tasks specific to a single POD when that POD has
     finished running.
     """
+    # Flags to pass to ghostscript for PS -> PNG conversion (in particular
+    # bitmap resolution.)
+    _gs_convert_flags = ("-dSAFER -dBATCH -dNOPAUSE -dEPSCrop -r150 "
+        "-sDEVICE=png16m -dTextAlphaBits=4 -dGraphicsAlphaBits=4")
+    # max number of (single-page) EPS files to convert in one gs invocation.
+    _eps_batch_size = 16
+
     def __init__(self, pod, output_mgr):
         """Copy configuration info from :class:`~src.diagnostic.Diagnostic`
         object *pod*.
@@ -106,6 +266,9 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
         except KeyError as exc:
             pod.deactivate(exc)
             raise
+        self.convert_workers = config.get('convert_workers', 0)
+        if not self.convert_workers or self.convert_workers < 0:
+            self.convert_workers = os.cpu_count() or 1
         self.CODE_ROOT = output_mgr.CODE_ROOT
         self.CODE_DIR = pod.POD_CODE_DIR
         self.WK_DIR = pod.POD_WK_DIR
@@ -151,57 +314,48 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
         moved to ``$POD_WK_DIR/`` *dest\_subdir*, preserving subdirectories (via
         :func:`~util.recursive_copy`.)
 
+        Up to the ``convert_workers`` setting's number of ghostscript processes
+        are run in parallel, and single-page EPS files are converted in batches
+        to amortize ghostscript's startup cost. Files whose .png in
+        ``$POD_WK_DIR/`` *dest\_subdir* is newer than the source are skipped.
+
         Args:
             src_subdir: Subdirectory tree of ``$POD_WK_DIR`` to search for vector
                 graphics files.
             dest_subdir: Subdirectory tree of ``$POD_WK_DIR`` to move converted
                 bitmap files to.
-        """
-        # Flags to pass to ghostscript for PS -> PNG conversion (in particular
-        # bitmap resolution.)
-        eps_convert_flags = ("-dSAFER -dBATCH -dNOPAUSE -dEPSCrop -r150 "
-                             "-sDEVICE=png16m -dTextAlphaBits=4 -dGraphicsAlphaBits=4")
 
+        Returns:
+            Tuple of the number of files converted and the number skipped
+            because they were up to date.
+        """
         abs_src_subdir = os.path.join(self.WK_DIR, src_subdir)
         abs_dest_subdir = os.path.join(self.WK_DIR, dest_subdir)
         files = util.find_files(
             abs_src_subdir,
             ['*.ps', '*.PS', '*.eps', '*.EPS', '*.pdf', '*.PDF']
         )
-        for f in files:
-            f_stem, _ = os.path.splitext(f)
-            # Append "_MDTF_TEMP" + page number to output files ("%d" = ghostscript's
-            # template for multi-page output). If input .ps/.pdf file has multiple
-            # pages, this will generate 1 png per page, counting from 1.
-            f_out = f_stem + '_MDTF_TEMP_%d.png'
-            cmd = f'gs {eps_convert_flags} -sOutputFile="{f_out}" {f}'
-            try:
-                util.run_shell_command(cmd)
-            except Exception as exc:
-                self.obj.log.error("%s produced malformed plot: %s",
-                                   self.obj.full_name, f[len(abs_src_subdir):])
-                if isinstance(exc, util.MDTFCalledProcessError):
-                    self.obj.log.debug(
-                        "gs error encountered when converting %s for %s:\n%s",
-                        self.obj.full_name, f[len(abs_src_subdir):],
-                        getattr(exc, "output", "")
-                    )
-                continue
-            # gs ran successfully; check how many files it created:
-            out_files = glob.glob(f_stem + '_MDTF_TEMP_?.png')
-            if not out_files:
-                raise util.MDTFFileNotFoundError(f"No .png generated from {f}.")
-            elif len(out_files) == 1:
-                # got one .png, so remove suffix.
-                os.rename(out_files[0], f_stem + '.png')
-            else:
-                # Multiple .pngs. Drop the MDTF_TEMP suffix and renumber starting
-                # from zero (forget which POD requires this.)
-                for n in range(len(out_files)):
-                    os.rename(
-                        f_stem + f'_MDTF_TEMP_{n+1}.png',
-                        f_stem + f'-{n}.png'
-                    )
+        n_skipped = len(files)
+        to_convert = [f for f in files \
+            if not self._png_is_current(f, abs_src_subdir, abs_dest_subdir)]
+        # EPS files have exactly one page, so several can be converted by one
+        # gs invocation; others may have multiple pages and are done one by one
+        eps_files = [f for f in to_convert if f.lower().endswith('.eps')]
+        jobs = [eps_files[k:k + self._eps_batch_size] \
+            for k in range(0, len(eps_files), self._eps_batch_size)]
+        jobs.extend([f] for f in to_convert if not f.lower().endswith('.eps'))
+        n_skipped -= len(to_convert)
+        if len(jobs) > 1 and self.convert_workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.convert_workers, thread_name_prefix='convert'
+            ) as executor:
+                futures = [executor.submit(self._convert_figures, job, abs_src_subdir) \
+                    for job in jobs]
+                for future in futures:
+                    future.result()
+        else:
+            for job in jobs:
+                self._convert_figures(job, abs_src_subdir)
         # move converted figures and any figures that were saved directly as bitmaps
         files = util.find_files(
             abs_src_subdir, ['*.png', '*.gif', '*.jpg', '*.jpeg']
@@ -210,6 +364,86 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
             files, abs_src_subdir, abs_dest_subdir,
             copy_function=shutil.move, overwrite=True
         )
+        return len(to_convert), n_skipped
+
+    @staticmethod
+    def _png_is_current(f, abs_src_subdir, abs_dest_subdir):
+        """True if the .png converted from vector graphics file *f* (or the
+        first page of it) already exists in *abs_dest_subdir* and is newer than
+        *f*, e.g. from an earlier run of the POD's output processing.
+        """
+        f_stem, _ = os.path.splitext(os.path.relpath(f, abs_src_subdir))
+        f_stem = os.path.join(abs_dest_subdir, f_stem)
+        for png in (f_stem + '.png', f_stem + '-0.png'):
+            try:
+                if os.path.getmtime(png) >= os.path.getmtime(f):
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def _run_gs(self, in_files, f_out):
+        cmd = ' '.join([f'gs {self._gs_convert_flags} -sOutputFile="{f_out}"']
+            + [f'"{f}"' for f in in_files])
+        util.run_shell_command(cmd)
+
+    def _convert_figures(self, in_files, abs_src_subdir):
+        """Convert the vector graphics files *in_files* to .png with ghostscript.
+        A list of several files is converted by a single invocation, which
+        assumes each has one page; if that fails, they're converted one by one.
+        """
+        if len(in_files) > 1:
+            f_stem, _ = os.path.splitext(in_files[0])
+            f_out = f_stem + '_MDTF_BATCH_%d.png'
+            try:
+                self._run_gs(in_files, f_out)
+                out_files = glob.glob(f_stem + '_MDTF_BATCH_*.png')
+                if len(out_files) == len(in_files):
+                    for n, f in enumerate(in_files):
+                        os.replace(f_stem + f'_MDTF_BATCH_{n+1}.png',
+                            os.path.splitext(f)[0] + '.png')
+                    return
+            except Exception:
+                pass
+            for f in glob.glob(f_stem + '_MDTF_BATCH_*.png'):
+                os.remove(f)
+        for f in in_files:
+            self._convert_figure(f, abs_src_subdir)
+
+    def _convert_figure(self, f, abs_src_subdir):
+        """Convert the vector graphics file *f* to one .png per page."""
+        f_stem, _ = os.path.splitext(f)
+        # Append "_MDTF_TEMP" + page number to output files ("%d" = ghostscript's
+        # template for multi-page output). If input .ps/.pdf file has multiple
+        # pages, this will generate 1 png per page, counting from 1.
+        f_out = f_stem + '_MDTF_TEMP_%d.png'
+        try:
+            self._run_gs([f], f_out)
+        except Exception as exc:
+            self.obj.log.error("%s produced malformed plot: %s",
+                               self.obj.full_name, f[len(abs_src_subdir):])
+            if isinstance(exc, util.MDTFCalledProcessError):
+                self.obj.log.debug(
+                    "gs error encountered when converting %s for %s:\n%s",
+                    self.obj.full_name, f[len(abs_src_subdir):],
+                    getattr(exc, "output", "")
+                )
+            return
+        # gs ran successfully; check how many files it created:
+        out_files = glob.glob(f_stem + '_MDTF_TEMP_*.png')
+        if not out_files:
+            raise util.MDTFFileNotFoundError(f"No .png generated from {f}.")
+        elif len(out_files) == 1:
+            # got one .png, so remove suffix.
+            os.rename(out_files[0], f_stem + '.png')
+        else:
+            # Multiple .pngs. Drop the MDTF_TEMP suffix and renumber starting
+            # from zero (forget which POD requires this.)
+            for n in range(len(out_files)):
+                os.rename(
+                    f_stem + f'_MDTF_TEMP_{n+1}.png',
+                    f_stem + f'-{n}.png'
+                )
 
     def cleanup_pod_files(self):
         """Copy and remove remaining files to ``$POD_WK_DIR``.
@@ -217,7 +451,8 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
         In order, this 1) copies any bitmap figures in any subdirectory of
         ``$POD_OBS_DATA`` to ``$POD_WK_DIR/obs`` (needed for legacy PODs without
         digested observational data), 2) removes vector graphics if requested,
-        3) removes netCDF scratch files in ``$POD_WK_DIR`` if requested.
+        3) removes netCDF scratch files and Zarr stores (see
+        :meth:`remove_data_files`) in ``$POD_WK_DIR`` if requested.
 
         Settings are set at runtime, when :class:`~core.ConfigManager` is
         initialized.
@@ -235,15 +470,23 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
                 shutil.rmtree(d)
         # delete netCDF files, keep everything else
         if self.save_non_nc:
-            for f in util.find_files(self.WK_DIR, '*.nc'):
-                os.remove(f)
+            self.remove_data_files()
         # delete all generated data
         # actually deletes contents of any 'netCDF' subdirs
         elif not self.save_nc:
             for d in util.find_files(self.WK_DIR, 'netCDF'+os.sep):
                 shutil.rmtree(d)
-            for f in util.find_files(self.WK_DIR, '*.nc'):
-                os.remove(f)
+            self.remove_data_files()
+
+    def remove_data_files(self):
+        """Remove netCDF files and Zarr stores (directories, depending on the
+        POD's ``data_format``) in ``$POD_WK_DIR``.
+        """
+        for d in util.find_files(self.WK_DIR, '*.zarr'+os.sep):
+            if os.path.isdir(d):  # may be inside one removed already
+                shutil.rmtree(d)
+        for f in util.find_files(self.WK_DIR, '*.nc'):
+            os.remove(f)
 
     def make_output(self):
         """Top-level method to make POD-specific output, post-init. Split off
@@ -259,8 +502,12 @@ class HTMLPodOutputManager(HTMLSourceFileMixin):
         self.write_data_log_file()
         if not self.obj.failed:
             self.make_pod_html()
-            self.convert_pod_figures(os.path.join('model', 'PS'), 'model')
-            self.convert_pod_figures(os.path.join('obs', 'PS'), 'obs')
+            start_time = time.monotonic()
+            n_model = self.convert_pod_figures(os.path.join('model', 'PS'), 'model')
+            n_obs = self.convert_pod_figures(os.path.join('obs', 'PS'), 'obs')
+            self.obj.log.info(("Converted %d figures for %s in %.1f s (%d already "
+                "up to date)."), n_model[0] + n_obs[0], self.obj.full_name,
+                time.monotonic() - start_time, n_model[1] + n_obs[1])
             self.cleanup_pod_files()
 
 
@@ -284,6 +531,10 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
             self.file_overwrite = self.overwrite # overwrite both config and .tar
         except KeyError as exc:
             case.log.exception("Caught %r", exc)
+        self.tar_compressor = config.get('tar_compressor', 'gzip')
+        self.tar_threads = config.get('tar_threads', 0)
+        # results of checking links, shared by all PODs; see verify_pod_links()
+        self._link_cache = dict()
         self.CODE_ROOT = case.code_root
         self.WK_DIR = case.MODEL_WK_DIR       # abbreviate
         self.OUT_DIR = case.MODEL_OUT_DIR     # abbreviate
@@ -291,10 +542,61 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
 
     @property
     def _tarball_file_path(self):
-        paths = core.PathManager()
-        assert hasattr(self, 'WK_DIR')
-        file_name = self.WK_DIR + '.tar'
-        return os.path.join(paths.OUTPUT_DIR, file_name)
+        # written next to the final output directory; extension is added by
+        # TarArchiveWriter
+        assert hasattr(self, 'OUT_DIR')
+        return self.OUT_DIR
+
+    @property
+    def archive(self):
+        """The :class:`TarArchiveWriter` for this run's output, which is shared
+        by all OutputManagers for :attr:`obj` and opened on first use, or None
+        if no tar file is being made.
+        """
+        if not self.make_variab_tar or self.dry_run:
+            return None
+        archive = getattr(self.obj, '_output_archive', None)
+        if archive is None:
+            compressor = TarArchiveWriter.resolve_compressor(
+                self.tar_compressor, log=self.obj.log)
+            ext = _tar_compressors[compressor][0]
+            out_path = base_path = self._tarball_file_path
+            if not self.file_overwrite:
+                # same naming as util.bump_version, which would put the version
+                # number inside a multi-part extension like '.tar.zst'
+                v = 0
+                while os.path.exists(out_path + ext):
+                    v += 1
+                    out_path = f"{base_path}.v{v}"
+            archive = TarArchiveWriter(out_path, compressor=compressor,
+                threads=self.tar_threads, log=self.obj.log)
+            self.obj.log.info("%s: Writing '%s'.", self.obj.full_name,
+                archive.path)
+            self.obj._output_archive = archive
+        return archive
+
+    def abort_archive(self):
+        """Stop writing the output tar file and delete it, if one was opened and
+        not finished: called if making the output fails or the run is killed.
+        """
+        archive = getattr(self.obj, '_output_archive', None)
+        if archive is not None:
+            self.obj._output_archive = None
+            archive.abort()
+
+    def archive_pod_output(self, pod):
+        """Add *pod*'s working directory to the output tar file, so that the
+        tar file is written while other PODs are still running. Its log file
+        is added at the end, once it's closed.
+        """
+        if os.path.dirname(pod.POD_WK_DIR) != self.WK_DIR:
+            # multirun mode: POD_WK_DIR is the top-level directory
+            return
+        archive = self.archive
+        if archive is None or pod.POD_WK_DIR in archive:
+            return
+        archive.add(pod.POD_WK_DIR, pod.name,
+            deferred=[os.path.join(pod.POD_WK_DIR, f"{pod.name}.log")])
 
     def append_result_link(self, pod):
         """Update the top level index.html page with a link to *pod*'s results.
@@ -324,6 +626,24 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
             src = self.html_src_file('pod_result_snippet.html')
         util.append_html_template(src, self.CASE_TEMP_HTML, template_d)
 
+    def make_pod_output(self, pod):
+        """Process the output of a single *pod* with a
+        :class:`HTMLPodOutputManager` and check its html page for missing links.
+        Called from :meth:`make_output`, or earlier by a RuntimeManager as soon
+        as *pod* finishes running; each POD's output is only processed once.
+        """
+        if pod.output_done:
+            return
+        pod.output_done = True
+        try:
+            pod_output = self._PodOutputManagerClass(pod, self)
+            pod_output.make_output()
+            if not pod.failed:
+                self.verify_pod_links(pod)
+            self.archive_pod_output(pod)
+        except Exception as exc:
+            pod.deactivate(exc)
+
     def verify_pod_links(self, pod):
         """Check for missing files linked to from POD's html page.
 
@@ -338,7 +658,8 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
             self.POD_HTML(pod),  # root html file to start search at
             self.WK_DIR,         # root directory to resolve relative paths
             verbose=False,
-            log=pod.log
+            log=pod.log,
+            cache=self._link_cache
         )
         missing_out = verifier.verify_pod_links(pod.name)
         if missing_out:
@@ -371,6 +692,13 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
             os.remove(self.CASE_TEMP_HTML)
         shutil.copy2(self.html_src_file('mdtf_diag_banner.png'), self.WK_DIR)
 
+    def write_resource_report(self, pods):
+        """Write the resources used by each of *pods* to a machine-readable
+        file named ``resource_usage.json``.
+        """
+        out_file = os.path.join(self.WK_DIR, 'resource_usage.json')
+        util.write_json(resource_usage_report(pods), out_file, log=self.obj.log)
+
     def backup_config_files(self):
         """Record user input configuration in a file named ``config_save.json``
         for rerunning.
@@ -388,21 +716,21 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
             util.write_json(config_tup.contents, out_file, log=self.obj.log)
 
     def make_tar_file(self):
-        """Make tar file of web/bitmap output.
+        """Make tar file of web/bitmap output, next to the final output
+        directory. PODs' directories have already been added by
+        :meth:`archive_pod_output`; add everything else in :attr:`WK_DIR` and
+        close the archive.
         """
-        out_path = self._tarball_file_path
-        if not self.file_overwrite:
-            out_path, _ = util.bump_version(out_path)
-            self.obj.log.info("%s: Creating '%s'.", self.obj.full_name, out_path)
-        elif os.path.exists(out_path):
-            self.obj.log.info("%s: Overwriting '%s'.", self.obj.full_name, out_path)
-        tar_flags = [f"--exclude=.{s}" for s in ('netCDF','nc','ps','PS','eps')]
-        tar_flags = ' '.join(tar_flags)
-        util.run_shell_command(
-            f'tar {tar_flags} -czf {out_path} -C {self.WK_DIR} .',
-            dry_run = self.dry_run
-        )
-        return out_path
+        archive = self.archive
+        if archive is None:
+            return None
+        for f in sorted(os.listdir(self.WK_DIR)):
+            path = os.path.join(self.WK_DIR, f)
+            if path not in archive:
+                archive.add(path, f)
+        archive.close()
+        self.obj._output_archive = None
+        return archive.path
 
     def copy_to_output(self):
         """Copy all files to the user-specified output directory (``$OUTPUT_DIR``).
@@ -425,38 +753,36 @@ class HTMLOutputManager(AbstractOutputManager, HTMLSourceFileMixin):
         """Top-level method for doing all output activity post-init. Spun into a
         separate method to make subclassing easier.
         """
-        # create empty text file for PODs to append to; equivalent of 'touch'
-        open(self.CASE_TEMP_HTML, 'w').close()
-        for pod in self.obj.iter_children():
-            try:
-                pod_output = self._PodOutputManagerClass(pod, self)
-                pod_output.make_output()
+        try:
+            # create empty text file for PODs to append to; equivalent of 'touch'
+            open(self.CASE_TEMP_HTML, 'w').close()
+            for pod in self.obj.iter_children():
+                self.make_pod_output(pod)
+            for pod in self.obj.iter_children():
+                try:
+                    self.append_result_link(pod)
+                except Exception as exc:
+                    # won't go into the html output, but will be present in the
+                    # summary for the case
+                    pod.deactivate(exc)
+                    continue
+                pod.close_log_file(log=True)
                 if not pod.failed:
-                    self.verify_pod_links(pod)
-            except Exception as exc:
-                pod.deactivate(exc)
-                continue
-        for pod in self.obj.iter_children():
-            try:
-                self.append_result_link(pod)
-            except Exception as exc:
-                # won't go into the html output, but will be present in the
-                # summary for the case
-                pod.deactivate(exc)
-                continue
-            pod.close_log_file(log=True)
-            if not pod.failed:
-                pod.status = core.ObjectStatus.SUCCEEDED
-
-        self.make_html()
-        self.backup_config_files()
-        self.write_data_log_file()
-        if self.make_variab_tar:
-            _ = self.make_tar_file()
-        self.copy_to_output()
-        if not self.obj.failed \
-                and not any(p.failed for p in self.obj.iter_children()):
-            self.obj.status = core.ObjectStatus.SUCCEEDED
+                    pod.status = core.ObjectStatus.SUCCEEDED
+
+            self.make_html()
+            self.backup_config_files()
+            self.write_resource_report(self.obj.iter_children())
+            self.write_data_log_file()
+            if self.make_variab_tar:
+                _ = self.make_tar_file()
+            self.copy_to_output()
+            if not self.obj.failed \
+                    and not any(p.failed for p in self.obj.iter_children()):
+                self.obj.status = core.ObjectStatus.SUCCEEDED
+        finally:
+            # archive is only still open here if something above failed
+            self.abort_archive()
 
 
 class MultirunHTMLOutputManager(HTMLOutputManager,
@@ -480,6 +806,10 @@ class MultirunHTMLOutputManager(HTMLOutputManager,
             self.file_overwrite = self.overwrite  # overwrite both config and .tar
         except KeyError as exc:
             self.log.exception("Caught %r", exc)
+        self.tar_compressor = config.get('tar_compressor', 'gzip')
+        self.tar_threads = config.get('tar_threads', 0)
+        # results of checking links, shared by all PODs; see verify_pod_links()
+        self._link_cache = dict()
 
         self.CODE_ROOT = pod._parent.code_root
         self.WK_DIR = pod.POD_WK_DIR       # abbreviate
@@ -518,34 +848,33 @@ class MultirunHTMLOutputManager(HTMLOutputManager,
         """Top-level method for doing all output activity post-init. Spun into a
         separate method to make subclassing easier.
         """
-        # create empty text file for PODs to append to; equivalent of 'touch'
-        open(self.CASE_TEMP_HTML, 'w').close()
         try:
-            pod_output = self._PodOutputManagerClass(pod, self)
-            pod_output.make_output()
+            # create empty text file for PODs to append to; equivalent of 'touch'
+            open(self.CASE_TEMP_HTML, 'w').close()
+            self.make_pod_output(pod)
+            try:
+                self.append_result_link(pod)  # problems here
+            except Exception as exc:
+                # won't go into the html output, but will be present in the
+                # summary for the case
+                pod.deactivate(exc)
+            pod.close_log_file(log=True)
             if not pod.failed:
-                self.verify_pod_links(pod)
-        except Exception as exc:
-            pod.deactivate(exc)
-        try:
-            self.append_result_link(pod)  # problems here
-        except Exception as exc:
-            # won't go into the html output, but will be present in the
-            # summary for the case
-            pod.deactivate(exc)
-        pod.close_log_file(log=True)
-        if not pod.failed:
-            pod.status = core.ObjectStatus.SUCCEEDED
+                pod.status = core.ObjectStatus.SUCCEEDED
 
-        self.make_html()
-        self.backup_config_files()
-        self.write_data_log_file()
-        if self.make_variab_tar:
-            _ = self.make_tar_file()
-        self.copy_to_output()
-        if not self.obj.failed \
-                and not any(p.failed for p in self.obj.iter_children()):
-            self.obj.status = core.ObjectStatus.SUCCEEDED
+            self.make_html()
+            self.backup_config_files()
+            self.write_resource_report([pod])
+            self.write_data_log_file()
+            if self.make_variab_tar:
+                _ = self.make_tar_file()
+            self.copy_to_output()
+            if not self.obj.failed \
+                    and not any(p.failed for p in self.obj.iter_children()):
+                self.obj.status = core.ObjectStatus.SUCCEEDED
+        finally:
+            # archive is only still open here if something above failed
+            self.abort_archive()
 
     def make_html(self, cleanup=True):
         """Add header and footer to the temporary output file at CASE_TEMP_HTML.
@@ -105,11 +105,11 @@ class SingleRunPod(PodSetupBaseClass, ABC):
         convention won't be found by the POD.
         """
         if var.is_static:
-            f_name = f"{self.name}.{var.name}.static.nc"
+            f_name = f"{self.name}.{var.name}.static{pod.data_file_suffix}"
             return os.path.join(pod.POD_WK_DIR, f_name)
         else:
             freq = var.T.frequency.format_local()
-            f_name = f"{self.name}.{var.name}.{freq}.nc"
+            f_name = f"{self.name}.{var.name}.{freq}{pod.data_file_suffix}"
             return os.path.join(pod.POD_WK_DIR, freq, f_name)
 
 
@@ -209,9 +209,9 @@ class MultiRunPod(PodSetupBaseClass, ABC):
         # all files in a specified file list (txt file, json, yaml)
 
         if var.is_static:
-            f_name = f"{case_name}.{var.name}.static.nc"
+            f_name = f"{case_name}.{var.name}.static{self.data_file_suffix}"
             return os.path.join(self.MODEL_WK_DIR[case_name], f_name)
         else:
             freq = var.T.frequency.format_local()
-            f_name = f"{case_name}.{var.name}.{freq}.nc"
+            f_name = f"{case_name}.{var.name}.{freq}{self.data_file_suffix}"
             return os.path.join(self.MODEL_WK_DIR[case_name], freq, f_name)
@@ -3,12 +3,18 @@ once it's been downloaded; see :doc:`fmwk_preprocess`.
 """
 import os
 import shutil
+import stat
 import abc
 import dataclasses
 import datetime
 import functools
-from src import util, core, varlistentry_util, diagnostic, xr_parser, units
+import hashlib
+import json
+import threading
+import time
+from src import util, core, data_model, varlistentry_util, diagnostic, xr_parser, units
 import cftime
+import dask
 import numpy as np
 import xarray as xr
 
@@ -141,6 +147,113 @@ def multirun_edit_request_wrapper(multirun_wrapped_edit_request_func):
     return wrapped_edit_request
 
 
+@util.mdtf_dataclass(frozen=True)
+class AffineTransform():
+    """Linear transformation ``x -> scale * x + offset`` of the values of a
+    variable. PreprocessorFunctions which rescale the values of the dependent
+    variable (:class:`ApplyScaleAndOffsetFunction`, :class:`ConvertUnitsFunction`)
+    don't modify the data directly, but compose their transformation with any
+    pending one via :meth:`defer`. The result is applied in a single pass over
+    the data by :meth:`apply_pending` when the Dataset is written.
+    """
+    scale: float = 1.0
+    offset: float = 0.0
+
+    # key in DataArray encoding used to store pending transformation
+    _encoding_key = '_mdtf_pending_transform'
+    # DataArray encoding describing how values were stored in the input file,
+    # which doesn't apply to transformed values
+    _packing_keys = ('dtype', 'scale_factor', 'add_offset', 'missing_value',
+        '_Unsigned')
+
+    @property
+    def is_identity(self):
+        return (self.scale == 1.0 and self.offset == 0.0)
+
+    def then(self, other):
+        """Return the AffineTransform equivalent to applying this transform,
+        followed by the transform *other*.
+        """
+        return AffineTransform(
+            scale=other.scale * self.scale,
+            offset=other.scale * self.offset + other.offset
+        )
+
+    @classmethod
+    def pending(cls, ds, name):
+        """Return the transform pending on variable *name* of Dataset *ds*.
+        """
+        return ds[name].encoding.get(cls._encoding_key, cls())
+
+    def defer(self, ds, name):
+        """Compose this transform with the one pending on variable *name* of
+        Dataset *ds*. The values of *name* aren't modified.
+        """
+        encoding = ds[name].encoding
+        encoding[self._encoding_key] = self.pending(ds, name).then(self)
+        return ds
+
+    @classmethod
+    def apply_pending(cls, ds):
+        """Apply and remove the transforms pending on all variables of *ds*.
+        """
+        for name in list(ds.variables):
+            transform = ds[name].encoding.pop(cls._encoding_key, None)
+            if transform is not None and not transform.is_identity:
+                ds = transform.apply(ds, name)
+        return ds
+
+    @staticmethod
+    def _kernel(x, scale, offset, dtype, inplace=False):
+        """Compute ``scale * x + offset`` with a result of type *dtype*, without
+        allocating temporaries. If *inplace* is True and *x* already has the
+        correct dtype, overwrite *x* with the result.
+        """
+        if inplace and x.dtype == dtype and x.flags.writeable:
+            out = x
+        else:
+            out = np.empty(x.shape, dtype=dtype)
+        if scale != 1.0:
+            np.multiply(x, scale, out=out)
+            if offset != 0.0:
+                np.add(out, offset, out=out)
+        else:
+            np.add(x, offset, out=out)
+        return out
+
+    def apply(self, ds, name):
+        """Apply this transform to the values of variable *name* of Dataset
+        *ds*. Floating-point data keeps its dtype; integer data is promoted to
+        float32 or float64. Dask-backed data is transformed lazily, as one
+        operation per chunk; otherwise the transform is done in-place.
+
+        The variable's encoding is kept, except for the keys in
+        ``_packing_keys`` and, if the input was packed or of integer type,
+        ``_FillValue``: otherwise xarray would write the transformed values
+        packed with the input's scale_factor and add_offset. Missing values
+        are then written with xarray's default _FillValue for the new dtype.
+        """
+        variable = ds[name].variable
+        dtype = np.promote_types(variable.dtype, np.float32)
+        encoding = variable.encoding
+        if 'scale_factor' in encoding or 'add_offset' in encoding \
+                or not np.issubdtype(encoding.get('dtype', dtype), np.floating):
+            encoding.pop('_FillValue', None)
+        for k in self._packing_keys:
+            encoding.pop(k, None)
+        if variable.chunks is not None:
+            # dask-backed
+            variable.data = variable.data.map_blocks(
+                self._kernel, self.scale, self.offset, dtype, dtype=dtype
+            )
+        else:
+            # .values returns an in-memory copy if data hasn't been loaded yet
+            variable.data = self._kernel(
+                variable.values, self.scale, self.offset, dtype, inplace=True
+            )
+        return ds
+
+
 class PreprocessorFunctionBase(abc.ABC):
     """Abstract interface for implementing a specific preprocessing functionality.
     As described in :doc:`fmwk_preprocess`, each preprocessing operation is
@@ -194,6 +307,15 @@ class PreprocessorFunctionBase(abc.ABC):
         """
         return dataset
 
+    def restore(self, var, *args):
+        """Called instead of :meth:`process` when *var*'s request is fulfilled
+        with data preprocessed for another request (see
+        :meth:`MDTFPreprocessorBase.restore_metadata`). Makes any changes to
+        *var* done by :meth:`process` that don't depend on the data, other than
+        those to its translation, which are restored separately.
+        """
+        pass
+
 
 class CropDateRangeFunction(PreprocessorFunctionBase):
     """A PreprocessorFunction which truncates the date range (time axis) of
@@ -438,7 +560,7 @@ class PrecipRateToFluxFunction(PreprocessorFunctionBase):
         ds[tv.name].attrs['units'] = str(new_units)
         tv.units = new_units
         # actual conversion done by ConvertUnitsFunction; this assures
-        # units.convert_dataarray is called with correct parameters.
+        # units.dataarray_conversion is called with correct parameters.
         return ds
 
 
@@ -449,7 +571,8 @@ class ConvertUnitsFunction(PreprocessorFunctionBase):
 
     Unit conversion is implemented by
     `cfunits <https://ncas-cms.github.io/cfunits/index.html>`__; see
-    :doc:`src.units`.
+    :doc:`src.units`. Conversion of the dependent variable is deferred as an
+    :class:`AffineTransform` and done when the data is written.
     """
 
     def edit_request(self, data_mgr, pod):
@@ -464,10 +587,14 @@ class ConvertUnitsFunction(PreprocessorFunctionBase):
         :class:`~src.core.TranslatedVarlistEntry`.
         """
         tv = var.translation  # abbreviate
-        # convert dependent variable
-        ds = units.convert_dataarray(
+        # convert dependent variable: only update units here, and compose the
+        # conversion with any pending scale/offset to be applied on write
+        transform = units.dataarray_conversion(
             ds, tv.name, src_unit=None, dest_unit=var.units, log=var.log
         )
+        if transform is not None:
+            scale, offset = transform
+            ds = AffineTransform(scale=scale, offset=offset).defer(ds, tv.name)
         tv.units = var.units
 
         # convert coordinate dimensions and bounds
@@ -596,6 +723,12 @@ class AssociatedVariablesFunction(PreprocessorFunctionBase):
 
         return ds
 
+    def restore(self, var, *args):
+        """Copy associated files to the POD's wkdir, since they're not part of
+        the reused output file.
+        """
+        self.process(var, None, *args)
+
 
 class ExtractLevelFunction(PreprocessorFunctionBase):
     """Extract a requested pressure level from a Dataset containing a 3D variable.
@@ -725,6 +858,9 @@ class ApplyScaleAndOffsetFunction(PreprocessorFunctionBase):
     <http://cfconventions.org/Data/cf-conventions/cf-conventions-1.8/cf-conventions.html#attribute-appendix>`__
     on the ``scale_factor`` and ``add_offset`` attributes.
 
+    The transformation is deferred as an :class:`AffineTransform` and done
+    when the data is written, combined with any unit conversion.
+
     .. note::
 
        By default this function is not applied. It's only provided to implement
@@ -749,7 +885,7 @@ class ApplyScaleAndOffsetFunction(PreprocessorFunctionBase):
         # CF standard says to scale first
         if ds_var.attrs.get('scale_factor', ''):
             scale_factor = float(ds_var.attrs['scale_factor'])
-            ds_var *= scale_factor
+            ds = AffineTransform(scale=scale_factor).defer(ds, tv_name)
             del ds_var.attrs['scale_factor']
             var.log.info("Scaled values of '%s' variable in %s by a factor of %f.",
                          tv_name, var.full_name, scale_factor,
@@ -758,7 +894,7 @@ class ApplyScaleAndOffsetFunction(PreprocessorFunctionBase):
 
         if ds_var.attrs.get('add_offset', ''):
             add_offset = float(ds_var.attrs['add_offset'])
-            ds_var += add_offset
+            ds = AffineTransform(offset=add_offset).defer(ds, tv_name)
             del ds_var.attrs['add_offset']
             var.log.info("Added an offset of %f to values of '%s' variable in %s.",
                          add_offset, tv_name, var.full_name,
@@ -771,6 +907,410 @@ class ApplyScaleAndOffsetFunction(PreprocessorFunctionBase):
 # ==================================================
 
 
+def _dm_var_signature(v):
+    """Return a hashable tuple summarizing the metadata of the
+    :class:`~src.data_model.DMVariable` *v* (name, units and coordinates) that
+    determines the contents of preprocessed output.
+    """
+    def _coord_signature(c):
+        return (
+            c.name, c.standard_name, str(c.units), c.axis,
+            getattr(c, 'value', None),
+            getattr(getattr(c, 'bounds_var', None), 'name', None)
+        )
+
+    return (
+        v.name, v.standard_name, str(v.units), getattr(v, 'modifier', ""),
+        tuple(_coord_signature(c) for c in v.dims),
+        tuple(_coord_signature(c) for c in v.scalar_coords)
+    )
+
+
+def _dm_var_metadata(tv):
+    """Return a dict recording the attributes of the translated variable *tv*
+    (name, units and the names, units, values and bounds of its coordinates)
+    that are set by the preprocessor and used to define the POD's environment
+    variables. Used to restore *tv* when preprocessed output is reused.
+    """
+    def _coord_metadata(c):
+        value = c.value
+        if hasattr(value, 'item'):
+            value = value.item()  # numpy scalar
+        return {
+            'name': c.name, 'units': str(c.units), 'value': value,
+            'bounds': c.bounds
+        }
+
+    return {
+        'name': tv.name,
+        'units': str(tv.units),
+        'dims': [_coord_metadata(c) for c in tv.dims],
+        'scalar_coords': [_coord_metadata(c) for c in tv.scalar_coords]
+    }
+
+
+def _restore_dm_var_metadata(tv, metadata):
+    """Set the attributes of the translated variable *tv* to those recorded in
+    *metadata* by :func:`_dm_var_metadata`. Units are only replaced if they
+    differ, so that calendars on time coordinates are kept.
+    """
+    def _restore_units(obj, units_str):
+        if str(obj.units) != units_str:
+            obj.units = units.to_cfunits(units_str)
+
+    for attr in ('dims', 'scalar_coords'):
+        if len(getattr(tv, attr)) != len(metadata[attr]):
+            raise ValueError(f"Coordinates of {tv.name} don't match those of "
+                             f"preprocessed output ({metadata[attr]}).")
+    tv.name = metadata['name']
+    _restore_units(tv, metadata['units'])
+    for attr in ('dims', 'scalar_coords'):
+        for c, c_d in zip(getattr(tv, attr), metadata[attr]):
+            c.name = c_d['name']
+            _restore_units(c, c_d['units'])
+            c.value = c_d['value']
+            if c_d['bounds'] is None:
+                c.bounds_var = None
+            elif c.bounds != c_d['bounds']:
+                data_model.DMCoordinateBounds.from_coordinate(c, 'bnds')
+                c.bounds_var.name = c_d['bounds']
+
+
+@dataclasses.dataclass
+class _RegistryEntry:
+    """Record of a preprocessed file in :class:`PreprocessedDataRegistry`.
+    *path* is None until the file has been written successfully; *done* is set
+    when processing finishes, whether or not it was successful. *metadata* is
+    the record of the final translated variable from :func:`_dm_var_metadata`.
+    """
+    path: str = None
+    metadata: dict = None
+    done: threading.Event = dataclasses.field(default_factory=threading.Event)
+
+
+class PreprocessedDataRegistry(util.Singleton):
+    """Run-wide record of preprocessed output files, so that requests from
+    multiple PODs for identical preprocessed data (as determined by
+    :meth:`MDTFPreprocessorBase.output_key`) are only computed once. Entries are
+    claimed before processing begins, so that concurrent requests for the same
+    data (see :meth:`~src.query_fetch_preprocess.DataSourceQFPMixin.preprocess_data`)
+    wait for the first one instead of duplicating the work.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = dict()
+
+    def acquire(self, key):
+        """Return the :class:`_RegistryEntry` for a previously written file for
+        *key*, if one exists. Otherwise, claim *key* for the caller and return
+        None; the caller must then call either :meth:`register` or
+        :meth:`release`.
+
+        Entries whose file no longer exists are dropped and treated as missing:
+        in ``pipeline_pods`` mode, the output of a POD which has finished may
+        be cleaned up (see
+        :meth:`~src.output_manager.HTMLPodOutputManager.cleanup_pod_files`)
+        while other PODs' data is still being preprocessed.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key, None)
+                if entry is not None and entry.done.is_set() \
+                        and entry.path is not None and not os.path.exists(entry.path):
+                    entry = None
+                if entry is None:
+                    self._entries[key] = _RegistryEntry()
+                    return None
+            entry.done.wait()
+            # if previous attempt failed and released key, or its file was
+            # deleted, try to claim it
+            if entry.path is not None and os.path.exists(entry.path):
+                return entry
+
+    def register(self, key, path, metadata):
+        """Record that preprocessed data for *key* was written to *path*, with
+        the final translated variable described by *metadata*.
+        """
+        with self._lock:
+            entry = self._entries[key]
+            entry.path = path
+            entry.metadata = metadata
+        entry.done.set()
+
+    def release(self, key):
+        """Give up a claim on *key* obtained from :meth:`acquire`, after a
+        failure to write the data.
+        """
+        with self._lock:
+            entry = self._entries.pop(key)
+        entry.done.set()
+
+
+class PreprocessedDataCache(util.Singleton):
+    """Persistent cache of preprocessed output files, shared between runs of the
+    framework. Entries are stored as files named by a hash of
+    :meth:`MDTFPreprocessorBase.cache_key`, so that changes to input files (via
+    their modification times and sizes) or to the requested preprocessing
+    invalidate them. The modification time of each entry is updated when it's
+    used, so that the least recently used entries are deleted first when the
+    total size of the cache exceeds ``preprocessor_cache_size``.
+
+    Each entry is stored with a JSON file recording the final translated
+    variable (see :func:`_dm_var_metadata`), so that it can be restored on
+    later runs. Entries are copied in and out of the cache rather than
+    hard-linked, and made read-only, so that PODs which modify their input
+    files in place can't alter the cached data.
+    """
+    _suffix = '.nc'
+    _metadata_suffix = '.json'
+
+    def __init__(self):
+        config = core.ConfigManager()
+        paths = core.PathManager()
+        self.enabled = not config.get('disable_preprocessor_cache', False)
+        cache_dir = config.get('preprocessor_cache_dir', '')
+        if cache_dir:
+            cache_dir = util.resolve_path(cache_dir, root_path=paths.CODE_ROOT,
+                                          log=_log)
+        else:
+            cache_dir = os.path.join(paths.WORKING_DIR, 'MDTF_preprocessor_cache')
+        self.cache_dir = cache_dir
+        self.max_size = int(
+            float(config.get('preprocessor_cache_size', 100)) * 1024 ** 3
+        )
+        self._lock = threading.Lock()
+
+        if config.get('clear_preprocessor_cache', False):
+            self.clear()
+        if self.enabled:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as exc:
+                _log.warning("Couldn't create preprocessor cache directory %s "
+                             "(%r); disabling cache.", self.cache_dir, exc)
+                self.enabled = False
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self._suffix)
+
+    def clear(self):
+        """Delete all entries in the cache."""
+        if os.path.isdir(self.cache_dir):
+            _log.info("Clearing preprocessor cache at %s.", self.cache_dir)
+            shutil.rmtree(self.cache_dir)
+
+    def _metadata_path(self, key):
+        return os.path.join(self.cache_dir, key + self._metadata_suffix)
+
+    @staticmethod
+    def _copy(src_path, dest_path):
+        """Copy *src_path* to a new file at *dest_path*, replacing (not writing
+        through) any existing file or link there.
+        """
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(src_path, dest_path)
+
+    def fetch(self, key, dest_path):
+        """If an entry for *key* exists, copy it to *dest_path*, mark it as
+        recently used and return the metadata stored with it. Otherwise return
+        None.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(self._metadata_path(key), 'r') as f:
+                metadata = json.load(f)
+            self._copy(path, dest_path)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            _log.warning("Couldn't use preprocessor cache entry %s: %r", path, exc)
+            return None
+        return metadata
+
+    def store(self, key, src_path, metadata):
+        """Add a read-only copy of the file at *src_path* to the cache as the
+        entry for *key*, along with *metadata*, then evict old entries if the
+        cache is over its size limit.
+        """
+        if not self.enabled:
+            return
+        path = self._path(key)
+        # write to temp names first, so other processes never see partial files;
+        # metadata goes first, since entries without it are ignored
+        temp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(self._metadata_path(key) + temp_suffix, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(self._metadata_path(key) + temp_suffix,
+                   self._metadata_path(key))
+        self._copy(src_path, path + temp_suffix)
+        os.chmod(path + temp_suffix, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(path + temp_suffix, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the total size of the cache
+        is below the limit set by ``preprocessor_cache_size``.
+        """
+        with self._lock:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(self._suffix):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                _log.debug("Evicting %s from preprocessor cache.", path)
+                metadata_path = path[:-len(self._suffix)] + self._metadata_suffix
+                for p in (path, metadata_path):
+                    try:
+                        os.remove(p)
+                    except FileNotFoundError:
+                        pass
+                total_size -= size
+
+
+@util.mdtf_dataclass
+class NetcdfEncodingProfile():
+    """Compression and chunking settings for the netCDF files written by the
+    preprocessor, selected with the ``preprocessor_encoding`` option:
+
+    - *zlib*, *complevel*, *shuffle*: Whether to compress data variables with
+      zlib, the compression level (1-9), and whether to apply the HDF5 shuffle
+      filter first.
+    - *chunk_layout*: Shape of the netCDF chunks of time-dependent variables.
+      "time" stores long time series for a small horizontal area in each chunk,
+      so that reading time series at single grid points is fast; "map" stores
+      whole horizontal fields for a few time steps in each chunk. The default
+      (empty string) leaves chunking to the netCDF library.
+    - *chunk_bytes*: Target (uncompressed) size of each chunk, in bytes.
+    - *least_significant_digit*: If set, floating-point data is quantized
+      to this many decimal digits before compression. This is lossy, but
+      greatly improves compression ratios.
+    - *variables*: dict mapping the names of variables in the output file to
+      dicts of any of the above settings, which override the profile-wide
+      values for that variable.
+    """
+    name: str = ""
+    zlib: bool = False
+    complevel: int = 4
+    shuffle: bool = True
+    chunk_layout: str = ""
+    chunk_bytes: int = 4 * 1024 * 1024
+    least_significant_digit: int = None
+    variables: dict = dataclasses.field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.chunk_layout not in ("", "time", "map"):
+            raise ValueError((f"Unknown chunk_layout '{self.chunk_layout}' in "
+                f"netCDF encoding profile '{self.name}'."))
+
+    @classmethod
+    def from_config(cls, profile=None):
+        """Return the profile specified by *profile*, which is either the name
+        of one of the predefined profiles in :data:`NETCDF_ENCODING_PROFILES` or
+        the path to a JSON file defining a profile. Defaults to the value of the
+        ``preprocessor_encoding`` option.
+        """
+        if profile is None:
+            config = core.ConfigManager()
+            profile = config.get('preprocessor_encoding', '')
+        if not profile:
+            profile = 'default'
+        if profile in NETCDF_ENCODING_PROFILES:
+            return cls(name=profile, **NETCDF_ENCODING_PROFILES[profile])
+        if os.path.isfile(profile):
+            d = util.read_json(profile, log=_log)
+            d.setdefault('name', os.path.splitext(os.path.basename(profile))[0])
+            return cls(**d)
+        raise ValueError((f"Unknown netCDF encoding profile '{profile}': not "
+            f"one of {list(NETCDF_ENCODING_PROFILES)} or a JSON file."))
+
+    def settings(self, name):
+        """Return a dict of the settings that apply to the variable named
+        *name*, with per-variable overrides applied.
+        """
+        d = {f.name: getattr(self, f.name) for f in dataclasses.fields(self) \
+            if f.name not in ('name', 'variables')}
+        d.update(self.variables.get(name, dict()))
+        return d
+
+    @staticmethod
+    def chunk_shape(ds_var, t_name, layout, chunk_bytes):
+        """Return the netCDF chunk shape for DataArray *ds_var* with time
+        dimension *t_name* and chunk layout *layout*, or None to use the netCDF
+        library's default.
+        """
+        if not layout or t_name not in ds_var.dims:
+            return None
+        n_elements = max(int(chunk_bytes) // ds_var.dtype.itemsize, 1)
+        n_t = ds_var.sizes[t_name]
+        other_dims = [d for d in ds_var.dims if d != t_name]
+        if layout == 'map':
+            map_size = int(np.prod([ds_var.sizes[d] for d in other_dims]))
+            t_chunk = min(max(n_elements // max(map_size, 1), 1), n_t)
+            return tuple(
+                (t_chunk if d == t_name else ds_var.sizes[d]) for d in ds_var.dims
+            )
+        # layout == 'time'
+        t_chunk = min(n_elements, n_t)
+        if other_dims:
+            side = int((n_elements // t_chunk) ** (1.0 / len(other_dims)))
+        else:
+            side = 1
+        return tuple(
+            (t_chunk if d == t_name else min(max(side, 1), ds_var.sizes[d])) \
+            for d in ds_var.dims
+        )
+
+    def encoding(self, name, ds_var, t_name=None):
+        """Return a dict of the netCDF encoding settings for DataArray
+        *ds_var*, named *name* in the output file, with time dimension *t_name*.
+        """
+        s = self.settings(name)
+        enc = dict()
+        if s['zlib']:
+            enc['zlib'] = True
+            enc['complevel'] = s['complevel']
+            enc['shuffle'] = s['shuffle']
+        if s['least_significant_digit'] is not None and ds_var.dtype.kind == 'f':
+            enc['least_significant_digit'] = s['least_significant_digit']
+        chunks = self.chunk_shape(ds_var, t_name, s['chunk_layout'], s['chunk_bytes'])
+        if chunks is not None:
+            enc['chunksizes'] = chunks
+        return enc
+
+    def apply(self, ds, t_name=None):
+        """Set the encoding of the data variables of Dataset *ds* according to
+        this profile. Settings from the input files that would conflict with
+        the profile's chunking are removed.
+        """
+        for name, ds_var in ds.data_vars.items():
+            enc = self.encoding(name, ds_var, t_name)
+            if 'chunksizes' in enc:
+                for k in ('chunksizes', 'contiguous', 'original_shape'):
+                    ds_var.encoding.pop(k, None)
+            ds_var.encoding.update(enc)
+        return ds
+
+NETCDF_ENCODING_PROFILES = {
+    'default': dict(),
+    'compressed': {'zlib': True},
+    'time_contiguous': {'zlib': True, 'chunk_layout': 'time'},
+    'map_contiguous': {'zlib': True, 'chunk_layout': 'map'}
+}
+"""Predefined :class:`NetcdfEncodingProfile`\s, selectable by name with the
+``preprocessor_encoding`` option. The default profile leaves encoding to
+xarray and the netCDF library."""
+
+
 class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
     """Base class for preprocessing data after it's been fetched, in order to
     convert it into a format expected by PODs.
@@ -800,6 +1340,8 @@ class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
             self.nc_format = "NETCDF4"
         # HACK only used for _FillValue workaround in clean_output_encoding
         self.output_to_ncl = ('ncl' in pod.runtime_requirements)
+        self.encoding_profile = NetcdfEncodingProfile.from_config()
+        self.data_format = getattr(pod, 'data_format', 'netcdf')
 
         # initialize xarray parser
         self.parser = self._XarrayParserClass(data_mgr, pod)
@@ -872,16 +1414,18 @@ class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
             "format": self.nc_format
         }
 
-    def read_one_file(self, var, path_list):
+    def read_one_file(self, var, path_list, chunks=None):
         """Wraps xarray `open_dataset()
         <https://xarray.pydata.org/en/stable/generated/xarray.open_dataset.html>`__
-        to load a single netCDF file.
+        to load a single netCDF file. If *chunks* is given, the file is opened
+        as a dask-backed Dataset with those chunk sizes.
         """
         if len(path_list) != 1:
             raise ValueError(f"{var.full_name}: Expected one file, got {path_list}.")
         var.log.debug("Loaded '%s'.", path_list[0], tags=util.ObjectLogTag.IN_FILE)
         return xr.open_dataset(
             path_list[0],
+            chunks=chunks,
             **self.open_dataset_kwargs
         )
 
@@ -1019,12 +1563,76 @@ class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
         ds.attrs['history'] = hist
         return ds
 
+    def zarr_encoding(self, ds, t_name=None, profile_chunks=True):
+        """Set the encoding of the data variables of Dataset *ds* for writing
+        to Zarr, translating the compression settings of the
+        :class:`NetcdfEncodingProfile` into numcodecs compressors and filters.
+        If *profile_chunks* is True, dask-backed variables are rechunked to the
+        profile's chunk shape; otherwise their existing dask chunks are used.
+        """
+        import numcodecs
+
+        for name, ds_var in ds.variables.items():
+            for k in ('chunks', 'preferred_chunks', 'compressor', 'filters'):
+                ds_var.encoding.pop(k, None)
+            if ds_var.chunks is not None:
+                # Zarr requires uniform chunks (except the last); files combined
+                # by open_mfdataset needn't have the same length
+                ds[name] = ds_var.chunk({d: c[0] for d, c in zip(ds_var.dims, ds_var.chunks)})
+        for name, ds_var in ds.data_vars.items():
+            enc = self.encoding_profile.encoding(name, ds_var, t_name)
+            zarr_enc = dict()
+            filters = []
+            if 'least_significant_digit' in enc:
+                filters.append(numcodecs.Quantize(
+                    digits=enc['least_significant_digit'], dtype=ds_var.dtype
+                ))
+            if enc.get('zlib', False):
+                if enc.get('shuffle', False):
+                    filters.append(numcodecs.Shuffle(elementsize=ds_var.dtype.itemsize))
+                zarr_enc['compressor'] = numcodecs.Zlib(level=enc['complevel'])
+            if filters:
+                zarr_enc['filters'] = filters
+            if profile_chunks and 'chunksizes' in enc:
+                if ds_var.chunks is not None:
+                    ds[name] = ds_var.chunk(dict(zip(ds_var.dims, enc['chunksizes'])))
+                else:
+                    zarr_enc['chunks'] = enc['chunksizes']
+            ds[name].encoding.update(zarr_enc)
+        return ds
+
+    def write_zarr_dataset(self, var, ds, compute=True, profile_chunks=True):
+        """Writes processed Dataset *ds* as a Zarr store at the location
+        specified by the ``dest_path`` attribute of *var*, using xarray
+        `to_zarr()
+        <https://xarray.pydata.org/en/stable/generated/xarray.Dataset.to_zarr.html>`__.
+        Dask-backed variables are written chunk by chunk, in parallel. If
+        *compute* is False, return the dask Delayed object performing the
+        write instead.
+        """
+        os.makedirs(os.path.dirname(var.dest_path), exist_ok=True)
+        if os.path.isdir(var.dest_path):
+            shutil.rmtree(var.dest_path)
+        elif os.path.lexists(var.dest_path):
+            os.remove(var.dest_path)
+        var.log.debug("Writing Zarr store '%s'.", var.dest_path,
+            tags=util.ObjectLogTag.OUT_FILE)
+        t_name = None if var.is_static else var.T.name
+        ds = self.zarr_encoding(ds, t_name, profile_chunks=profile_chunks)
+        return ds.to_zarr(var.dest_path, mode='w', consolidated=True,
+            compute=compute)
+
     def write_dataset(self, var, ds):
         """Writes processed Dataset *ds* to location specified by the
         ``dest_path`` attribute of *var*, using xarray `to_netcdf()
-        <https://xarray.pydata.org/en/stable/generated/xarray.Dataset.to_netcdf.html>`__.
+        <https://xarray.pydata.org/en/stable/generated/xarray.Dataset.to_netcdf.html>`__,
+        or :meth:`write_zarr_dataset` if the POD reads Zarr data.
         May be overwritten by child classes.
         """
+        if self.data_format == 'zarr':
+            self.write_zarr_dataset(var, ds)
+            ds.close()
+            return
         # TODO: remove any netCDF Variables that were present in the input file
         # (and ds) but not needed for PODs' data request
         os.makedirs(os.path.dirname(var.dest_path), exist_ok=True)
@@ -1033,6 +1641,7 @@ class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
             unlimited_dims = []
         else:
             unlimited_dims = [var.T.name]
+        ds = self.encoding_profile.apply(ds, (unlimited_dims or [None])[0])
         ds.to_netcdf(
             path=var.dest_path,
             mode='w',
@@ -1083,27 +1692,159 @@ class MDTFPreprocessorBase(metaclass=util.MDTFABCMeta):
         """
         path_str = util.abbreviate_path(var.dest_path, self.WK_DIR, '$WK_DIR')
         var.log.info("Writing %d mb to %s", ds.nbytes / (1024 * 1024), path_str)
+        try:
+            ds = AffineTransform.apply_pending(ds)
+        except Exception as exc:
+            raise util.chain_exc(exc, (f"converting values to "
+                                       f"write data for {var.full_name}."), util.DataPreprocessEvent)
         try:
             ds = self.clean_output_attrs(var, ds)
             ds = self.log_history_attr(var, ds)
         except Exception as exc:
             raise util.chain_exc(exc, (f"cleaning attributes to "
                                        f"write data for {var.full_name}."), util.DataPreprocessEvent)
+        start_time = time.perf_counter()
         try:
             self.write_dataset(var, ds)
         except Exception as exc:
             raise util.chain_exc(exc, f"writing data for {var.full_name}.",
                                  util.DataPreprocessEvent)
+        self.log_write_stats(var, path_str, time.perf_counter() - start_time)
         del ds  # shouldn't be necessary
 
+    def log_write_stats(self, var, path_str, elapsed):
+        """Log the size of the file written for *var*, the time taken to write
+        it (in seconds) and the encoding profile used.
+        """
+        try:
+            if os.path.isdir(var.dest_path):
+                # Zarr store
+                size = sum(
+                    os.path.getsize(os.path.join(dir_, f)) \
+                    for dir_, _, files in os.walk(var.dest_path) for f in files
+                )
+            else:
+                size = os.path.getsize(var.dest_path)
+        except OSError:
+            return
+        var.log.info("Wrote %.1f mb to %s in %.2f s (encoding profile '%s').",
+            size / (1024 * 1024), path_str, elapsed, self.encoding_profile.name)
+
+    def output_key(self, var):
+        """Return a hashable key identifying the contents of the file written
+        by :meth:`process` for *var*: the input data files, the variable's
+        translation, the POD's requested metadata, the date range and the
+        preprocessing functions applied. Used to detect requests from different
+        PODs for identical data via :class:`PreprocessedDataRegistry`.
+        """
+        if var.is_static:
+            date_range = None
+        else:
+            date_range = str(var.T.range)
+        return (
+            tuple(var.local_data),
+            _dm_var_signature(var.translation),
+            _dm_var_signature(var),
+            date_range,
+            self.__class__.__name__,
+            tuple(f.__class__.__name__ for f in self.functions),
+            tuple(f.__class__.__name__ for f in
+                  getattr(self, 'file_preproc_functions', [])),
+            self.nc_format,
+            self.output_to_ncl,
+            repr(self.encoding_profile),
+            self.data_format
+        )
+
+    def cache_key(self, var):
+        """Return a string key for *var*'s entry in the persistent
+        :class:`PreprocessedDataCache`. This extends :meth:`output_key` with the
+        modification time and size of each input file, so that cache entries
+        are invalidated when the input data changes.
+        """
+        file_stats = []
+        for path in var.local_data:
+            st = os.stat(path)
+            file_stats.append((path, st.st_mtime_ns, st.st_size))
+        key = (tuple(file_stats), self.output_key(var))
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def restore_metadata(self, var, metadata):
+        """Update *var* to match previously preprocessed output, in place of
+        the changes made by :meth:`process_ds`: set the attributes of its
+        translation from *metadata* (see :func:`_dm_var_metadata`) and call the
+        :meth:`~PreprocessorFunctionBase.restore` method of each
+        PreprocessorFunction.
+        """
+        try:
+            _restore_dm_var_metadata(var.translation, metadata)
+        except Exception as exc:
+            raise util.chain_exc(exc, f"restoring metadata for {var.full_name}.",
+                                 util.DataPreprocessEvent)
+        for f in self.functions:
+            f.restore(var)
+
+    def reuse_output(self, var, src_path, metadata):
+        """Fulfill *var*'s request with the previously preprocessed file at
+        *src_path*, by copying it to *var*'s ``dest_path`` and restoring the
+        metadata of the translated variable from *metadata*. As with
+        :class:`PreprocessedDataCache`, the file is copied rather than
+        hard-linked so that PODs which modify their input files in place can't
+        alter each other's data.
+        """
+        path_str = util.abbreviate_path(src_path, self.WK_DIR, '$WK_DIR')
+        var.log.info("Reusing preprocessed data for %s from %s.",
+                     var.full_name, path_str)
+        self.restore_metadata(var, metadata)
+        if os.path.abspath(src_path) == os.path.abspath(var.dest_path):
+            return
+        var.log.debug("Copying '%s'.", var.dest_path, tags=util.ObjectLogTag.OUT_FILE)
+        try:
+            util.copy_path(src_path, var.dest_path, overwrite=True)
+        except Exception as exc:
+            raise util.chain_exc(exc, f"copying data for {var.full_name}.",
+                                 util.DataPreprocessEvent)
+
     def process(self, var):
         """Top-level wrapper method for doing all preprocessing of data files
-        associated with the POD variable *var*.
+        associated with the POD variable *var*. If identical output has already
+        been written for another POD during this run, that file is reused.
         """
         var.log.info("Preprocessing %s.", var)
-        ds = self.load_ds(var)
-        ds = self.process_ds(var, ds)
-        self.write_ds(var, ds)
+        registry = PreprocessedDataRegistry()
+        key = self.output_key(var)
+        entry = registry.acquire(key)
+        if entry is not None:
+            self.reuse_output(var, entry.path, entry.metadata)
+            var.log.debug("Successful preprocessor exit on %s.", var)
+            return
+        try:
+            cache = PreprocessedDataCache()
+            # cache entries are single files, so Zarr stores aren't cached
+            use_cache = (self.data_format == 'netcdf')
+            cache_key = self.cache_key(var) if use_cache else None
+            metadata = cache.fetch(cache_key, var.dest_path) if use_cache else None
+            if metadata is not None:
+                var.log.info("Using cached preprocessed data for %s.",
+                             var.full_name)
+                var.log.debug("Copying '%s'.", var.dest_path,
+                              tags=util.ObjectLogTag.OUT_FILE)
+                self.restore_metadata(var, metadata)
+            else:
+                ds = self.load_ds(var)
+                ds = self.process_ds(var, ds)
+                self.write_ds(var, ds)
+                try:
+                    if use_cache:
+                        cache.store(cache_key, var.dest_path,
+                                    _dm_var_metadata(var.translation))
+                except Exception as exc:
+                    var.log.warning("Couldn't add %s to preprocessor cache: %r",
+                                    var.full_name, exc)
+        except Exception:
+            registry.release(key)
+            raise
+        registry.register(key, var.dest_path, _dm_var_metadata(var.translation))
         var.log.debug("Successful preprocessor exit on %s.", var)
 
 
@@ -1140,6 +1881,8 @@ class NullPreprocessor(MDTFPreprocessorBase):
             self.nc_format = "NETCDF4"
         # HACK only used for _FillValue workaround in clean_output_encoding
         self.output_to_ncl = ('ncl' in pod.runtime_requirements)
+        self.encoding_profile = NetcdfEncodingProfile.from_config()
+        self.data_format = getattr(pod, 'data_format', 'netcdf')
 
         # initialize xarray parser
         self.parser = self._XarrayParserClass(data_mgr, pod)
@@ -1175,11 +1918,32 @@ class DaskMultiFilePreprocessor(MDTFPreprocessorBase):
     :meth:`process`. Note that such functions will not be able to rely on the
     metadata cleaning done by xr_parser."""
 
+    _out_of_core_workers = 2
+    """Number of dask threads used to compute and write chunks in out-of-core
+    mode."""
+    _chunk_memory_factor = 4
+    """Number of copies of each chunk assumed to be held in memory at once by
+    each dask thread (read buffer, decoded values, processed values and
+    compression buffer) when choosing chunk sizes in out-of-core mode."""
+    _out_of_core_complevel = 1
+    """zlib compression level of variables written in out-of-core mode."""
+
     def __init__(self, data_mgr, pod):
         super(DaskMultiFilePreprocessor, self).__init__(data_mgr, pod)
         # initialize PreprocessorFunctionBase objects
         self.file_preproc_functions = \
             [cls_(data_mgr, pod) for cls_ in self._file_preproc_functions]
+        self.memory_limit = self._memory_limit()
+
+    @staticmethod
+    def _memory_limit():
+        """Memory budget for out-of-core mode in bytes, from the
+        ``preprocessor_memory_limit`` option; zero means out-of-core mode is
+        disabled.
+        """
+        config = core.ConfigManager()
+        limit = int(config.get('preprocessor_memory_limit', 0) * 1024 ** 3)
+        return max(limit, 0)
 
     def edit_request(self, data_mgr, pod):
         """Edit *pod*\'s data request, based on the child class's functionality. If
@@ -1203,8 +1967,9 @@ class DaskMultiFilePreprocessor(MDTFPreprocessorBase):
             return ds
 
         assert var.local_data
+        chunks = self.read_chunks(var)
         if len(var.local_data) == 1:
-            ds = self.read_one_file(var, var.local_data)
+            ds = self.read_one_file(var, var.local_data, chunks=chunks)
             return _file_preproc(ds)
         else:
             assert not var.is_static  # just to be safe
@@ -1224,9 +1989,118 @@ class DaskMultiFilePreprocessor(MDTFPreprocessorBase):
                 join="exact",  # raise ValueError if non-time dims conflict
                 parallel=True,  # use dask
                 preprocess=_file_preproc,
+                chunks=chunks,
                 **self.open_dataset_kwargs
             )
 
+    @staticmethod
+    def _bytes_per_step(ds, dim_name):
+        """Size, in bytes, of one index along dimension *dim_name* of all data
+        variables in *ds* that depend on it.
+        """
+        n_bytes = 0
+        for v in ds.data_vars.values():
+            if dim_name in v.dims:
+                n_bytes += v.dtype.itemsize * (v.size // max(v.sizes[dim_name], 1))
+        return n_bytes
+
+    def time_chunk_size(self, ds, dim_name):
+        """Return the number of time steps per dask chunk (and netCDF chunk)
+        used for *ds* in out-of-core mode: the largest number such that
+        ``_out_of_core_workers`` threads, each holding ``_chunk_memory_factor``
+        copies of a chunk, stay within ``memory_limit``. At least one time step
+        is always used.
+        """
+        chunk_budget = self.memory_limit \
+            // (self._out_of_core_workers * self._chunk_memory_factor)
+        step_bytes = self._bytes_per_step(ds, dim_name)
+        if step_bytes <= 0:
+            return ds.sizes[dim_name]
+        return int(min(max(chunk_budget // step_bytes, 1), ds.sizes[dim_name]))
+
+    def read_chunks(self, var):
+        """Return the *chunks* argument passed to xarray when opening the data
+        for *var*: None (the default chunking) unless out-of-core mode is
+        enabled and *var* is time-dependent, in which case the time dimension is
+        split into chunks of size given by :meth:`time_chunk_size`, based on the
+        contents of the first file.
+        """
+        if not self.memory_limit or var.is_static:
+            return None
+        try:
+            t_name = var.translation.T.name
+        except Exception:
+            return None
+        with xr.open_dataset(var.local_data[0], **self.open_dataset_kwargs) as ds:
+            if t_name not in ds.dims:
+                return None
+            chunks = {t_name: self.time_chunk_size(ds, t_name)}
+        var.log.debug("Reading %s with chunks %s.", var.full_name, chunks)
+        return chunks
+
+    def out_of_core_encoding(self, var, ds, time_chunk):
+        """Set the netCDF chunking and compression encoding of the data
+        variables in *ds* to match its dask chunks along the time dimension.
+        Chunking of other dimensions and compression settings are taken from
+        the :class:`NetcdfEncodingProfile`, if it sets them; otherwise other
+        dimensions are stored whole and data is compressed at level
+        ``_out_of_core_complevel``.
+        """
+        t_name = var.T.name
+        for name, v in ds.data_vars.items():
+            enc = self.encoding_profile.encoding(name, v, t_name)
+            for k in ('chunksizes', 'contiguous', 'original_shape'):
+                v.encoding.pop(k, None)
+            if t_name in v.dims:
+                chunks = enc.get('chunksizes', v.shape)
+                enc['chunksizes'] = tuple(
+                    (time_chunk if d == t_name else c) for d, c in zip(v.dims, chunks)
+                )
+            if 'zlib' not in enc:
+                enc.update(zlib=True, complevel=self._out_of_core_complevel,
+                    shuffle=True)
+            v.encoding.update(enc)
+        return ds
+
+    def write_dataset(self, var, ds):
+        """Writes processed Dataset *ds* to the location specified by the
+        ``dest_path`` attribute of *var*.
+
+        If out-of-core mode is enabled (``preprocessor_memory_limit`` is set),
+        *ds* is rechunked along the time dimension to fit the memory budget and
+        the write is streamed chunk by chunk: ``to_netcdf()`` is called with
+        ``compute=False`` and the resulting task graph is evaluated with a
+        dask threaded scheduler with a fixed number of workers, so peak memory
+        doesn't depend on the length of the time series. Otherwise, defers to
+        :meth:`MDTFPreprocessorBase.write_dataset`.
+        """
+        if not self.memory_limit or var.is_static or var.T.name not in ds.dims:
+            return super(DaskMultiFilePreprocessor, self).write_dataset(var, ds)
+
+        t_name = var.T.name
+        time_chunk = self.time_chunk_size(ds, t_name)
+        ds = ds.chunk({t_name: time_chunk})
+        var.log.debug("Writing '%s' out-of-core in chunks of %d time steps.",
+            var.dest_path, time_chunk, tags=util.ObjectLogTag.OUT_FILE)
+        if self.data_format == 'zarr':
+            delayed_write = self.write_zarr_dataset(
+                var, ds, compute=False, profile_chunks=False
+            )
+        else:
+            os.makedirs(os.path.dirname(var.dest_path), exist_ok=True)
+            ds = self.out_of_core_encoding(var, ds, time_chunk)
+            delayed_write = ds.to_netcdf(
+                path=var.dest_path,
+                mode='w',
+                **self.save_dataset_kwargs,
+                unlimited_dims=[t_name],
+                compute=False
+            )
+        with dask.config.set(scheduler='threads',
+            num_workers=self._out_of_core_workers):
+            delayed_write.compute()
+        ds.close()
+
 
 # -------------------------------------------------
 
@@ -1259,6 +2133,7 @@ class MultirunDaskMultiFilePreprocessor(DaskMultiFilePreprocessor):
         # initialize PreprocessorFunctionBase objects
         self.file_preproc_functions = \
             [cls_(data_mgr) for cls_ in self._file_preproc_functions]
+        self.memory_limit = self._memory_limit()
 
     def edit_request(self, data_mgr, *args):
         """Edit *pod*\'s data request, based on the child class's functionality. If
@@ -1292,6 +2167,8 @@ class MultirunDefaultPreprocessor(MultirunDaskMultiFilePreprocessor):
             self.nc_format = "NETCDF4"
         # HACK only used for _FillValue workaround in clean_output_encoding
         self.output_to_ncl = ('ncl' in data_mgr.runtime_requirements)
+        self.encoding_profile = NetcdfEncodingProfile.from_config()
+        self.data_format = getattr(data_mgr, 'data_format', 'netcdf')
 
         # initialize xarray parser
         self.parser = self._XarrayParserClass(data_mgr)
@@ -1370,17 +2247,24 @@ class MultirunDefaultPreprocessor(MultirunDaskMultiFilePreprocessor):
 
         path_str = util.abbreviate_path(var.dest_path, wkdir, '$WK_DIR')
         var.log.info("Writing %d mb to %s", ds.nbytes / (1024 * 1024), path_str)
+        try:
+            ds = AffineTransform.apply_pending(ds)
+        except Exception as exc:
+            raise util.chain_exc(exc, (f"converting values to "
+                                       f"write data for {var.full_name}."), util.DataPreprocessEvent)
         try:
             ds = self.clean_output_attrs(var, ds)
             ds = self.log_history_attr(var, ds)
         except Exception as exc:
             raise util.chain_exc(exc, (f"cleaning attributes to "
                                        f"write data for {var.full_name}."), util.DataPreprocessEvent)
+        start_time = time.perf_counter()
         try:
             self.write_dataset(var, ds)
         except Exception as exc:
             raise util.chain_exc(exc, f"writing data for {var.full_name}.",
                                  util.DataPreprocessEvent)
+        self.log_write_stats(var, path_str, time.perf_counter() - start_time)
         del ds  # shouldn't be necessary
 
 
@@ -1622,6 +2506,8 @@ class MultirunNullPreprocessor(MultirunDefaultPreprocessor):
             self.nc_format = "NETCDF4"
         # HACK only used for _FillValue workaround in clean_output_encoding
         self.output_to_ncl = ('ncl' in data_mgr.runtime_requirements)
+        self.encoding_profile = NetcdfEncodingProfile.from_config()
+        self.data_format = getattr(data_mgr, 'data_format', 'netcdf')
 
         # initialize xarray parser
         self.parser = self._XarrayParserClass(data_mgr)
@@ -1,6 +1,8 @@
 import abc
 import collections
+import concurrent.futures
 import glob
+import hashlib
 from abc import ABC
 import intake_esm
 import os
@@ -211,10 +213,30 @@ class OnTheFlyDirectoryHierarchyQueryMixin(
     crawling a directory hierarchy and populating catalog entry attributes
     by running a regex (\_FileRegexClass) against the paths of files in the
     directory hierarchy.
+
+    The results of the crawl are saved in a catalog index file (see
+    :meth:`catalog_index_path`), so that on subsequent runs only directories
+    whose modification time has changed need to be re-read and re-parsed.
     """
     # optional regex to speed up directory crawl to skip non-matching directories
     # without examining all files; default below is to not skip any directories
     _DirectoryRegex = util.RegexPattern(".*")
+    # name of the directory and file used to save the catalog between runs
+    _catalog_index_dir = '.MDTF_catalog_index'
+    _catalog_index_file = 'catalog.pkl'
+    # increment if the format of the catalog index file changes, including the
+    # pickled state of the objects in it (e.g. util.DateRange)
+    _catalog_index_version = 2
+    # column in catalog index recording the directory each file was found in
+    _catalog_index_dir_col = '_catalog_dir'
+
+    @property
+    def crawl_threads(self):
+        """Number of threads used to list directories when crawling CATALOG_DIR,
+        set by the ``crawl_threads`` CLI option.
+        """
+        config = core.ConfigManager()
+        return max(int(config.get('crawl_threads', 4) or 1), 1)
 
     def iter_files(self):
         """Generator that yields instances of \_FileRegexClass generated from
@@ -223,38 +245,216 @@ class OnTheFlyDirectoryHierarchyQueryMixin(
         """
         # in case CATALOG_DIR is subset of CASE_ROOT_DIR
         path_offset = len(os.path.join(self.attrs.CASE_ROOT_DIR, ""))
-        for root, _, files in os.walk(self.CATALOG_DIR):
+        for root, _, files in util.walk_parallel(
+            self.CATALOG_DIR, n_threads=self.crawl_threads
+        ):
+            yield from self.iter_dir_files(root, files, path_offset)
+
+    def iter_dir_files(self, root, files, path_offset):
+        """Generator that yields instances of \_FileRegexClass for the
+        names *files* in the directory *root*, if *root* matches \_DirectoryRegex.
+        """
+        yield from self._FileRegexClass.from_strings(
+            self._dir_file_paths(root, files, path_offset), path_offset,
+            on_error=self._file_parse_error(path_offset)
+        )
+
+    def dir_file_columns(self, root, files, path_offset):
+        """Same as :meth:`iter_dir_files`, but returns a dict mapping catalog
+        column names to lists of values, without (if possible) creating
+        instances of \_FileRegexClass.
+        """
+        return self._FileRegexClass.from_strings(
+            self._dir_file_paths(root, files, path_offset), path_offset,
+            columns=True, on_error=self._file_parse_error(path_offset)
+        )
+
+    def _dir_file_paths(self, root, files, path_offset):
+        """Generator that yields paths to the non-hidden *files* in the
+        directory *root*, if *root* matches \_DirectoryRegex.
+        """
+        try:
+            self._DirectoryRegex.match(root[path_offset:])
+        except util.RegexParseError:
+            return
+        if not self._DirectoryRegex.is_matched:
+            return
+        for f in files:
+            if not f.startswith('.'):
+                yield os.path.join(root, f)
+
+    def _file_parse_error(self, path_offset):
+        """Return the error handler passed to \_FileRegexClass.from_strings.
+        """
+        def _on_error(path, exc):
+            if isinstance(exc, util.RegexSuppressedError):
+                # decided to silently ignore this file
+                return
+            self.log.info("  Couldn't parse path '%s'.", path[path_offset:])
+        return _on_error
+
+    @property
+    def catalog_index_path(self):
+        """Path to the file used to save the catalog between runs. This is
+        written to a subdirectory of the working directory, named by a hash of
+        CATALOG_DIR; we don't write to the model data directory, which may be
+        shared with other users. The subdirectory is excluded from the crawl, in
+        case the working directory is inside CATALOG_DIR.
+        """
+        hash_ = hashlib.sha1(self.CATALOG_DIR.encode('utf-8')).hexdigest()[:12]
+        root, ext = os.path.splitext(self._catalog_index_file)
+        return os.path.join(
+            core.PathManager().WORKING_DIR, self._catalog_index_dir,
+            f"{root}_{hash_}{ext}"
+        )
+
+    def _catalog_index_signature(self):
+        """Return a string identifying the settings used to generate the
+        catalog, so that saved catalogs generated with different settings are
+        not reused.
+        """
+        def _pattern_signature(pat):
+            if hasattr(pat, '_patterns'):
+                return tuple(_pattern_signature(p) for p in pat._patterns)
+            return (pat.regex.pattern, sorted(pat.fields))
+
+        file_cls = self._FileRegexClass
+        return repr((
+            self._catalog_index_version,
+            os.path.join(self.attrs.CASE_ROOT_DIR, ""),
+            self.CATALOG_DIR,
+            f"{file_cls.__module__}.{file_cls.__qualname__}",
+            _pattern_signature(file_cls._pattern),
+            _pattern_signature(self._DirectoryRegex)
+        ))
+
+    def read_catalog_index(self):
+        """Load the catalog saved by a previous run, if one exists and was
+        generated with the same settings.
+
+        Returns:
+            Tuple of a dict mapping directory paths to tuples of their
+            modification time and subdirectory names, and a DataFrame of catalog
+            entries. If no usable catalog was found, returns an empty dict and
+            None.
+        """
+        path = self.catalog_index_path
+        if not os.path.isfile(path):
             try:
-                self._DirectoryRegex.match(root[path_offset:])
-            except util.RegexParseError:
-                continue
-            if not self._DirectoryRegex.is_matched:
-                continue
-            for f in files:
-                if f.startswith('.'):
-                    continue
-                try:
-                    path = os.path.join(root, f)
-                    yield self._FileRegexClass.from_string(path, path_offset)
-                except util.RegexSuppressedError:
-                    # decided to silently ignore this file
-                    continue
-                except Exception:
-                    self.log.info("  Couldn't parse path '%s'.", path[path_offset:])
-                    continue
+                # create directory before the crawl, so it doesn't affect mtimes
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            except OSError:
+                pass
+            return dict(), None
+        try:
+            # only unpickle files that nobody else could have written
+            st = os.stat(path)
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                self.log.warning("Ignoring catalog index at %s, since it's "
+                                 "writable by other users.", path)
+                return dict(), None
+            index = pd.read_pickle(path)
+            if index.get('signature', None) != self._catalog_index_signature():
+                self.log.debug("Ignoring out of date catalog index at %s.", path)
+                return dict(), None
+            return index['dirs'], index['df']
+        except Exception as exc:
+            self.log.warning("Couldn't read catalog index at %s: %r.", path, exc)
+            return dict(), None
+
+    def write_catalog_index(self, dirs, df):
+        """Save the catalog (DataFrame *df*) and the state of the directories it
+        was generated from (*dirs*) for use in later runs.
+        """
+        path = self.catalog_index_path
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        index = {
+            'signature': self._catalog_index_signature(),
+            'dirs': dirs,
+            'df': df
+        }
+        try:
+            pd.to_pickle(index, temp_path)
+            os.chmod(temp_path, 0o644)  # see read_catalog_index
+            os.replace(temp_path, path)
+            self.log.debug("Wrote catalog index to %s.", path)
+        except Exception as exc:
+            self.log.warning("Couldn't write catalog index to %s: %r.", path, exc)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def crawl_catalog_dirs(self, old_dirs):
+        """Crawl the directory hierarchy in CATALOG_DIR in parallel (see
+        :meth:`~src.util.walk_parallel`), only listing and parsing the contents
+        of directories that aren't present in *old_dirs* or whose modification
+        time has changed. Symbolic links to directories aren't followed, as in
+        :py:func:`os.walk`.
+
+        Returns:
+            Tuple of a dict describing all directories found, in the format used
+            by :meth:`read_catalog_index`, a list of the directories that were
+            (re-)read, and a dict mapping catalog column names to lists of
+            values for the files in those directories.
+        """
+        path_offset = len(os.path.join(self.attrs.CASE_ROOT_DIR, ""))
+        index_dir = os.path.dirname(self.catalog_index_path)
+        dirs = dict()
+        rescanned_dirs = []
+        columns = collections.defaultdict(list)
+
+        def _scan(path):
+            # runs in worker threads, so only do filesystem operations here
+            mtime = os.stat(path).st_mtime_ns
+            if path in old_dirs and old_dirs[path][0] == mtime:
+                return old_dirs[path][1], (mtime, None)
+            subdirs, files = util.scan_dir(path)
+            return tuple(sorted(subdirs)), (mtime, sorted(files))
+
+        for root, subdirs, (mtime, files) in util.walk_parallel(
+            self.CATALOG_DIR, n_threads=self.crawl_threads, scan_function=_scan,
+            exclude_dir=(lambda p: p == index_dir)
+        ):
+            dirs[root] = (mtime, subdirs)
+            if files is None:
+                continue  # unchanged since catalog index was saved
+            rescanned_dirs.append(root)
+            # parse in this thread, since RegexPatterns store match state
+            n_rows = 0
+            for col, values in self.dir_file_columns(root, files, path_offset).items():
+                columns[col].extend(values)
+                n_rows = len(values)
+            columns[self._catalog_index_dir_col].extend([root] * n_rows)
+        return dirs, rescanned_dirs, columns
 
     def generate_catalog(self):
-        """Crawl the directory hierarchy via :meth:`iter_files` and return the
-        set of found files as rows in a Pandas DataFrame.
+        """Crawl the directory hierarchy via :meth:`crawl_catalog_dirs` and return
+        the set of found files as rows in a Pandas DataFrame. Entries for
+        unchanged directories are taken from the catalog index saved by the
+        previous run, if present.
         """
-        # DataFrame constructor must be passed list, not just an iterable
-        df = pd.DataFrame(list(self.iter_files()), dtype='object')
-        if len(df) == 0:
+        old_dirs, old_df = self.read_catalog_index()
+        if old_df is None:
+            old_dirs = dict()
+        dirs, rescanned_dirs, columns = self.crawl_catalog_dirs(old_dirs)
+        new_df = pd.DataFrame(columns, dtype='object')
+        if old_df is not None:
+            self.log.info("Using saved catalog index; rescanned %d of %d directories.",
+                          len(rescanned_dirs), len(dirs))
+            # keep entries for directories that still exist and weren't rescanned
+            keep_dirs = set(dirs).difference(rescanned_dirs)
+            old_df = old_df[old_df[self._catalog_index_dir_col].isin(keep_dirs)]
+            new_df = pd.concat([old_df, new_df], ignore_index=True)
+        if old_df is None or rescanned_dirs or len(dirs) != len(old_dirs):
+            self.write_catalog_index(dirs, new_df)
+
+        if len(new_df) == 0:
             self.log.critical('Directory crawl did not find any files.')
             raise AssertionError('Directory crawl did not find any files.')
         else:
-            self.log.info("Directory crawl found %d files.", len(df))
-        return df
+            self.log.info("Directory crawl found %d files.", len(new_df))
+        # directories are crawled in nondeterministic order
+        new_df = new_df.sort_values(self._catalog_index_dir_col, kind='stable')
+        return new_df.drop(columns=self._catalog_index_dir_col).reset_index(drop=True)
 
 
 class OnTheFlyGlobQueryMixin(
@@ -284,20 +484,28 @@ class OnTheFlyGlobQueryMixin(
         in \_FileRegexClass are returned.
         """
         path_offset = len(os.path.join(self.attrs.CASE_ROOT_DIR, ""))
+        for path in self._glob_paths(path_glob):
+            yield self._FileRegexClass.from_string(path, path_offset)
+
+    def _glob_paths(self, path_glob):
+        """Generator that yields paths matching *path_glob*, relative to
+        CATALOG_DIR.
+        """
         if not os.path.isabs(path_glob):
             path_glob = os.path.join(self.CATALOG_DIR, path_glob)
-        for path in glob.iglob(path_glob, recursive=True):
-            yield self._FileRegexClass.from_string(path, path_offset)
+        yield from glob.iglob(path_glob, recursive=True)
 
     def generate_catalog(self):
         """Build the catalog from the files returned from the set of globs
         provided by :meth:`rel_path_globs`.
         """
+        path_offset = len(os.path.join(self.attrs.CASE_ROOT_DIR, ""))
         catalog_df = pd.DataFrame(dtype='object')
         for glob_tuple in self.iter_globs():
-            # DataFrame constructor must be passed list, not just an iterable
             df = pd.DataFrame(
-                list(self.iter_files(glob_tuple.glob)),
+                self._FileRegexClass.from_strings(
+                    self._glob_paths(glob_tuple.glob), path_offset, columns=True
+                ),
                 dtype='object'
             )
             if len(df) == 0:
@@ -345,6 +553,8 @@ class DataSourceQFPMixin(core.MDTFObjectBase, util.CaseLoggerMixin,
     """Mixin implementing data query, fetch, and preprocessing-related attributes and
        methods
     """
+    _poll_interval = 0.5 # max seconds between calls to on_poll; see preprocess_data()
+
     @property
     def full_name(self):
         return f"<#{self._id}:{self.name}>"
@@ -549,9 +759,53 @@ class DataSourceQFPMixin(core.MDTFObjectBase, util.CaseLoggerMixin,
                 f"Too many iterations in fetch_data() for {self.full_name}."
             )
 
-    def preprocess_data(self):
-        """Hook to run the preprocessing function on all variables.
+    def preprocess_var(self, pv):
+        """Run the preprocessor on a single :class:`PodVarTuple`. Exceptions are
+        logged and returned instead of raised, since this may be called from a
+        worker thread: changes to the status of the variable are made by
+        :meth:`preprocess_data` in the main thread.
+        """
+        try:
+            pv.pod.preprocessor.process(pv.var)
+        except Exception as exc:
+            self.log.exception("%s while preprocessing %s: %r",
+                               util.exc_descriptor(exc), pv.var.full_name, exc)
+            return exc
+        return None
+
+    def pod_data_ready(self, pod, on_pod_ready=None):
+        """Hand *pod* off to the *on_pod_ready* callback once all of its active
+        variables have been preprocessed. Does nothing if *on_pod_ready* is
+        None or *pod* has already been handed off.
         """
+        if on_pod_ready is None or id(pod) in self._pods_ready or not pod.active:
+            return
+        vars_ = list(pod.iter_children(status=core.ObjectStatus.ACTIVE))
+        if not vars_ or any(
+            v.stage < varlistentry_util.VarlistEntryStage.PREPROCESSED for v in vars_
+        ):
+            return
+        self._pods_ready.add(id(pod))
+        self.finish_pod_request(pod)
+        pod.log.info("Data for %s is ready; queueing it to run.", pod.full_name)
+        on_pod_ready(pod)
+
+    def preprocess_data(self, on_pod_ready=None, on_poll=None):
+        """Hook to run the preprocessing function on all variables. If the
+        ``preprocessor_workers`` setting is greater than 1, variables are
+        preprocessed concurrently using a pool of that many threads.
+
+        If *on_pod_ready* is given, it's called (in the main thread) with each
+        POD as soon as all of its variables have been preprocessed, while
+        preprocessing continues for the other PODs. If *on_poll* is given, it's
+        called (in the main thread, with no arguments) after each variable is
+        preprocessed and at least every ``_poll_interval`` seconds while
+        preprocessing is in progress, so that PODs which were started can be
+        monitored; in this case preprocessing is always done in worker threads.
+        """
+        config = core.ConfigManager()
+        n_workers = max(int(config.get('preprocessor_workers', 1) or 1), 1)
+        self._pods_ready = set()
         update = True
         # really a while-loop, but limit # of iterations to be safe
         for _ in range(MAX_DATASOURCE_ITERS):
@@ -559,6 +813,8 @@ class DataSourceQFPMixin(core.MDTFObjectBase, util.CaseLoggerMixin,
                 # fetch alternates for any vars that failed since last time
                 self.fetch_data()
                 update = False
+                if on_poll is not None:
+                    on_poll()
             vars_to_process = [
                 pv for pv in self.iter_vars(active=True)
                 if pv.var.stage < varlistentry_util.VarlistEntryStage.PREPROCESSED
@@ -567,54 +823,96 @@ class DataSourceQFPMixin(core.MDTFObjectBase, util.CaseLoggerMixin,
                 break  # exit: processed everything or nothing active
 
             for pod in self.iter_children(status=core.ObjectStatus.ACTIVE):
-                pod.preprocessor.setup(self, pod)
-            for pv in vars_to_process:
-                try:
-                    pv.pod.preprocessor.process(pv.var)
-                    pv.var.stage = varlistentry_util.VarlistEntryStage.PREPROCESSED
-                except Exception as exc:
-                    update = True
-                    self.log.exception("%s while preprocessing %s: %r",
-                                       util.exc_descriptor(exc), pv.var.full_name, exc)
-                    for d_key in pv.var.iter_data_keys(status=core.ObjectStatus.ACTIVE):
-                        pv.var.deactivate_data_key(d_key, exc)
+                if id(pod) not in self._pods_ready:
+                    pod.preprocessor.setup(self, pod)
+            results = [None] * len(vars_to_process)
+            if (n_workers > 1 and len(vars_to_process) > 1) or on_poll is not None:
+                self.log.debug("Preprocessing %d variables with %d workers.",
+                               len(vars_to_process), n_workers)
+                timeout = None if on_poll is None else self._poll_interval
+                with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=n_workers, thread_name_prefix='preprocess'
+                ) as executor:
+                    futures = {executor.submit(self.preprocess_var, pv): i
+                               for i, pv in enumerate(vars_to_process)}
+                    not_done = set(futures)
+                    while not_done:
+                        done, not_done = concurrent.futures.wait(
+                            not_done, timeout=timeout,
+                            return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            i = futures[future]
+                            results[i] = future.result()
+                            if results[i] is None:
+                                pv = vars_to_process[i]
+                                pv.var.stage = varlistentry_util.VarlistEntryStage.PREPROCESSED
+                                self.pod_data_ready(pv.pod, on_pod_ready)
+                        if on_poll is not None:
+                            on_poll()
+            else:
+                for i, pv in enumerate(vars_to_process):
+                    results[i] = self.preprocess_var(pv)
+                    if results[i] is None:
+                        pv.var.stage = varlistentry_util.VarlistEntryStage.PREPROCESSED
+                        self.pod_data_ready(pv.pod, on_pod_ready)
+            # deactivate failed variables in the main thread, in the same order
+            # as the serial case, so that selection of alternate variables is
+            # unchanged
+            for pv, exc in zip(vars_to_process, results):
+                if exc is None:
                     continue
+                update = True
+                for d_key in pv.var.iter_data_keys(status=core.ObjectStatus.ACTIVE):
+                    pv.var.deactivate_data_key(d_key, exc)
         else:
             # only hit this if we don't break
             raise util.DataRequestError(
                 f"Too many iterations in preprocess_data() for {self.full_name}."
             )
 
-    def request_data(self):
+    def finish_pod_request(self, p):
+        """Record the outcome of the data request for each of *p*'s variables.
+        """
+        for v in p.iter_children():
+            if v.status == core.ObjectStatus.ACTIVE:
+                v.log.debug('Data request for %s completed successfully.',
+                            v.full_name)
+                v.status = core.ObjectStatus.SUCCEEDED
+            elif v.failed:
+                v.log.debug('Data request for %s failed.', v.full_name)
+            else:
+                v.log.debug('Data request for %s not used.', v.full_name)
+        if p.failed:
+            p.log.debug('Data request for %s failed.', p.full_name)
+        else:
+            p.log.debug('Data request for %s completed successfully.',
+                        p.full_name)
+
+    def request_data(self, on_pod_ready=None, on_poll=None):
         """Top-level method to iteratively query, fetch and preprocess all data
         requested by PODs, switching to alternate requested data as needed.
+
+        If *on_pod_ready* is given, each POD is passed to it as soon as its own
+        data has been preprocessed (see :meth:`preprocess_data`), so that it
+        can start running before the data request for the other PODs is done.
+        *on_poll* is called periodically while data is being preprocessed.
         """
         # Call cleanup method if we're killed
         signal.signal(signal.SIGTERM, self.query_and_fetch_cleanup)
         signal.signal(signal.SIGINT, self.query_and_fetch_cleanup)
+        self._pods_ready = set()
         self.pre_query_and_fetch_hook()
         try:
-            self.preprocess_data()
+            self.preprocess_data(on_pod_ready=on_pod_ready, on_poll=on_poll)
         except Exception as exc:
             self.log.exception("%s at DataSource level: %r.",
                                util.exc_descriptor(exc), exc)
         # clean up regardless of success/fail
         self.post_query_and_fetch_hook()
         for p in self.iter_children():
-            for v in p.iter_children():
-                if v.status == core.ObjectStatus.ACTIVE:
-                    v.log.debug('Data request for %s completed successfully.',
-                                v.full_name)
-                    v.status = core.ObjectStatus.SUCCEEDED
-                elif v.failed:
-                    v.log.debug('Data request for %s failed.', v.full_name)
-                else:
-                    v.log.debug('Data request for %s not used.', v.full_name)
-            if p.failed:
-                p.log.debug('Data request for %s failed.', p.full_name)
-            else:
-                p.log.debug('Data request for %s completed successfully.',
-                            p.full_name)
+            if id(p) not in self._pods_ready:
+                self.finish_pod_request(p)
 
     def query_and_fetch_cleanup(self, signum=None, frame=None):
         """Called if framework is terminated abnormally. Not called during
@@ -1,9 +1,13 @@
 import os
+import json
 import sys
 import unittest
 import unittest.mock as mock # define mock os.environ so we don't mess up real env vars
+import tempfile
+import time
 import src.util as util
 from src.environment_manager import SubprocessRuntimeManager
+from src import environment_manager as env_mgr
 
 class TestEnvironmentManager(unittest.TestCase):
     test_config = {'case_list':[{}], 'pod_list':['X']}
@@ -30,6 +34,209 @@ class TestEnvironmentManager(unittest.TestCase):
     def test_run(self):
         pass #TODO
 
+class TestCondaActivationCache(unittest.TestCase):
+    def _mgr(self, tmp):
+        mgr = object.__new__(env_mgr.CondaEnvironmentManager)
+        mgr.log = env_mgr._log
+        mgr.conda_env_root = tmp
+        mgr.conda_exe = 'conda'
+        mgr.use_cache = False # don't write cache file
+        mgr._cache = {'conda_info': dict(), 'envs': dict()}
+        mgr.shell_activate_commands = lambda env_name: ['true']
+        os.makedirs(os.path.join(tmp, 'env1', 'conda-meta'))
+        return mgr
+
+    def test_base_env_signature(self):
+        # cached activation isn't reused if a variable that activation left
+        # unchanged starts from a different value
+        activated = {'X': '1', 'PATH': '/env/bin:/usr/bin'}
+        out = [env_mgr.CondaEnvironmentManager._activation_marker,
+            json.dumps(activated)]
+        with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch('src.util.run_shell_command', return_value=out) as mock_run:
+            mgr = self._mgr(tmp)
+            with mock.patch.dict('os.environ', {'X': '1', 'PATH': '/usr/bin'},
+                clear=True):
+                diff = mgr.activation_env_diff('env1')
+                self.assertEqual(diff, {'PATH': ['prepend', '/env/bin:']})
+                self.assertEqual(mgr.activation_env_diff('env1'), diff)
+            self.assertEqual(mock_run.call_count, 1)
+            with mock.patch.dict('os.environ', {'X': '2', 'PATH': '/usr/bin'},
+                clear=True):
+                diff = mgr.activation_env_diff('env1')
+            self.assertEqual(mock_run.call_count, 2)
+            self.assertEqual(diff['X'], ['set', '1'])
+
+
+class TestPodScheduler(unittest.TestCase):
+    @staticmethod
+    def _pod(name, cores=1, memory=0):
+        pod = util.NameSpace(name=name, full_name=name,
+            runtime_resources={'cores': cores, 'memory': memory})
+        return util.NameSpace(pod=pod)
+
+    def _start(self, sched, queue):
+        started = []
+        for p in sched.iter_startable(list(queue)):
+            queue.remove(p)
+            sched.start(p)
+            started.append(p)
+        return started
+
+    @staticmethod
+    def _names(pods):
+        return [p.pod.name for p in pods]
+
+    def test_order(self):
+        sched = env_mgr.PodScheduler(max_pods=4, cores=4, memory=8 * 1024 ** 3)
+        pods = [self._pod('a'), self._pod('b', memory=4), self._pod('c', cores=2)]
+        self.assertEqual([p.pod.name for p in sched.order(pods)], ['b', 'c', 'a'])
+
+    def test_backfill_limit(self):
+        # 'big' doesn't fit while 'x' runs; small PODs may only jump ahead of
+        # it max_backfill times
+        sched = env_mgr.PodScheduler(max_pods=4, cores=4, max_backfill=2)
+        running = self._pod('x', cores=2)
+        sched.start(running)
+        queue = [self._pod('big', cores=4)] \
+            + [self._pod(f"s{i}") for i in range(4)]
+        small = self._start(sched, queue)
+        self.assertEqual(self._names(small), ['s0', 's1'])
+        self.assertEqual(self._start(sched, queue), [])
+        # freed cores are reserved for 'big', not given to s2, s3
+        sched.finish(running)
+        self.assertEqual(self._start(sched, queue), [])
+        for p in small:
+            sched.finish(p)
+        self.assertEqual(self._names(self._start(sched, queue)), ['big'])
+        self.assertEqual(self._names(queue), ['s2', 's3'])
+
+    def test_oversized_pod(self):
+        # POD requesting more than the machine has still runs on its own
+        sched = env_mgr.PodScheduler(max_pods=4, cores=2)
+        queue = [self._pod('huge', cores=16), self._pod('small')]
+        self.assertEqual(self._names(self._start(sched, queue)), ['huge'])
+
+
+class TestAsyncioRuntimeManager(unittest.TestCase):
+    def _stream(self, data, limit):
+        import asyncio
+        import io
+        log_file = io.StringIO()
+        console = io.StringIO()
+        p = util.NameSpace(pod=util.NameSpace(name='X', log_file=log_file))
+        mgr = util.NameSpace(_timestamp_format='', _stream_limit=limit)
+
+        async def _run():
+            stream = asyncio.StreamReader(limit=limit)
+            stream.feed_data(data)
+            stream.feed_eof()
+            await env_mgr.AsyncioRuntimeManager.stream_output(
+                mgr, p, stream, 'out', console)
+
+        asyncio.run(_run())
+        return [line[len(' [out] '):] for line in log_file.getvalue().splitlines()]
+
+    def test_stream_output(self):
+        lines = self._stream(b'a\nbb\n\nccc', limit=16)
+        self.assertEqual(lines, ['a', 'bb', '', 'ccc'])
+
+    def test_stream_output_long_line(self):
+        # lines longer than the stream limit are passed on in pieces without
+        # losing data
+        long_line = ''.join(str(i % 10) for i in range(50))
+        lines = self._stream(f"x\n{long_line}\ny\n".encode(), limit=16)
+        self.assertEqual(lines[0], 'x')
+        self.assertEqual(lines[-1], 'y')
+        self.assertEqual(''.join(lines[1:-1]), long_line)
+
+
+class TestBatchSchedulers(unittest.TestCase):
+    def _poll_until_done(self, sched, job_ids):
+        for _ in range(100):
+            d = sched.poll(job_ids)
+            if all(v is not None for v in d.values()):
+                return d
+            time.sleep(0.1)
+        self.fail('Jobs did not finish.')
+
+    def test_local_submit_poll(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sched = env_mgr.LocalBatchScheduler()
+            out_path = os.path.join(tmp, 'job.out')
+            script = os.path.join(tmp, 'job.sh')
+            with open(script, 'w') as f:
+                f.write('\n'.join(['#!/bin/bash']
+                    + sched.directives('test', out_path)
+                    + ['echo hello', 'exit 3']) + '\n')
+            job_id = sched.submit(script)
+            d = self._poll_until_done(sched, [job_id])
+            self.assertEqual(d[job_id], 3)
+            with open(out_path) as f:
+                self.assertEqual(f.read().strip(), 'hello')
+
+    def test_local_job_array(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sched = env_mgr.LocalBatchScheduler()
+            script = os.path.join(tmp, 'job.sh')
+            with open(script, 'w') as f:
+                f.write('\n'.join(['#!/bin/bash']
+                    + sched.directives('test', os.devnull, array_size=2)
+                    + [f'exit ${sched.array_index_var}']) + '\n')
+            job_id = sched.submit(script)
+            task_ids = [sched.task_id(job_id, i) for i in range(2)]
+            d = self._poll_until_done(sched, task_ids)
+            self.assertEqual([d[t] for t in task_ids], [0, 1])
+
+    @mock.patch('src.util.run_command', return_value=[
+        '101|COMPLETED|0:0', '102|FAILED|2:0', '103|RUNNING|0:0',
+        '104|CANCELLED by 42|0:0', '105_[0-3]|PENDING|0:0'
+    ])
+    def test_slurm_poll(self, mock_run):
+        sched = env_mgr.SlurmBatchScheduler()
+        d = sched.poll(['101', '102', '103', '104', '105_0'])
+        self.assertDictEqual(d,
+            {'101': 0, '102': 2, '103': None, '104': 1, '105_0': None})
+
+    def test_poll_failures(self):
+        # jobs are cancelled and PODs failed if the scheduler can't be polled
+        mgr = object.__new__(env_mgr.BatchRuntimeManager)
+        mgr.batch = mock.Mock()
+        mgr.batch.poll.side_effect = OSError('sacct: command not found')
+        mgr.job_array = True
+        mgr._queue = []
+        mgr._poll_interval = 0
+        mgr._last_poll = None
+        mgr._poll_failures = 0
+        p = util.NameSpace(pod=mock.Mock())
+        mgr._jobs = {'101': p}
+        with mock.patch.object(mgr, 'collect_pod_log'), \
+            mock.patch.object(mgr, 'finish_pod') as mock_finish:
+            for _ in range(mgr._max_poll_failures - 1):
+                mgr.poll_pods()
+            self.assertIn('101', mgr._jobs)
+            mock_finish.assert_not_called()
+            mgr.poll_pods()
+        self.assertEqual(mgr._jobs, {})
+        mgr.batch.cancel.assert_called_once_with(['101'])
+        p.pod.deactivate.assert_called_once()
+        mock_finish.assert_called_once_with(p, None)
+
+    def test_pbs_task_id(self):
+        sched = env_mgr.PBSBatchScheduler()
+        self.assertEqual(sched.task_id('1234[].server', 5), '1234[5].server')
+
+    def test_batch_scheduler_class(self):
+        self.assertIs(env_mgr.batch_scheduler_class('Slurm'),
+            env_mgr.SlurmBatchScheduler)
+        self.assertIs(
+            env_mgr.batch_scheduler_class(
+                'src.environment_manager:LocalBatchScheduler'),
+            env_mgr.LocalBatchScheduler
+        )
+        with self.assertRaises(ValueError):
+            env_mgr.batch_scheduler_class('lsf')
+
 # ---------------------------------------------------
 
 if __name__ == '__main__':
@@ -0,0 +1,305 @@
+import glob
+import os
+import shutil
+import tarfile
+import tempfile
+import types
+import unittest
+import unittest.mock as mock
+from src import core, output_manager, util
+from src.tests.shared_test_utils import setUp_config_singletons, tearDown_config_singletons
+
+
+class TestTarArchiveWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # mock POD working directory
+        self.pod_dir = os.path.join(self.temp_dir, 'wk', 'POD')
+        os.makedirs(os.path.join(self.pod_dir, 'model', 'netCDF'))
+        os.makedirs(os.path.join(self.pod_dir, 'model', 'PS'))
+        os.makedirs(os.path.join(self.pod_dir, 'model', 'out.zarr', 'tas'))
+        for f in ('POD.html', os.path.join('model', 'fig.png'),
+                  os.path.join('model', 'netCDF', 'out.nc'),
+                  os.path.join('model', 'out.zarr', 'tas', '0.0'),
+                  os.path.join('model', 'PS', 'fig.eps'), 'POD.log'):
+            with open(os.path.join(self.pod_dir, f), 'w') as file_:
+                file_.write(f)
+        self.out_path = os.path.join(self.temp_dir, 'out', 'MDTF_output')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_exclude(self):
+        archive = output_manager.TarArchiveWriter(self.out_path)
+        archive.add(self.pod_dir, 'POD')
+        self.assertIn(self.pod_dir, archive)
+        archive.close()
+        self.assertEqual(archive.path, self.out_path + '.tar')
+        with tarfile.open(archive.path) as tar:
+            names = tar.getnames()
+        self.assertIn('POD/POD.html', names)
+        self.assertIn('POD/model/fig.png', names)
+        self.assertNotIn('POD/model/netCDF/out.nc', names)
+        self.assertNotIn('POD/model/PS/fig.eps', names)
+        self.assertFalse([n for n in names if n.startswith('POD/model/out.zarr')])
+
+    def test_deferred(self):
+        log_path = os.path.join(self.pod_dir, 'POD.log')
+        archive = output_manager.TarArchiveWriter(self.out_path)
+        archive.add(self.pod_dir, 'POD', deferred=[log_path])
+        # log is added with its contents at the time the archive is closed
+        with open(log_path, 'a') as f:
+            f.write('\nfinished')
+        archive.close()
+        with tarfile.open(archive.path) as tar:
+            names = tar.getnames()
+            self.assertEqual(names.count('POD/POD.log'), 1)
+            self.assertEqual(names[-1], 'POD/POD.log')
+            log_str = tar.extractfile('POD/POD.log').read().decode()
+        self.assertEqual(log_str, 'POD.log\nfinished')
+
+    @mock.patch('src.output_manager.shutil.which', return_value=None)
+    def test_gzip_fallback(self, mock_which):
+        archive = output_manager.TarArchiveWriter(self.out_path, compressor='zstd')
+        self.assertIsNone(archive._process)
+        archive.add(self.pod_dir, 'POD')
+        archive.close()
+        self.assertEqual(archive.path, self.out_path + '.tar')
+        with tarfile.open(archive.path, mode='r:gz') as tar:
+            self.assertIn('POD/POD.html', tar.getnames())
+
+    def test_unknown_compressor(self):
+        with self.assertRaises(ValueError):
+            output_manager.TarArchiveWriter(self.out_path, compressor='foo')
+
+    def test_abort(self):
+        archive = output_manager.TarArchiveWriter(self.out_path)
+        archive.add(self.pod_dir, 'POD')
+        archive.abort()
+        self.assertFalse(os.path.exists(archive.path))
+        archive.abort()  # no-op once closed
+
+
+class TestHTMLPodOutputManager(unittest.TestCase):
+    def setUp(self):
+        setUp_config_singletons()
+        self.temp_dir = tempfile.mkdtemp()
+        self.pod_dir = os.path.join(self.temp_dir, 'POD')
+        for d in ('netCDF', 'out.zarr', os.path.join('data', 'in.zarr', 'tas')):
+            os.makedirs(os.path.join(self.pod_dir, 'model', d))
+        self.files = {
+            'nc': os.path.join(self.pod_dir, 'model', 'netCDF', 'out.nc'),
+            'input_nc': os.path.join(self.pod_dir, 'model', 'in.nc'),
+            'zarr': os.path.join(self.pod_dir, 'model', 'out.zarr', '.zattrs'),
+            'input_zarr': os.path.join(self.pod_dir, 'model', 'data', 'in.zarr',
+                                       'tas', '0.0'),
+            'png': os.path.join(self.pod_dir, 'model', 'fig.png')
+        }
+        for f in self.files.values():
+            open(f, 'w').close()
+        self.pod = types.SimpleNamespace(
+            POD_CODE_DIR=self.temp_dir, POD_WK_DIR=self.pod_dir,
+            POD_OBS_DATA=os.path.join(self.temp_dir, 'obs_data')
+        )
+        self.output_mgr = types.SimpleNamespace(CODE_ROOT=self.temp_dir)
+
+    def tearDown(self):
+        tearDown_config_singletons()
+        shutil.rmtree(self.temp_dir)
+
+    def make_pod_output(self, save_nc=False, save_non_nc=False):
+        config = core.ConfigManager()
+        config['save_ps'] = True
+        config['save_nc'] = save_nc
+        config['save_non_nc'] = save_non_nc
+        return output_manager.HTMLPodOutputManager(self.pod, self.output_mgr)
+
+    def test_cleanup_data_files(self):
+        self.make_pod_output().cleanup_pod_files()
+        self.assertEqual(
+            [k for k, f in self.files.items() if os.path.exists(f)], ['png']
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.pod_dir, 'model', 'out.zarr')))
+
+    def test_cleanup_save_non_nc(self):
+        self.make_pod_output(save_non_nc=True).cleanup_pod_files()
+        self.assertEqual(
+            [k for k, f in self.files.items() if os.path.exists(f)], ['png']
+        )
+        self.assertTrue(os.path.isdir(os.path.join(self.pod_dir, 'model', 'netCDF')))
+
+    def test_cleanup_save_nc(self):
+        self.make_pod_output(save_nc=True).cleanup_pod_files()
+        self.assertTrue(all(os.path.exists(f) for f in self.files.values()))
+
+
+class TestConvertFigures(unittest.TestCase):
+    # number of pages in each mock vector graphics file
+    _pages = {'a.eps': 1, 'b.eps': 1, 'c.eps': 1, os.path.join('sub', 'd.eps'): 1,
+              'e.ps': 3, 'f.pdf': 1}
+
+    def setUp(self):
+        setUp_config_singletons()
+        config = core.ConfigManager()
+        for k in ('save_ps', 'save_nc', 'save_non_nc'):
+            config[k] = True
+        config['convert_workers'] = 1
+        self.temp_dir = tempfile.mkdtemp()
+        self.pod_dir = os.path.join(self.temp_dir, 'POD')
+        self.src_dir = os.path.join(self.pod_dir, 'model', 'PS')
+        self.dest_dir = os.path.join(self.pod_dir, 'model')
+        os.makedirs(os.path.join(self.src_dir, 'sub'))
+        for f in self._pages:
+            with open(os.path.join(self.src_dir, f), 'w') as file_:
+                file_.write(f)
+        pod = types.SimpleNamespace(
+            POD_CODE_DIR=self.temp_dir, POD_WK_DIR=self.pod_dir,
+            full_name='<POD>', log=mock.Mock()
+        )
+        self.pod_output = output_manager.HTMLPodOutputManager(
+            pod, types.SimpleNamespace(CODE_ROOT=self.temp_dir)
+        )
+        self.gs_calls = []
+
+    def tearDown(self):
+        tearDown_config_singletons()
+        shutil.rmtree(self.temp_dir)
+
+    def mock_gs(self, in_files, f_out):
+        # write one .png per page of each input file, numbered from 1, whose
+        # contents record the input file and page it came from
+        self.gs_calls.append(list(in_files))
+        n = 0
+        for f in in_files:
+            with open(f, 'r') as file_:
+                name = file_.read()
+            for page in range(self._pages[name]):
+                n += 1
+                with open(f_out % n, 'w') as file_:
+                    file_.write(f"{name}:{page}")
+
+    def read_png(self, name):
+        with open(os.path.join(self.dest_dir, name), 'r') as f:
+            return f.read()
+
+    def convert(self, side_effect=None):
+        with mock.patch.object(self.pod_output, '_run_gs',
+                               side_effect=(side_effect or self.mock_gs)):
+            return self.pod_output.convert_pod_figures(
+                os.path.join('model', 'PS'), 'model'
+            )
+
+    def assert_converted(self):
+        for f, n_pages in self._pages.items():
+            stem = os.path.splitext(f)[0]
+            if n_pages == 1:
+                self.assertEqual(self.read_png(stem + '.png'), f"{f}:0")
+            else:
+                for page in range(n_pages):
+                    self.assertEqual(self.read_png(f"{stem}-{page}.png"),
+                                     f"{f}:{page}")
+        # no temporary files left
+        self.assertFalse(glob.glob(os.path.join(self.pod_dir, '**', '*_MDTF_*'),
+                                   recursive=True))
+
+    def test_batch(self):
+        self.pod_output._eps_batch_size = 3
+        self.assertEqual(self.convert(), (len(self._pages), 0))
+        self.assert_converted()
+        # 4 EPS files in batches of 3 and 1; others converted one by one
+        self.assertEqual(sorted(len(c) for c in self.gs_calls), [1, 1, 1, 3])
+
+    def test_batch_failure(self):
+        # if converting a batch fails, files are converted one by one
+        def _gs(in_files, f_out):
+            if len(in_files) > 1:
+                raise util.MDTFCalledProcessError(1, 'gs')
+            self.mock_gs(in_files, f_out)
+
+        self.assertEqual(self.convert(side_effect=_gs), (len(self._pages), 0))
+        self.assert_converted()
+
+    def test_batch_multipage(self):
+        # batch giving a different number of pages than files is redone one
+        # by one, and any output from the batch is deleted
+        self._pages = dict(self._pages, **{'b.eps': 2})
+        self.convert()
+        self.assert_converted()
+        # one batch of all 4 EPS files, then each of the 6 files one by one
+        self.assertEqual(sorted(len(c) for c in self.gs_calls), [1] * 6 + [4])
+        self.assertIn([os.path.join(self.src_dir, 'b.eps')], self.gs_calls)
+
+    def test_skip_current(self):
+        self.convert()
+        # .pngs have been moved out of src_dir; sources are older
+        for f in self._pages:
+            os.utime(os.path.join(self.src_dir, f), (0, 0))
+        self.gs_calls = []
+        self.assertEqual(self.convert(), (0, len(self._pages)))
+        self.assertEqual(self.gs_calls, [])
+        # modified source is converted again; multi-page file checked by
+        # its first page
+        os.utime(os.path.join(self.src_dir, 'e.ps'))
+        self.assertEqual(self.convert(), (1, len(self._pages) - 1))
+        self.assertEqual(self.gs_calls, [[os.path.join(self.src_dir, 'e.ps')]])
+
+    def test_png_is_current(self):
+        f = os.path.join(self.src_dir, 'sub', 'd.eps')
+        png = os.path.join(self.dest_dir, 'sub', 'd.png')
+        _is_current = output_manager.HTMLPodOutputManager._png_is_current
+        self.assertFalse(_is_current(f, self.src_dir, self.dest_dir))
+        os.makedirs(os.path.dirname(png))
+        open(png, 'w').close()
+        os.utime(f, (1000, 1000))
+        os.utime(png, (2000, 2000))
+        self.assertTrue(_is_current(f, self.src_dir, self.dest_dir))
+        os.utime(png, (500, 500))
+        self.assertFalse(_is_current(f, self.src_dir, self.dest_dir))
+
+
+class TestHTMLOutputManagerArchive(unittest.TestCase):
+    def setUp(self):
+        setUp_config_singletons()
+        self.temp_dir = tempfile.mkdtemp()
+        self.case = types.SimpleNamespace(
+            full_name='case', log=mock.Mock(), _output_archive=None
+        )
+        # bypass __init__, which needs a fully set up case
+        self.out_mgr = output_manager.HTMLOutputManager.__new__(
+            output_manager.HTMLOutputManager
+        )
+        self.out_mgr.obj = self.case
+        self.out_mgr.OUT_DIR = os.path.join(self.temp_dir, 'MDTF_output')
+        self.out_mgr.make_variab_tar = True
+        self.out_mgr.dry_run = False
+        self.out_mgr.file_overwrite = False
+        self.out_mgr.tar_threads = 1
+
+    def tearDown(self):
+        tearDown_config_singletons()
+        shutil.rmtree(self.temp_dir)
+
+    def test_bump_version(self):
+        self.out_mgr.tar_compressor = 'gzip'
+        open(self.out_mgr.OUT_DIR + '.tar', 'w').close()
+        archive = self.out_mgr.archive
+        self.assertEqual(archive.path, self.out_mgr.OUT_DIR + '.v1.tar')
+        self.assertIs(self.out_mgr.archive, archive)
+        self.out_mgr.abort_archive()
+        self.assertIsNone(self.case._output_archive)
+        self.assertFalse(os.path.exists(archive.path))
+
+    @unittest.skipIf(shutil.which('zstd') is None, "zstd not installed")
+    def test_bump_version_zst(self):
+        # existing archive with a different extension is not overwritten
+        self.out_mgr.tar_compressor = 'zstd'
+        open(self.out_mgr.OUT_DIR + '.tar.zst', 'w').close()
+        archive = self.out_mgr.archive
+        self.assertEqual(archive.path, self.out_mgr.OUT_DIR + '.v1.tar.zst')
+        self.out_mgr.abort_archive()
+        self.assertEqual(os.path.getsize(self.out_mgr.OUT_DIR + '.tar.zst'), 0)
+        self.assertFalse(os.path.exists(archive.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,339 @@
+import os
+import shutil
+import tempfile
+import types
+import unittest
+import unittest.mock as mock
+import numpy as np
+import xarray as xr
+from src import core
+import src.diagnostic as diagnostic
+import src.preprocessor as preprocessor
+from src.tests.shared_test_utils import setUp_config_singletons, tearDown_config_singletons
+
+
+class DummyPreprocessor(preprocessor.MDTFPreprocessorBase):
+    """Preprocessor that "reads" a fixed Dataset and only renames variables,
+    counting how many times data was actually processed.
+    """
+    def __init__(self, wk_dir):
+        self.WK_DIR = wk_dir
+        self.data_format = 'netcdf'
+        self.functions = [preprocessor.RenameVariablesFunction(None)]
+        self.n_processed = 0
+
+    def read_dataset(self, var):
+        return xr.Dataset(
+            {'FLUT': (('time', 'latitude', 'lon'), np.zeros((2, 3, 4)))},
+            coords={'time': [0, 1], 'latitude': [-1., 0., 1.],
+                    'lon': [0., 90., 180., 270.]}
+        )
+
+    def load_ds(self, var):
+        return self.read_dataset(var)
+
+    def write_ds(self, var, ds):
+        self.n_processed += 1
+        ds.to_netcdf(var.dest_path)
+
+    def output_key(self, var):
+        return ('dummy', var.name)
+
+    def cache_key(self, var):
+        return 'dummy_' + var.name
+
+
+class TestPreprocessedDataReuse(unittest.TestCase):
+    _dummy_varlist = {
+        "data": {"frequency": "day"},
+        "dimensions": {
+            "lat": {"standard_name": "latitude", "units": "degrees_north"},
+            "lon": {"standard_name": "longitude", "units": "degrees_east"},
+            "time": {"standard_name": "time"}
+        },
+        "varlist": {
+            "rlut": {
+                "standard_name": "toa_outgoing_longwave_flux",
+                "units": "W m-2",
+                "dimensions": ["time", "lat", "lon"]
+            }
+        }
+    }
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        setUp_config_singletons(paths={'WORKING_DIR': self.temp_dir})
+        config = core.ConfigManager()
+        config['preprocessor_cache_dir'] = os.path.join(self.temp_dir, 'cache')
+
+    def tearDown(self):
+        preprocessor.PreprocessedDataRegistry._reset()
+        preprocessor.PreprocessedDataCache._reset()
+        tearDown_config_singletons()
+        shutil.rmtree(self.temp_dir)
+
+    def make_var(self, pod_name):
+        # var whose translation uses different names from those the POD expects
+        pod = types.SimpleNamespace(name=pod_name, _log_name=pod_name)
+        var = diagnostic.Varlist.from_struct(self._dummy_varlist, parent=pod).vars[0]
+        var.translation = core.VariableTranslator().get_convention('None') \
+            .translate(var)
+        var.translation.name = 'FLUT'
+        var.translation.dim_axes['Y'].name = 'latitude'
+        var.dest_path = os.path.join(self.temp_dir, pod_name + '.nc')
+        var.status = core.ObjectStatus.SUCCEEDED
+        return var
+
+    def assert_same_env_vars(self, var1, var2):
+        env1 = var1.env_vars
+        env2 = var2.env_vars
+        self.assertEqual(env1.pop('RLUT_FILE'), var1.dest_path)
+        self.assertEqual(env2.pop('RLUT_FILE'), var2.dest_path)
+        self.assertEqual(env1, env2)
+        self.assertEqual(env1['rlut_var'], 'rlut')
+        self.assertEqual(env1['lat_coord'], 'lat')
+
+    def test_registry_reuse(self):
+        pp = DummyPreprocessor(self.temp_dir)
+        var1 = self.make_var('pod1')
+        var2 = self.make_var('pod2')
+        pp.process(var1)
+        pp.process(var2)
+        self.assertEqual(pp.n_processed, 1)
+        self.assertTrue(os.path.exists(var2.dest_path))
+        # each POD gets its own copy of the data
+        self.assertFalse(os.path.samefile(var1.dest_path, var2.dest_path))
+        self.assert_same_env_vars(var1, var2)
+
+    def test_registry_file_deleted(self):
+        # output of a POD that finished was cleaned up before a later request
+        config = core.ConfigManager()
+        config['disable_preprocessor_cache'] = True
+        pp = DummyPreprocessor(self.temp_dir)
+        var1 = self.make_var('pod1')
+        pp.process(var1)
+        os.remove(var1.dest_path)
+        var2 = self.make_var('pod2')
+        pp.process(var2)
+        self.assertEqual(pp.n_processed, 2)
+        self.assertTrue(os.path.exists(var2.dest_path))
+        var3 = self.make_var('pod3')
+        pp.process(var3)
+        self.assertEqual(pp.n_processed, 2)
+        self.assert_same_env_vars(var2, var3)
+
+    def test_cache_hit_env_vars(self):
+        pp = DummyPreprocessor(self.temp_dir)
+        var1 = self.make_var('pod1')
+        pp.process(var1)
+        # simulate a later run: same request, but no output in the registry
+        preprocessor.PreprocessedDataRegistry._reset()
+        var2 = self.make_var('pod2')
+        pp.process(var2)
+        self.assertEqual(pp.n_processed, 1)
+        self.assert_same_env_vars(var1, var2)
+
+    def test_cache_entry_copied(self):
+        pp = DummyPreprocessor(self.temp_dir)
+        var1 = self.make_var('pod1')
+        pp.process(var1)
+        preprocessor.PreprocessedDataRegistry._reset()
+        var2 = self.make_var('pod2')
+        pp.process(var2)
+        cache = preprocessor.PreprocessedDataCache()
+        cache_path = cache._path(pp.cache_key(var2))
+        self.assertEqual(os.stat(cache_path).st_mode & 0o222, 0)  # read-only
+        # modifying POD's input in place leaves cache entry unchanged
+        for path in (var1.dest_path, var2.dest_path):
+            self.assertFalse(os.path.samefile(path, cache_path))
+            with open(path, 'r+b') as f:
+                f.write(b'garbage')
+        ds = xr.open_dataset(cache_path)
+        self.assertIn('rlut', ds)
+        ds.close()
+
+    def test_cache_missing_metadata(self):
+        # entries from earlier versions without metadata are treated as misses
+        cache = preprocessor.PreprocessedDataCache()
+        src_path = os.path.join(self.temp_dir, 'src.nc')
+        with open(src_path, 'w') as f:
+            f.write('data')
+        cache.store('abc', src_path, {'name': 'foo'})
+        dest_path = os.path.join(self.temp_dir, 'out', 'dest.nc')
+        self.assertEqual(cache.fetch('abc', dest_path), {'name': 'foo'})
+        os.remove(cache._metadata_path('abc'))
+        self.assertIsNone(cache.fetch('abc', dest_path))
+
+
+class TestOutOfCorePreprocessing(unittest.TestCase):
+    # float32 data: 10 * 20 * 4 = 800 bytes per time step
+    _shape = (100, 10, 20)
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        setUp_config_singletons(paths={'WORKING_DIR': self.temp_dir})
+        self.in_path = os.path.join(self.temp_dir, 'in.nc')
+        self.make_ds().to_netcdf(self.in_path)
+
+    def tearDown(self):
+        tearDown_config_singletons()
+        shutil.rmtree(self.temp_dir)
+
+    def make_ds(self):
+        return xr.Dataset(
+            {'tas': (('time', 'lat', 'lon'),
+                     np.ones(self._shape, dtype=np.float32))},
+            coords={'time': np.arange(self._shape[0], dtype=np.float64),
+                    'lat': np.linspace(-90., 90., self._shape[1]),
+                    'lon': np.linspace(0., 360., self._shape[2])}
+        )
+
+    def make_pp(self, memory_limit):
+        # memory_limit in GiB, as in the preprocessor_memory_limit option
+        config = core.ConfigManager()
+        config['preprocessor_memory_limit'] = memory_limit
+        pp = preprocessor.DefaultPreprocessor.__new__(preprocessor.DefaultPreprocessor)
+        pp.memory_limit = pp._memory_limit()
+        pp.nc_format = 'NETCDF4'
+        pp.data_format = 'netcdf'
+        pp.encoding_profile = preprocessor.NetcdfEncodingProfile.from_config()
+        return pp
+
+    def make_var(self):
+        t = types.SimpleNamespace(name='time')
+        return types.SimpleNamespace(
+            full_name='<tas>', is_static=False, log=mock.Mock(), T=t,
+            translation=types.SimpleNamespace(T=t), local_data=[self.in_path],
+            dest_path=os.path.join(self.temp_dir, 'out', 'out.nc')
+        )
+
+    def test_time_chunk_size(self):
+        ds = self.make_ds()
+        # 2**-14 GiB = 65536 bytes, split between 2 workers holding 4 copies
+        # of each chunk: 8192 bytes = 10 time steps of 800 bytes
+        pp = self.make_pp(2 ** -14)
+        self.assertEqual(pp.memory_limit, 65536)
+        self.assertEqual(pp.time_chunk_size(ds, 'time'), 10)
+        # limited to length of time axis
+        self.assertEqual(self.make_pp(1).time_chunk_size(ds, 'time'), 100)
+        # always at least one step
+        self.assertEqual(self.make_pp(2 ** -30).time_chunk_size(ds, 'time'), 1)
+
+    def test_read_chunks(self):
+        var = self.make_var()
+        self.assertEqual(self.make_pp(2 ** -14).read_chunks(var), {'time': 10})
+        # out-of-core mode disabled
+        self.assertIsNone(self.make_pp(0).read_chunks(var))
+        var.is_static = True
+        self.assertIsNone(self.make_pp(2 ** -14).read_chunks(var))
+
+    def test_write_dataset(self):
+        var = self.make_var()
+        pp = self.make_pp(2 ** -14)
+        ds = xr.open_dataset(self.in_path, chunks=pp.read_chunks(var))
+        self.assertEqual(ds['tas'].chunks[0], (10,) * 10)
+        with mock.patch('xarray.Dataset.to_netcdf', autospec=True,
+                        side_effect=xr.Dataset.to_netcdf) as mock_write:
+            pp.write_dataset(var, ds)
+        # write was deferred and computed by dask
+        self.assertFalse(mock_write.call_args.kwargs['compute'])
+        ds.close()
+        with xr.open_dataset(var.dest_path) as ds_out:
+            enc = ds_out['tas'].encoding
+            self.assertEqual(enc['chunksizes'], (10, 10, 20))
+            self.assertTrue(enc['zlib'])
+            np.testing.assert_array_equal(ds_out['tas'].values,
+                                          np.ones(self._shape, dtype=np.float32))
+
+
+class TestAffineTransform(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def make_ds(values):
+        return xr.Dataset({'x': (('t',), values)})
+
+    def test_then(self):
+        # then() applies self first: 3 * (2 * x + 1) - 1
+        transform = preprocessor.AffineTransform(scale=2.0, offset=1.0) \
+            .then(preprocessor.AffineTransform(scale=3.0, offset=-1.0))
+        self.assertEqual(transform.scale, 6.0)
+        self.assertEqual(transform.offset, 2.0)
+        ds = self.make_ds(np.array([0., 1., 2.]))
+        ds = preprocessor.AffineTransform(scale=2.0, offset=1.0).defer(ds, 'x')
+        ds = preprocessor.AffineTransform(scale=3.0, offset=-1.0).defer(ds, 'x')
+        np.testing.assert_array_equal(ds['x'].values, [0., 1., 2.])  # deferred
+        ds = preprocessor.AffineTransform.apply_pending(ds)
+        np.testing.assert_array_equal(ds['x'].values, [2., 8., 14.])
+        self.assertNotIn(preprocessor.AffineTransform._encoding_key,
+                         ds['x'].encoding)
+
+    def test_dtype(self):
+        transform = preprocessor.AffineTransform(scale=2.0, offset=1.0)
+        for in_dtype, out_dtype in [(np.float32, np.float32),
+                                    (np.float64, np.float64),
+                                    (np.int16, np.float32),
+                                    (np.int64, np.float64)]:
+            ds = transform.apply(self.make_ds(np.arange(3, dtype=in_dtype)), 'x')
+            self.assertEqual(ds['x'].dtype, out_dtype)
+            np.testing.assert_array_equal(ds['x'].values, [1., 3., 5.])
+
+    def test_dask_lazy(self):
+        import dask.array
+        n_computed = []
+
+        def _block(block_info=None):
+            n_computed.append(1)
+            return np.ones(block_info[None]['chunk-shape'], dtype=np.float32)
+
+        ds = xr.Dataset({'x': (('t',), dask.array.map_blocks(
+            _block, chunks=((2, 2, 2),), dtype=np.float32,
+            meta=np.array((), dtype=np.float32)
+        ))})
+        ds = preprocessor.AffineTransform(scale=2.0, offset=1.0).apply(ds, 'x')
+        self.assertEqual(n_computed, [])
+        self.assertEqual(ds['x'].chunks, ((2, 2, 2),))
+        self.assertEqual(ds['x'].dtype, np.float32)
+        np.testing.assert_array_equal(ds['x'].values, np.full(6, 3.))
+        self.assertEqual(len(n_computed), 3)
+
+    def test_packed_round_trip(self):
+        # int16 data packed with scale_factor, converted kg m-2 s-1 -> mm day-1
+        in_path = os.path.join(self.temp_dir, 'in.nc')
+        out_path = os.path.join(self.temp_dir, 'out.nc')
+        pr = np.array([1e-5, 2e-5, np.nan, 3e-5])
+        xr.Dataset({'pr': (('t',), pr)}).to_netcdf(in_path, encoding={
+            'pr': {'dtype': 'int16', 'scale_factor': 1e-7, '_FillValue': -32767}
+        })
+        with xr.open_dataset(in_path) as ds:
+            self.assertEqual(ds['pr'].encoding['dtype'], np.int16)
+            ds = preprocessor.AffineTransform(scale=86400.).defer(ds, 'pr')
+            ds = preprocessor.AffineTransform.apply_pending(ds)
+            ds.to_netcdf(out_path)
+        with xr.open_dataset(out_path) as ds:
+            np.testing.assert_allclose(ds['pr'].values,
+                                       [0.864, 1.728, np.nan, 2.592], rtol=1e-6)
+            self.assertNotIn('scale_factor', ds['pr'].encoding)
+            self.assertNotEqual(ds['pr'].encoding['dtype'], np.int16)
+
+    def test_unpacked_fill_value(self):
+        # _FillValue of unpacked floating-point data is kept
+        in_path = os.path.join(self.temp_dir, 'in.nc')
+        out_path = os.path.join(self.temp_dir, 'out.nc')
+        xr.Dataset({'x': (('t',), np.array([1., np.nan], dtype=np.float32))}) \
+            .to_netcdf(in_path, encoding={'x': {'_FillValue': 1e20}})
+        with xr.open_dataset(in_path) as ds:
+            ds = preprocessor.AffineTransform(offset=-273.15).apply(ds, 'x')
+            ds.to_netcdf(out_path)
+        with xr.open_dataset(out_path) as ds:
+            self.assertEqual(ds['x'].dtype, np.float32)
+            self.assertEqual(ds['x'].encoding['_FillValue'], np.float32(1e20))
+            np.testing.assert_allclose(ds['x'].values, [-272.15, np.nan])
+
+
+if __name__ == '__main__':
+    unittest.main()
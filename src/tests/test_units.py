@@ -13,6 +13,30 @@ class TestUnitConversionFactor(unittest.TestCase):
         self.assertAlmostEqual(units.conversion_factor('cm', 'inch'), 1.0/2.54)
         self.assertAlmostEqual(units.conversion_factor((123, 'inch'), 'cm'), 123.0 * 2.54)
 
+    def test_conversion_factor_cache(self):
+        self.assertAlmostEqual(units.conversion_factor('inch', 'cm'), 2.54)
+        self.assertAlmostEqual(
+            units.conversion_factor(units.Units('inch'), units.Units('cm')), 2.54
+        )
+        self.assertAlmostEqual(units.conversion_factor('mm', 'inch'), 1.0/25.4)
+        with self.assertRaises(TypeError):
+            _ = units.conversion_factor('inch', 'kg')
+
+    def test_conversion_affine(self):
+        scale, offset = units.conversion_affine('inch', 'cm')
+        self.assertAlmostEqual(scale, 2.54)
+        self.assertAlmostEqual(offset, 0.0)
+        scale, offset = units.conversion_affine('K', 'degC')
+        self.assertAlmostEqual(scale, 1.0)
+        self.assertAlmostEqual(offset, -273.15)
+
+    def test_interned_units(self):
+        u = units.Units.from_struct('kg m-2 s-1')
+        self.assertIs(units.Units.from_struct('kg m-2 s-1'), u)
+        self.assertIs(units.to_cfunits('kg m-2 s-1'), u)
+        self.assertIs(units.Units.from_struct(u), u)
+        self.assertTrue(u.equals(units.Units('kg m-2 s-1')))
+
 class TestRefTime(unittest.TestCase):
     def get_test_date_strings(self, unit=None, time=None):
         strs = ['2020-05-25', '2000-01-01', '0001-01-01', '0000-01-01']
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock as mock
+import urllib.parse
+from src import verify_links
+
+
+class TestLinkVerifier(unittest.TestCase):
+    # mock output of a POD: html files, keyed by path relative to POD_WK_DIR
+    _pages = {
+        'POD.html': ('<a href="model/fig.png">fig</a>\n'
+            '<a href="model/missing.png">missing</a>\n'
+            '<a href="model/">dir</a>\n'
+            '<a href="page.html#section1">section 1</a>\n'
+            '<a href="page.html#section2">section 2</a>\n'
+            '<a href="https://www.example.com/">external</a>\n'),
+        'page.html': ('<a href="POD.html">back</a>\n'
+            '<a href="obs/missing_obs.png">missing obs</a>\n')
+    }
+
+    def setUp(self):
+        self.wk_dir = tempfile.mkdtemp()
+        self.pod_dir = os.path.join(self.wk_dir, 'POD')
+        os.makedirs(os.path.join(self.pod_dir, 'model'))
+        for f, contents in self._pages.items():
+            with open(os.path.join(self.pod_dir, f), 'w') as file_:
+                file_.write(contents)
+        open(os.path.join(self.pod_dir, 'model', 'fig.png'), 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.wk_dir)
+
+    def make_verifier(self, cache=None):
+        return verify_links.LinkVerifier(
+            os.path.join(self.pod_dir, 'POD.html'), self.wk_dir,
+            log=mock.Mock(), cache=cache
+        )
+
+    def url(self, path):
+        return urllib.parse.urljoin('file:', os.path.join(self.pod_dir, path))
+
+    def test_verify_pod_links(self):
+        verifier = self.make_verifier()
+        missing = verifier.verify_pod_links('POD')
+        # link to a directory isn't a file, as with urllib
+        self.assertCountEqual(missing, [
+            'POD/model/missing.png', 'POD/model/', 'POD/obs/missing_obs.png'
+        ])
+
+    def test_local_file(self):
+        # fast path for local files gives same results as going through urllib
+        verifier = self.make_verifier()
+        for path in ('POD.html', 'page.html', os.path.join('model', 'fig.png'),
+                     os.path.join('model', 'missing.png'), 'model/'):
+            url = self.url(path)
+            self.assertEqual(
+                verifier.check_local_file(url), verifier.check_remote_url(url)
+            )
+        self.assertIsNone(verifier.check_local_file(self.url('model/')))
+
+    def test_fragment(self):
+        # page reached through links with fragments is only examined once
+        verifier = self.make_verifier()
+        with mock.patch.object(verifier, 'check_local_file',
+                               wraps=verifier.check_local_file) as mock_check:
+            missing = verifier.verify_pod_links('POD')
+        self.assertIn('POD/obs/missing_obs.png', missing)
+        checked = [c.args[0] for c in mock_check.call_args_list]
+        self.assertEqual(checked.count(self.url('page.html')), 1)
+        self.assertNotIn(self.url('page.html#section1'), checked)
+
+    def test_cache_reuse(self):
+        cache = dict()
+        verifier1 = self.make_verifier(cache=cache)
+        missing1 = verifier1.verify_pod_links('POD')
+        self.assertIn(self.url('POD.html'), cache)
+        self.assertIn(self.url('page.html'), cache)
+        # missing files aren't cached, so they're reported again
+        self.assertNotIn(self.url('model/missing.png'), cache)
+
+        verifier2 = self.make_verifier(cache=cache)
+        with mock.patch.object(verifier2, 'check_local_file',
+                               wraps=verifier2.check_local_file) as mock_check:
+            missing2 = verifier2.verify_pod_links('POD')
+        self.assertCountEqual(missing1, missing2)
+        checked = [c.args[0] for c in mock_check.call_args_list]
+        self.assertCountEqual(checked, [
+            self.url(os.path.join('model', 'missing.png')), self.url('model/'),
+            self.url(os.path.join('obs', 'missing_obs.png'))
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
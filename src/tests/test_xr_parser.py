@@ -0,0 +1,72 @@
+import concurrent.futures
+import threading
+import types
+import unittest
+import unittest.mock as mock
+import numpy as np
+import xarray as xr
+from src import xr_parser
+from src.tests.shared_test_utils import setUp_config_singletons, tearDown_config_singletons
+
+
+class TestDefaultDatasetParser(unittest.TestCase):
+    def setUp(self):
+        setUp_config_singletons()
+        self.pod = types.SimpleNamespace(log=mock.Mock())
+        self.parser = xr_parser.DefaultDatasetParser(None, self.pod)
+        # only test metadata normalization, not reconciliation with var
+        self.parser.disable = True
+
+    def tearDown(self):
+        tearDown_config_singletons()
+
+    @staticmethod
+    def make_var():
+        return types.SimpleNamespace(
+            name='tas', log=mock.Mock(),
+            translation=types.SimpleNamespace(name='tas')
+        )
+
+    @staticmethod
+    def make_ds(title, time_units, calendar):
+        # undecoded Dataset, as passed to parse()
+        return xr.Dataset(
+            {'tas': (('time',), np.zeros(3), {'units': 'K'})},
+            coords={'time': ('time', np.arange(3.),
+                             {'units': time_units, 'calendar': calendar})},
+            attrs={'title': title}
+        )
+
+    def test_parse_concurrent(self):
+        # parse two Datasets in different threads, with both calls between
+        # normalize_pre_decode() and restore_attrs_backup() at the same time
+        barrier = threading.Barrier(2, timeout=10)
+        decode_cf = xr.decode_cf
+
+        def _decode_cf(*args, **kwargs):
+            barrier.wait()
+            return decode_cf(*args, **kwargs)
+
+        ds_args = [
+            ('run 1', 'days since 2000-01-01', 'noleap'),
+            ('run 2', 'days since 1850-01-01', 'julian')
+        ]
+        with mock.patch('src.xr_parser.xr.decode_cf', side_effect=_decode_cf):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(self.parser.parse, self.make_var(),
+                                    self.make_ds(*args))
+                    for args in ds_args
+                ]
+                results = [f.result() for f in futures]
+        for (title, time_units, calendar), ds in zip(ds_args, results):
+            self.assertEqual(ds.attrs['title'], title)
+            self.assertEqual(ds['time'].attrs['units'], time_units)
+            self.assertEqual(ds['time'].attrs['calendar'], calendar)
+        # state of each call isn't left on the shared parser
+        self.assertEqual(self.parser.attrs_backup, dict())
+        self.assertIs(self.parser.log, self.pod.log)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,37 @@
 """Functions wrapping unit conversion methods from the third-party
 `cfunits <https://ncas-cms.github.io/cfunits/index.html>`__ library.
 """
+import functools
+import threading
 import cfunits
 from src import util
 
 import logging
 _log = logging.getLogger(__name__)
 
+# udunits' parser isn't reentrant, and ctypes releases the GIL during calls to
+# it, so serialize all calls that parse units or construct converters.
+_units_lock = threading.RLock()
+
 class Units(cfunits.Units):
     """Wrap `Units <https://ncas-cms.github.io/cfunits/cfunits.Units.html>`__
     class of `cfunits <https://ncas-cms.github.io/cfunits/>`__ to isolate this
     third-party dependency to the code in this module.
     """
+    @classmethod
+    def from_struct(cls, units):
+        """Return a Units object for *units*. Objects constructed from strings
+        are interned: repeated calls with the same string return the same
+        (immutable) object, so udunits only parses each string once. Also used
+        for type coercion of :func:`~src.util.mdtf_dataclass` fields.
+        """
+        if isinstance(units, cls):
+            return units
+        if isinstance(units, str):
+            return _interned_units(cls, units)
+        with _units_lock:
+            return cls(units)
+
     def reftime_base_eq(self, other):
         """Comparison function that recognizes reference time units (e.g.,
         'days since 1970-01-01') as being equal to unqualified time units
@@ -22,10 +42,20 @@ class Units(cfunits.Units):
         cls = type(self)
         if self.isreftime and other.isreftime:
             return self.equals(other)
-        self_2 = (cls(self._units_since_reftime) if self.isreftime else self)
-        other_2 = (cls(other._units_since_reftime) if other.isreftime else other)
+        self_2 = (cls.from_struct(self._units_since_reftime) \
+            if self.isreftime else self)
+        other_2 = (cls.from_struct(other._units_since_reftime) \
+            if other.isreftime else other)
         return self_2.equals(other_2)
 
+@functools.lru_cache(maxsize=1024)
+def _interned_units(cls, units_str):
+    """Cached constructor used by :meth:`Units.from_struct`. The lru_cache itself
+    is thread-safe, but may call this concurrently for the same arguments.
+    """
+    with _units_lock:
+        return cls(units_str)
+
 def to_cfunits(*args):
     """Coerce string-valued units and (quantity, unit) tuples to :class:`Units`
     objects.
@@ -37,9 +67,9 @@ def to_cfunits(*args):
         if isinstance(u, tuple):
             # (quantity, unit) tuple
             assert len(u) == 2
-            u = u[0] * Units(u[1])
+            u = u[0] * Units.from_struct(u[1])
         if not isinstance(u, Units):
-            u = Units(u)
+            u = Units.from_struct(u)
         return u
 
     if len(args) == 1:
@@ -66,9 +96,9 @@ def relative_tol(x, y):
 
     *x* and *y* are coerced to :class:`Units` objects via :func:`to_cfunits`.
     """
-    x, y = to_equivalent_units(x,y)
-    tol_1 = Units.conform(1.0, x, y) # = float(x/y)
-    tol_2 = Units.conform(1.0, y, x) # = float(y/x)
+    x, y = to_cfunits(x,y)
+    tol_1 = _conversion_factor(x, y) # = float(x/y)
+    tol_2 = _conversion_factor(y, x) # = float(y/x)
     return max(abs(tol_1 - 1.0), abs(tol_2 - 1.0))
 
 def units_equivalent(*args):
@@ -123,10 +153,40 @@ def conversion_factor(source_unit, dest_unit):
     (quantity in *dest_units*).
 
     *source_unit*, *dest_unit* are coerced to :class:`Units` objects via
-    :func:`to_cfunits`.
+    :func:`to_cfunits`. Factors are cached for each pair of units.
+    """
+    return _conversion_factor(*to_cfunits(source_unit, dest_unit))
+
+def conversion_affine(source_unit, dest_unit):
+    """Return a tuple (*scale*, *offset*) of floats which implements a given
+    unit conversion, defined so that *scale* * (quantity in *source_units*) +
+    *offset* = (quantity in *dest_units*). *offset* is nonzero only for units
+    with different origins, such as temperatures in K and degC.
+
+    *source_unit*, *dest_unit* are coerced to :class:`Units` objects via
+    :func:`to_cfunits`. Results are cached for each pair of units.
+    """
+    return _conversion_affine(*to_cfunits(source_unit, dest_unit))
+
+@functools.lru_cache(maxsize=1024)
+def _conversion_affine(source_unit, dest_unit):
+    """Cached implementation of :func:`conversion_affine`.
     """
     source_unit, dest_unit = to_equivalent_units(source_unit, dest_unit)
-    return Units.conform(1.0, source_unit, dest_unit)
+    with _units_lock:
+        offset = Units.conform(0.0, source_unit, dest_unit)
+        scale = Units.conform(1.0, source_unit, dest_unit) - offset
+    return (scale, offset)
+
+@functools.lru_cache(maxsize=1024)
+def _conversion_factor(source_unit, dest_unit):
+    """Cached implementation of :func:`conversion_factor`, taking :class:`Units`
+    objects (which hash on their parsed udunits representation) as arguments.
+    Raises TypeError, which isn't cached, if units are inequivalent.
+    """
+    source_unit, dest_unit = to_equivalent_units(source_unit, dest_unit)
+    with _units_lock:
+        return Units.conform(1.0, source_unit, dest_unit)
 
 # --------------------------------------------------------------------
 
@@ -151,20 +211,11 @@ def convert_scalar_coord(coord, dest_units, log=_log):
         dest_value = coord.value
     return dest_value
 
-def convert_dataarray(ds, da_name, src_unit=None, dest_unit=None, log=_log):
-    """Wrapper for cfunits `conform()
-    <https://ncas-cms.github.io/cfunits/generated/cfunits.Units.conform.html#cfunits.Units.conform>`__
-    that does unit conversion in-place on a member of an xarray Dataset,
-    updating its units attribute.
-
-    Args:
-        ds (Dataset): xarray Dataset containing the DataArray to convert.
-        da_name (str): Name of the DataArray to do the unit conversion on.
-        src_unit: Current units of *da_name*. Coerced to a :class:`Units` object
-            via :func:`to_cfunits`. Optional; if not given this is populated from
-            the ``units`` attribute of *da_name*, if it exists.
-        dest_unit: Desired units for *da_name*. Coerced to a :class:`Units` object
-            via :func:`to_cfunits`.
+def dataarray_conversion(ds, da_name, src_unit=None, dest_unit=None, log=_log):
+    """Set up a unit conversion on a member of an xarray Dataset without
+    modifying its values: update its units attribute, and return the
+    transformation the caller needs to apply to the values. Arguments are the
+    same as for :func:`convert_dataarray`.
 
     Raises:
         ValueError: if *da_name* not in *ds*.
@@ -172,7 +223,8 @@ def convert_dataarray(ds, da_name, src_unit=None, dest_unit=None, log=_log):
             *da_name* lacks units metadata.
 
     Returns:
-        Dataset *ds*, with *da_name* modified in-place.
+        Tuple (*scale*, *offset*) as returned by :func:`conversion_affine`, or
+        None if the units are identical and no conversion is needed.
     """
     da = ds.get(da_name, None)
     if da is None:
@@ -194,15 +246,49 @@ def convert_dataarray(ds, da_name, src_unit=None, dest_unit=None, log=_log):
     if units_equal(src_unit, dest_unit):
         log.debug(("Source, dest units of '%s'%s identical (%s); no conversion "
             "done."), da.name, std_name, dest_unit)
-        return ds
+        return None
 
     log.debug("Convert units of '%s'%s from '%s' to '%s'.",
         da.name, std_name, src_unit, dest_unit,
         tags=util.ObjectLogTag.NC_HISTORY
     )
-    da_attrs = da.attrs.copy()
-    fac = conversion_factor(src_unit, dest_unit)
-    ds = ds.assign({da_name: fac * ds[da_name]})
+    transform = conversion_affine(src_unit, dest_unit)
+    da.attrs['units'] = str(dest_unit)
+    return transform
+
+def convert_dataarray(ds, da_name, src_unit=None, dest_unit=None, log=_log):
+    """Wrapper for cfunits `conform()
+    <https://ncas-cms.github.io/cfunits/generated/cfunits.Units.conform.html#cfunits.Units.conform>`__
+    that does unit conversion in-place on a member of an xarray Dataset,
+    updating its units attribute.
+
+    Args:
+        ds (Dataset): xarray Dataset containing the DataArray to convert.
+        da_name (str): Name of the DataArray to do the unit conversion on.
+        src_unit: Current units of *da_name*. Coerced to a :class:`Units` object
+            via :func:`to_cfunits`. Optional; if not given this is populated from
+            the ``units`` attribute of *da_name*, if it exists.
+        dest_unit: Desired units for *da_name*. Coerced to a :class:`Units` object
+            via :func:`to_cfunits`.
+
+    Raises:
+        ValueError: if *da_name* not in *ds*.
+        TypeError: if *src_unit* or *dest_unit* not correctly defined, or if
+            *da_name* lacks units metadata.
+
+    Returns:
+        Dataset *ds*, with *da_name* modified in-place.
+    """
+    transform = dataarray_conversion(
+        ds, da_name, src_unit=src_unit, dest_unit=dest_unit, log=log
+    )
+    if transform is None:
+        return ds
+    scale, offset = transform
+    da_attrs = ds[da_name].attrs.copy()
+    if offset:
+        ds = ds.assign({da_name: scale * ds[da_name] + offset})
+    else:
+        ds = ds.assign({da_name: scale * ds[da_name]})
     ds[da_name].attrs = da_attrs
-    ds[da_name].attrs['units'] = str(dest_unit)
     return ds
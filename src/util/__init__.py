@@ -10,7 +10,7 @@ from .basic import (
 from .dataclass import (
     RegexPatternBase, RegexPattern, RegexPatternWithTemplate, ChainedRegexPattern,
     NOTSET, MANDATORY, mdtf_dataclass, regex_dataclass, dataclass_factory,
-    filter_dataclass, coerce_to_dataclass
+    filter_dataclass, coerce_to_dataclass, set_dataclass_type_checks
 )
 from .datelabel import (
     DatePrecision, DateRange, Date, DateFrequency,
@@ -19,8 +19,9 @@ from .datelabel import (
 )
 from .exceptions import *
 from .filesystem import (
-    abbreviate_path, resolve_path, recursive_copy,
-    check_executable, find_files, check_dir, bump_version, strip_comments,
+    abbreviate_path, resolve_path, recursive_copy, copy_path,
+    check_executable, find_files, scan_dir, walk_parallel, check_dir,
+    bump_version, strip_comments,
     parse_json, read_json, find_json, write_json, pretty_print_json,
     append_html_template
     # is_subpath,
@@ -6,6 +6,7 @@ import collections.abc
 import enum
 import itertools
 import string
+import threading
 import unittest.mock
 import uuid
 from . import exceptions
@@ -73,12 +74,20 @@ class _Singleton(type):
     """Private metaclass that creates a :class:`~util.Singleton` base class when
     called. This version is taken from `<https://stackoverflow.com/a/6798042>`__
     and is compatible with Python 2 and 3.
+
+    Instances are created while holding a lock, so that threads calling the
+    class concurrently for the first time all get the same instance. The lock
+    is reentrant since Singletons' ``__init__`` methods call other Singletons.
     """
     _instances = {}
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(_Singleton, cls).__call__(*args, **kwargs)
+            with _Singleton._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = \
+                        super(_Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
 
 
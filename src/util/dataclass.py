@@ -14,10 +14,31 @@ import logging
 _log = logging.getLogger(__name__)
 
 class RegexPatternBase():
-    """Dummy parent class for :class:`RegexPattern` and
-    :class:`ChainedRegexPattern`.
+    """Parent class for :class:`RegexPattern` and :class:`ChainedRegexPattern`,
+    implementing methods common to both.
     """
-    pass
+    def iter_match(self, strs, *args, on_error=None):
+        """Generator that runs :meth:`match` on each string in the iterable
+        *strs* and yields a tuple of the string and the dict of field values
+        parsed from it.
+
+        Args:
+            strs (iterable of str): Input strings to parse.
+            args: Optional. Flags to pass to :meth:`match`.
+            on_error (callable): Optional. If given, strings which fail to
+                parse are skipped, and *on_error* is called with the string and
+                the exception raised by :meth:`match`. If not given (default),
+                the exception is re-raised.
+        """
+        for str_ in strs:
+            try:
+                self.match(str_, *args)
+            except Exception as exc:
+                if on_error is None:
+                    raise
+                on_error(str_, exc)
+                continue
+            yield (str_, self.data)
 
 class RegexPattern(collections.UserDict, RegexPatternBase):
     """Wraps :py:class:`re.Pattern` with more convenience methods for the use case
@@ -398,20 +419,13 @@ default fields in the dataclass auto-generated ``__init__`` method under
 we use the second solution described in `<https://stackoverflow.com/a/53085935>`__.
 """
 
-def _mdtf_dataclass_get_field_types(obj, f):
+def _mdtf_dataclass_resolve_field_types(cls, f):
     """Common functionality for :func:`_mdtf_dataclass_type_coercion` and
     :func:`_mdtf_dataclass_type_check`. Given a :py:class:`datacalsses.Field`
-    object *f*, return either a tuple of the type its value should be coerced to
-    and a tuple of the valid types its value can have, or (None, None) to signal
-    a case we don't handle.
+    object *f* of dataclass *cls*, return either a tuple of the type its value
+    should be coerced to and a list of the valid types its value can have, or
+    (None, None) to signal a case we don't handle.
     """
-    if not f.init:
-        # ignore fields that aren't handled at init
-        return (None, None)
-    value = getattr(obj, f.name)
-    # ignore unset field values, regardless of type
-    if value is None or value is NOTSET:
-        return (None, None)
     # guess what types are valid
     new_type = None
     if f.type is typing.Any or isinstance(f.type, typing.TypeVar):
@@ -419,10 +433,10 @@ def _mdtf_dataclass_get_field_types(obj, f):
     if dataclasses.is_dataclass(f.type):
         # ignore if type is a dataclass: use this type annotation to
         # implement dataclass inheritance
-        if not isinstance(obj, f.type):
+        if not issubclass(cls, f.type):
             raise exceptions.DataclassParseError((f"Field {f.name} specified "
                 f"as dataclass {f.type.__name__}, which isn't a parent class "
-                f"of {obj.__class__.__name__}."))
+                f"of {cls.__name__}."))
         return (None, None)
     elif isinstance(f.type, typing._GenericAlias) \
         or isinstance(f.type, typing._SpecialForm):
@@ -446,6 +460,72 @@ def _mdtf_dataclass_get_field_types(obj, f):
         valid_types.append(type(f.default_factory()))
     return (new_type, valid_types)
 
+def _mdtf_dataclass_get_converter(new_type):
+    """Return the callable used by :func:`_mdtf_dataclass_type_coercion` to
+    coerce values to *new_type*, or None if we can't do coercion to that type.
+    """
+    if new_type is None or hasattr(new_type, '__abstract_methods__'):
+        return None
+    if hasattr(new_type, 'from_struct'):
+        return new_type.from_struct
+    elif isinstance(new_type, enum.Enum):
+        # need to use item syntax to create enum from name
+        return new_type.__getitem__
+    else:
+        return new_type
+
+_FieldTypePlan = collections.namedtuple('_FieldTypePlan',
+    ['name', 'type', 'new_type', 'converter', 'valid_types', 'error'])
+_FieldTypePlan.__doc__ = """Information used to coerce and check the value of
+one field of an :func:`mdtf_dataclass`, computed by
+:func:`_mdtf_dataclass_type_plan`. *error* is an exception to raise if the field
+is assigned a value, for field types we couldn't resolve.
+"""
+
+_type_checks_enabled = True
+
+def set_dataclass_type_checks(enabled=True):
+    """Enable or disable checking of field types of :func:`mdtf_dataclass` objects
+    after instantiation (the final step in the description of that decorator).
+    Type coercion and the check for values of ``MANDATORY`` fields are always
+    done. Disabling type checks saves time when large numbers of objects are
+    created, and is intended for production runs of a tested configuration.
+    """
+    global _type_checks_enabled
+    _type_checks_enabled = bool(enabled)
+
+def _mdtf_dataclass_type_plan(cls):
+    """Compute a tuple of :class:`_FieldTypePlan` entries for the fields of dataclass
+    *cls*. This is done once per class (when it's decorated, or on first use for
+    child classes that aren't), so that instantiation doesn't have to repeat the
+    type introspection in :func:`_mdtf_dataclass_resolve_field_types`.
+    """
+    plan = []
+    for f in dataclasses.fields(cls):
+        new_type, valid_types, error = None, None, None
+        if f.init:
+            # ignore fields that aren't handled at init
+            try:
+                new_type, valid_types = _mdtf_dataclass_resolve_field_types(cls, f)
+            except Exception as exc:
+                # only raise if field is assigned a value, as before
+                error = exc
+        if valid_types is not None:
+            valid_types = tuple(valid_types)
+        plan.append(_FieldTypePlan(f.name, f.type, new_type,
+            _mdtf_dataclass_get_converter(new_type), valid_types, error))
+    return tuple(plan)
+
+def _mdtf_dataclass_get_type_plan(cls):
+    """Return the plan computed by :func:`_mdtf_dataclass_type_plan` for *cls*,
+    computing and caching it on the class if necessary.
+    """
+    plan = cls.__dict__.get('_mdtf_dataclass_type_plan', None)
+    if plan is None:
+        plan = _mdtf_dataclass_type_plan(cls)
+        type.__setattr__(cls, '_mdtf_dataclass_type_plan', plan)
+    return plan
+
 def _mdtf_dataclass_type_coercion(self, log):
     """Do type checking on all dataclass fields after the auto-generated
     ``__init__`` method, but before any ``__post_init__`` method.
@@ -455,27 +535,24 @@ def _mdtf_dataclass_type_coercion(self, log):
        3.7. It may or may not work on newer pythons, and definitely will not
        work with 3.5 or 3.6. See `<https://stackoverflow.com/a/52664522>`__.
     """
-    for f in dataclasses.fields(self):
-        value = getattr(self, f.name, NOTSET)
-        new_type, valid_types = _mdtf_dataclass_get_field_types(self, f)
+    for name, _, new_type, converter, valid_types, error in \
+        _mdtf_dataclass_get_type_plan(self.__class__):
+        if valid_types is None and error is None:
+            continue
+        value = getattr(self, name, NOTSET)
+        # ignore unset field values, regardless of type
+        if value is None or value is NOTSET:
+            continue
+        if error is not None:
+            raise copy.copy(error)
+        if converter is None or isinstance(value, valid_types):
+            continue # can't do type coercion, or already a valid type
         try:
-            if valid_types is None or isinstance(value, tuple(valid_types)):
-                continue # don't coerce if we're already a valid type
-            if new_type is None or hasattr(new_type, '__abstract_methods__'):
-                continue # can't do type coercion
-            else:
-                if hasattr(new_type, 'from_struct'):
-                    new_value = new_type.from_struct(value)
-                elif isinstance(new_type, enum.Enum):
-                    # need to use item syntax to create enum from name
-                    new_value = new_type.__getitem__(value)
-                else:
-                    new_value = new_type(value)
-                # https://stackoverflow.com/a/54119384 for implementation
-                object.__setattr__(self, f.name, new_value)
+            # https://stackoverflow.com/a/54119384 for implementation
+            object.__setattr__(self, name, converter(value))
         except (TypeError, ValueError, dataclasses.FrozenInstanceError) as exc:
             raise exceptions.DataclassParseError((f"{self.__class__.__name__}: "
-                f"Couldn't coerce value {repr(value)} for field {f.name} from "
+                f"Couldn't coerce value {repr(value)} for field {name} from "
                 f"type {type(value)} to type {new_type}.")) from exc
         except Exception as exc:
             log.exception("%s: Caught exception: %r", self.__class__.__name__, exc)
@@ -483,27 +560,31 @@ def _mdtf_dataclass_type_coercion(self, log):
 
 def _mdtf_dataclass_type_check(self, log):
     """Do type checking on all dataclass fields after ``__init__`` and
-    ``__post_init__`` methods.
+    ``__post_init__`` methods. Only the check for ``MANDATORY`` values is done
+    if type checks have been disabled with :func:`set_dataclass_type_checks`.
 
     .. warning::
        Type checking logic used is specific to the ``typing`` module in python
        3.7. It may or may not work on newer pythons, and definitely will not
        work with 3.5 or 3.6. See `<https://stackoverflow.com/a/52664522>`__.
     """
-    for f in dataclasses.fields(self):
-        value = getattr(self, f.name, NOTSET)
+    check_types = _type_checks_enabled
+    for name, type_, _, _, valid_types, error in \
+        _mdtf_dataclass_get_type_plan(self.__class__):
+        value = getattr(self, name, NOTSET)
         if value is None or value is NOTSET:
             continue
         if value is MANDATORY:
             raise exceptions.DataclassParseError((f"{self.__class__.__name__}: "
-                f"No value supplied for mandatory field {f.name}."))
-
-        _, valid_types = _mdtf_dataclass_get_field_types(self, f)
-        if valid_types is not None and not isinstance(value, tuple(valid_types)):
+                f"No value supplied for mandatory field {name}."))
+        if error is not None:
+            raise copy.copy(error)
+        if check_types and valid_types is not None \
+            and not isinstance(value, valid_types):
             log.exception("%s: Failed type check for field '%s': %s != %s.",
-                self.__class__.__name__, f.name, type(value), valid_types)
+                self.__class__.__name__, name, type(value), valid_types)
             raise exceptions.DataclassParseError((f"{self.__class__.__name__}: "
-                f"Expected {f.name} to be {f.type}, got {type(value)} "
+                f"Expected {name} to be {type_}, got {type(value)} "
                 f"({repr(value)})."))
 
 DEFAULT_MDTF_DATACLASS_KWARGS = {'init': True, 'repr': True, 'eq': True,
@@ -539,6 +620,10 @@ def mdtf_dataclass(cls=None, **deco_kwargs):
        type information. If not, attempt to coerce it to that type, using a
        ``from_struct`` method on that type if it exists.
 
+    The type information for each field is resolved once, when the class is
+    decorated. The check in step 4 (but not the coercion) can be turned off with
+    :func:`set_dataclass_type_checks`.
+
     .. warning::
        Unlike :py:func:`~dataclasses.dataclass`, all fields **must** have a
        *default* or *default_factory* defined. Fields which are mandatory must
@@ -571,6 +656,7 @@ def mdtf_dataclass(cls=None, **deco_kwargs):
 
     # apply dataclasses' decorator
     cls = dataclasses.dataclass(cls, **dc_kwargs)
+    type.__setattr__(cls, '_mdtf_dataclass_type_plan', _mdtf_dataclass_type_plan(cls))
 
     # Do type coercion after dataclass' __init__, but before user __post_init__
     # Do type check after __init__ and __post_init__
@@ -596,6 +682,37 @@ def is_regex_dataclass(obj):
     return hasattr(obj, '_is_regex_dataclass') and obj._is_regex_dataclass == True
 
 
+_RegexDataclassInitPlan = collections.namedtuple('_RegexDataclassInitPlan',
+    ['fields', 'names', 'composed', 'post_init'])
+_RegexDataclassInitPlan.__doc__ = """Information used by
+:func:`_regex_dataclass_preprocess_kwargs`, computed once per class by
+:func:`_regex_dataclass_get_init_plan`: the names of the class's fields, the
+names of fields and init-only fields accepted by the class (in the order used by :func:`filter_dataclass`),
+the fields whose types are parent regex_dataclasses, and the names of fields
+which aren't arguments to the auto-generated ``__init__``.
+"""
+
+def _regex_dataclass_get_init_plan(cls):
+    """Return the :class:`_RegexDataclassInitPlan` for :func:`regex_dataclass`
+    *cls*, computing and caching it on the class if necessary.
+    """
+    plan = cls.__dict__.get('_regex_dataclass_init_plan', None)
+    if plan is None:
+        fields = dataclasses.fields(cls)
+        field_names = tuple(f.name for f in fields)
+        names = list(field_names)
+        names.extend(f.name for f in cls.__dataclass_fields__.values() \
+            if f.type == dataclasses.InitVar)
+        regex_bases = [c for c in cls.__bases__ if is_regex_dataclass(c)]
+        plan = _RegexDataclassInitPlan(
+            fields=field_names,
+            names=tuple(names),
+            composed=tuple(f for c in regex_bases for f in fields if f.type == c),
+            post_init=tuple(f.name for f in fields if not f.init)
+        )
+        type.__setattr__(cls, '_regex_dataclass_init_plan', plan)
+    return plan
+
 def _regex_dataclass_preprocess_kwargs(self, kwargs):
     """Edit kwargs going to the auto-generated __init__ method of this dataclass.
     If any fields are regex_dataclasses, construct and parse their values first.
@@ -604,36 +721,100 @@ def _regex_dataclass_preprocess_kwargs(self, kwargs):
     inheritance) try to assign different values to a field of the same name. We
     do this by assigning to a :class:`~src.util.basic.ConsistentDict`.
     """
-    new_kw = filter_dataclass(kwargs, self, init='all')
-    new_kw = basic.ConsistentDict.from_struct(new_kw)
-    for cls_ in self.__class__.__bases__:
-        if not is_regex_dataclass(cls_):
-            continue
-        for f in dataclasses.fields(self):
-            if not f.type == cls_:
-                continue
-            if f.name in kwargs:
-                val = kwargs[f.name]
-            elif not isinstance(f.default, dataclasses._MISSING_TYPE):
-                val = f.default
-            elif not isinstance(f.default_factory, dataclasses._MISSING_TYPE):
-                val = f.default_factory()
-            else:
-                raise exceptions.DataclassParseError(f"Can't set value for {f.name}.")
-            new_d = dataclasses.asdict(f.type.from_string(val))
-            new_d = filter_dataclass(new_d, self, init='all')
-            try:
-                new_kw.update(new_d)
-            except exceptions.WormKeyError as exc:
-                raise exceptions.DataclassParseError((f"{self.__class__.__name__}: "
-                    f"Tried to make inconsistent field assignment when parsing "
-                    f"{f.name} as an instance of {f.type.__name__}.")) from exc
+    plan = _regex_dataclass_get_init_plan(self.__class__)
+    new_kw = basic.ConsistentDict.from_struct(
+        {k: kwargs[k] for k in plan.names if k in kwargs}
+    )
+    for f in plan.composed:
+        if f.name in kwargs:
+            val = kwargs[f.name]
+        elif not isinstance(f.default, dataclasses._MISSING_TYPE):
+            val = f.default
+        elif not isinstance(f.default_factory, dataclasses._MISSING_TYPE):
+            val = f.default_factory()
+        else:
+            raise exceptions.DataclassParseError(f"Can't set value for {f.name}.")
+        # object is discarded, so no need to copy field values as asdict() does
+        parsed = f.type.from_string(val)
+        new_d = dict()
+        for k in _regex_dataclass_get_init_plan(f.type).fields:
+            if k in plan.names:
+                v = getattr(parsed, k)
+                if dataclasses.is_dataclass(v) and not isinstance(v, type):
+                    v = dataclasses.asdict(v)
+                new_d[k] = v
+        try:
+            new_kw.update(new_d)
+        except exceptions.WormKeyError as exc:
+            raise exceptions.DataclassParseError((f"{self.__class__.__name__}: "
+                f"Tried to make inconsistent field assignment when parsing "
+                f"{f.name} as an instance of {f.type.__name__}.")) from exc
     post_init = dict()
-    for f in dataclasses.fields(self):
-        if not f.init and f.name in new_kw:
-            post_init[f.name] = new_kw.pop(f.name)
+    for k in plan.post_init:
+        if k in new_kw:
+            post_init[k] = new_kw.pop(k)
     return (new_kw, post_init)
 
+def _regex_dataclass_batch_plan(cls):
+    """Precompute the information used by the ``from_strings`` classmethod of
+    :func:`regex_dataclass` *cls* to assign and coerce field values directly from
+    the values parsed by its pattern, without instantiating *cls*.
+
+    Returns:
+        Tuple of tuples of (default value, default factory,
+        :class:`_FieldTypePlan`) for each field of *cls*, or None if this isn't
+        possible because *cls* has init-only fields or uses composition.
+    """
+    if any(f._field_type is dataclasses._FIELD_INITVAR \
+        for f in cls.__dataclass_fields__.values()):
+        return None
+    plan = []
+    type_plan = _mdtf_dataclass_get_type_plan(cls)
+    for f, f_plan in zip(dataclasses.fields(cls), type_plan):
+        if not f.init or dataclasses.is_dataclass(f.type) \
+            or f_plan.error is not None:
+            return None
+        if not isinstance(f.default_factory, dataclasses._MISSING_TYPE):
+            default, default_factory = None, f.default_factory
+        elif not isinstance(f.default, dataclasses._MISSING_TYPE):
+            default, default_factory = f.default, None
+        else:
+            default, default_factory = MANDATORY, None
+        plan.append((default, default_factory, f_plan))
+    return tuple(plan)
+
+def _regex_dataclass_batch_values(cls, plan, data):
+    """Return a list of the values of the fields of *cls*, given the dict *data*
+    of values parsed by its pattern. Performs the same coercion and checks as
+    :func:`_mdtf_dataclass_type_coercion` and :func:`_mdtf_dataclass_type_check`,
+    using the *plan* returned by :func:`_regex_dataclass_batch_plan`.
+    """
+    check_types = _type_checks_enabled
+    values = []
+    for default, default_factory, (name, type_, new_type, converter, valid_types, _) \
+        in plan:
+        value = data.get(name, NOTSET)
+        if value is NOTSET:
+            value = default if default_factory is None else default_factory()
+        if value is MANDATORY:
+            raise exceptions.DataclassParseError((f"{cls.__name__}: "
+                f"No value supplied for mandatory field {name}."))
+        if not (value is None or value is NOTSET or valid_types is None \
+            or isinstance(value, valid_types)):
+            if converter is not None:
+                try:
+                    value = converter(value)
+                except (TypeError, ValueError) as exc:
+                    raise exceptions.DataclassParseError((f"{cls.__name__}: "
+                        f"Couldn't coerce value {repr(value)} for field {name} "
+                        f"from type {type(value)} to type {new_type}.")) from exc
+            if check_types and not isinstance(value, valid_types):
+                raise exceptions.DataclassParseError((f"{cls.__name__}: "
+                    f"Expected {name} to be {type_}, got {type(value)} "
+                    f"({repr(value)})."))
+        values.append(value)
+    return values
+
 def regex_dataclass(pattern, **deco_kwargs):
     """Decorator combining the functionality of :class:`RegexPattern` and
     :func:`mdtf_dataclass`: dataclass fields are parsed from a regex and coerced
@@ -652,6 +833,12 @@ def regex_dataclass(pattern, **deco_kwargs):
     fields will be supplied to this regex_dataclass constructor. This is our
     implementation of composition for regex_dataclasses.
 
+    A ``from_strings`` classmethod is also added, which parses an iterable of
+    strings in one call and can return the results in columnar form. If the
+    class doesn't use composition or define ``__init__`` or ``__post_init__``,
+    the columns are assigned and coerced directly from the values returned by
+    the pattern, without creating dataclass instances.
+
     .. note::
        Unlike :func:`mdtf_dataclass`, type coercion here is done *after*
        ``__post_init__`` for these dataclasses. This is necessary due to
@@ -663,6 +850,9 @@ def regex_dataclass(pattern, **deco_kwargs):
     dc_kwargs.update(deco_kwargs)
 
     def _dataclass_decorator(cls):
+        # only take batch shortcut if we know what the constructor does
+        custom_init = ('__init__' in cls.__dict__) \
+            or ('__post_init__' in cls.__dict__) or not dc_kwargs['init']
         if '__post_init__' not in cls.__dict__:
             # Prevent class from inheriting __post_init__ from parents if it
             # doesn't overload it (which is why we use __dict__ and not
@@ -673,6 +863,7 @@ def regex_dataclass(pattern, **deco_kwargs):
 
         # apply dataclasses' decorator
         cls = dataclasses.dataclass(cls, **dc_kwargs)
+        type.__setattr__(cls, '_mdtf_dataclass_type_plan', _mdtf_dataclass_type_plan(cls))
         # check that all DCs specified as fields are also in class hierarchy
         # so that we inherit their fields; probably no way this could happen though
         for f in dataclasses.fields(cls):
@@ -711,8 +902,52 @@ def regex_dataclass(pattern, **deco_kwargs):
             return cls_(**cls_._pattern.data)
         type.__setattr__(cls, 'from_string', classmethod(_from_string))
 
+        def _from_strings(cls_, strs, *args, columns=False, on_error=None):
+            """Batch version of :meth:`from_string`, parsing each string in the
+            iterable *strs*.
+
+            Args:
+                strs (iterable of str): Input strings to parse.
+                args: Optional. Flags to pass to the pattern's ``match`` method.
+                columns (bool): Optional, default False. If True, return a dict
+                    mapping each field name to a list of that field's values (as
+                    given by :py:func:`dataclasses.asdict`) for the strings that
+                    were parsed. If False, return a list of instances.
+                on_error (callable): Optional. If given, strings which couldn't
+                    be parsed or coerced are skipped and *on_error* is called
+                    with the string and the exception that was raised. If not
+                    given (default), the exception is re-raised.
+            """
+            names = [f.name for f in dataclasses.fields(cls_)]
+            plan = cls_.__dict__.get('_from_strings_plan', None)
+            if columns:
+                cols = {name: [] for name in names}
+            else:
+                objs = []
+            for str_, data in cls_._pattern.iter_match(strs, *args, on_error=on_error):
+                try:
+                    if not columns:
+                        objs.append(cls_(**data))
+                        continue
+                    elif plan is None:
+                        d = dataclasses.asdict(cls_(**data))
+                        values = [d[name] for name in names]
+                    else:
+                        values = _regex_dataclass_batch_values(cls_, plan, data)
+                except Exception as exc:
+                    if on_error is None:
+                        raise
+                    on_error(str_, exc)
+                    continue
+                for col, v in zip(cols.values(), values):
+                    col.append(v)
+            return (cols if columns else objs)
+        type.__setattr__(cls, 'from_strings', classmethod(_from_strings))
+
         type.__setattr__(cls, '_is_regex_dataclass', True)
         type.__setattr__(cls, '_pattern', pattern)
+        type.__setattr__(cls, '_from_strings_plan',
+            (None if custom_init else _regex_dataclass_batch_plan(cls)))
         return cls
     return _dataclass_decorator
 
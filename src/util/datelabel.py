@@ -40,6 +40,7 @@ objects are best illustrated by examples:
 import abc
 import copy
 import enum
+import functools
 import re
 import datetime
 import operator as op
@@ -408,6 +409,31 @@ class AtomicInterval(object):
 
 # ===============================================================
 
+@functools.lru_cache(maxsize=2 ** 16)
+def _interned(cls, *args, **kwargs):
+    """Bounded LRU cache of :class:`DateRange`, :class:`Date` and
+    :class:`DateFrequency` objects, keyed on the arguments they were constructed
+    from, so that labels which occur repeatedly (e.g. in the filenames of
+    every variable in a catalog) are only parsed once and share one instance.
+    Objects obtained from the cache must be treated as immutable.
+    """
+    return cls(*args, **kwargs)
+
+def _intern(cls, *args, **kwargs):
+    try:
+        return _interned(cls, *args, **kwargs)
+    except TypeError:
+        # unhashable input; cls() will raise if it's invalid
+        return cls(*args, **kwargs)
+
+def _pack_datetime(dt):
+    """Return *dt* as an integer number of microseconds, which orders the same
+    way as the datetimes.
+    """
+    return (
+        ((dt.toordinal() * 24 + dt.hour) * 60 + dt.minute) * 60 + dt.second
+    ) * 1000000 + dt.microsecond
+
 class DatePrecision(enum.IntEnum):
     """:py:class:`~enum.IntEnum` to encode the recognized levels of precision
     for :class:`Date`\s and :class:`DateRange`\s. Example:
@@ -431,6 +457,8 @@ class DatePrecision(enum.IntEnum):
 class DateMixin(object):
     """Utility methods for dealing with dates.
     """
+    __slots__ = ()
+
     @staticmethod
     def date_format(dt, precision=None):
         """Print date *dt* in YYYYMMDDHHMMSS format, with length being set
@@ -519,6 +547,9 @@ class DateRange(AtomicInterval, DateMixin):
             the DateRange are known. E.g., DateRange('1990-1999') has a precision
             of DatePrecision.YEAR.
     """
+    # _key packs both endpoints and precision into one int, for cheap hashing
+    # and equality tests
+    __slots__ = ('_precision', '_key')
     _range_sep = '-'
 
     def __init__(self, start, end=None, precision=None, log=_log):
@@ -575,6 +606,27 @@ class DateRange(AtomicInterval, DateMixin):
         else:
             self.precision, _ = self._precision_check(prec0, prec1)
 
+    @property
+    def precision(self):
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        self._precision = value
+        prec = 0 if value is None else int(value) + 2
+        self._key = (
+            (_pack_datetime(self._lower) << 64) | _pack_datetime(self._upper)
+        ) << 4 | prec
+
+    @classmethod
+    def from_struct(cls, *args, **kwargs):
+        """Object instantiation method used by :func:`src.util.dataclass.mdtf_dataclass`
+        for type coercion. Takes the same arguments as the class's constructor,
+        but returns an instance shared with previous calls with the same
+        arguments, which must not be modified.
+        """
+        return _intern(cls, *args, **kwargs)
+
     @property
     def is_static(self):
         """Property indicating time-independent data (e.g., ``fx`` in the CMIP6 DRS.)
@@ -617,15 +669,17 @@ class DateRange(AtomicInterval, DateMixin):
     def _coerce_to_self(cls, item, precision=None):
         # hacky; should to be a better way to write this
         if isinstance(item, cls) or getattr(item, 'is_static', False):
-            if precision is not None:
+            if precision is not None and item.precision != precision:
+                # item may be shared; see from_struct()
+                item = copy.copy(item)
                 item.precision = precision
             return item
         else:
             try:
                 if precision is not None:
-                    return cls(item, precision=precision)
+                    return cls.from_struct(item, precision=precision)
                 else:
-                    return cls(item)
+                    return cls.from_struct(item)
             except Exception:
                 raise TypeError((f"Comparison not supported between {cls.__name__} "
                     f"and {type(item).__name__} ({repr(item)})."))
@@ -754,6 +808,8 @@ class DateRange(AtomicInterval, DateMixin):
     def __ge__(self, other):
         return self._date_range_compare_common(other, '__ge__')
     def __eq__(self, other):
+        if type(other) is type(self):
+            return self._key == other._key
         # Don't want check for static date in this case
         try:
             other = self._coerce_to_self(other)
@@ -764,7 +820,7 @@ class DateRange(AtomicInterval, DateMixin):
             and (self.precision == prec_other)
 
     def __hash__(self):
-        return hash((self.__class__, self.lower, self.upper, self.precision))
+        return hash((self.__class__, self._key))
 
 class Date(DateRange):
     """Defines a single date with variable level precision.
@@ -788,6 +844,7 @@ class Date(DateRange):
 
     """
     _datetime_attrs = ('year','month','day','hour','minute','second')
+    __slots__ = _datetime_attrs
 
     def __init__(self, *args, **kwargs):
         """Constructor.
@@ -845,8 +902,9 @@ class Date(DateRange):
                 break
         return tuple(ans)
 
-    @classmethod
-    def _parse_input_string(cls, s):
+    @staticmethod
+    @functools.lru_cache(maxsize=2 ** 12)
+    def _parse_input_string(s):
         """Parse date strings in `YYYY-MM-DD` or `YYYYMMDDHH` formats.
         """
         if '-' in s:
@@ -911,6 +969,8 @@ class Date(DateRange):
         well as date, but *only up to stated precision*, eg Date(2019,5) will ==
         datetime.datetime(2019,05,18).
         """
+        if type(other) is type(self) and self._key == other._key:
+            return True
         try:
             return self._tuple_compare(other, op.eq)
         except TypeError:
@@ -920,7 +980,7 @@ class Date(DateRange):
         return (not self.__eq__(other)) # more foolproof
 
     def __hash__(self):
-        return hash((self.__class__, self.lower, self.upper, self.precision))
+        return hash((self.__class__, self._key))
 
 class _StaticTimeDependenceBase(object):
     """Dummy class to label sentinel objects for use in describing static data
@@ -957,6 +1017,10 @@ class _FXDateMin(_StaticTimeDependenceBase, Date):
     def __repr__(self):
         return "_FXDate()"
 
+    def __reduce__(self):
+        # unpickle to the singleton instance
+        return 'FXDateMin'
+
     @property
     def start(self):
         return self.lower
@@ -977,6 +1041,10 @@ class _FXDateMax(_StaticTimeDependenceBase, Date):
     def __repr__(self):
         return "_FXDateMax()"
 
+    def __reduce__(self):
+        # unpickle to the singleton instance
+        return 'FXDateMax'
+
     @property
     def start(self):
         return self.upper
@@ -998,6 +1066,10 @@ class _FXDateRange(_StaticTimeDependenceBase, DateRange):
     def __repr__(self):
         return "_FXDateRange()"
 
+    def __reduce__(self):
+        # unpickle to the singleton instance
+        return 'FXDateRange'
+
     @property
     def start(self):
         return FXDateMin
@@ -1045,9 +1117,10 @@ class DateFrequency(datetime.timedelta):
     @classmethod
     def from_struct(cls, str_):
         """Object instantiation method used by :func:`src.util.dataclass.mdtf_dataclass`
-        for type coercion.
+        for type coercion. Returns an instance shared with previous calls with
+        the same *str_*; see :meth:`DateRange.from_struct`.
         """
-        return cls.__new__(cls, str_, None)
+        return _intern(cls, str_)
 
     @classmethod
     def _parse_input_string(cls, quantity, unit):
@@ -1155,6 +1228,10 @@ class DateFrequency(datetime.timedelta):
     def __hash__(self):
         return hash((self.__class__, self.quantity, self.unit))
 
+    def __reduce__(self):
+        # timedelta's __reduce__ passes (days, seconds, microseconds) to __new__
+        return (self.__class__, (self.quantity, self.unit))
+
 class _FXDateFrequency(DateFrequency, _StaticTimeDependenceBase):
     """Singleton placeholder/sentinel object for use in describing static data
     with no time dependence.
@@ -1173,6 +1250,10 @@ class _FXDateFrequency(DateFrequency, _StaticTimeDependenceBase):
     def __deepcopy__(self, memo):
         return self.__class__.__new__(self.__class__)
 
+    def __reduce__(self):
+        # unpickle to the singleton instance
+        return 'FXDateFrequency'
+
 FXDateFrequency = _FXDateFrequency()
 """Singleton placeholder/sentinel object for use in describing static data
 with no time dependence.
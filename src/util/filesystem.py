@@ -4,6 +4,7 @@ files.
 import os
 import io
 import collections
+import concurrent.futures
 from distutils.spawn import find_executable
 import glob
 import json
@@ -113,6 +114,34 @@ def recursive_copy(src_files, src_root, dest_root, copy_function=None,
     for src, dest in zip(src_files, dest_files):
         copy_function(src, dest)
 
+def copy_path(src, dest, overwrite=False):
+    """Copy the file, or directory tree (eg. a Zarr store), *src* to *dest*
+    with :py:func:`shutil.copy2`. *dest* is a separate copy rather than a hard
+    link, so that modifying one in place doesn't alter the other. Any missing
+    parent directories of *dest* are created.
+
+    Args:
+        src (str): Absolute path to an existing file or directory.
+        dest (str): Absolute path of copy to create.
+        overwrite (bool): Optional, default False. Determines whether to raise
+            error if *dest* already exists.
+
+    Raises:
+        :py:class:`OSError`: If *overwrite* is False and *dest* exists.
+    """
+    if os.path.lexists(dest):
+        if not overwrite:
+            raise OSError('{} exists.'.format(dest))
+        if os.path.isdir(dest) and not os.path.islink(dest):
+            shutil.rmtree(dest)
+        else:
+            os.remove(dest)
+    os.makedirs(os.path.normpath(os.path.dirname(dest)), exist_ok=True)
+    if os.path.isdir(src):
+        shutil.copytree(src, dest)
+    else:
+        shutil.copy2(src, dest)
+
 def check_executable(exec_name):
     """Tests if the executable *exec_name* is found on the current ``$PATH``.
 
@@ -154,6 +183,87 @@ def find_files(src_dirs, filename_globs, n_files=None):
     return list(files)
 
 
+def scan_dir(path):
+    """List the contents of the directory *path* with :py:func:`os.scandir`.
+    Default *scan_function* for :func:`walk_parallel`.
+
+    Returns:
+        Tuple of lists of names of subdirectories and of files in *path*.
+        Symbolic links to directories are omitted from both lists.
+    """
+    dirs = []
+    files = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                files.append(entry.name)
+            elif not entry.is_symlink():
+                dirs.append(entry.name)
+    return dirs, files
+
+def walk_parallel(top, n_threads=4, scan_function=None, exclude_dir=None):
+    """Crawl the directory hierarchy rooted at *top*, similarly to
+    :py:func:`os.walk`, but listing directories concurrently with a pool of
+    *n_threads* threads. This gives a large speedup on filesystems where
+    ``stat``/``readdir`` latency dominates (NFS, Lustre, etc.). Symbolic links
+    to directories are not followed, and unreadable directories are skipped.
+
+    Args:
+        top (str): Root directory to begin crawling at.
+        n_threads (int): Optional, default 4. Number of threads to use.
+        scan_function (function): Optional. Function taking the path to a
+            directory and returning a tuple of a list of names of
+            subdirectories to crawl and an arbitrary second value, which is
+            yielded as *filenames*. Defaults to :func:`scan_dir`.
+        exclude_dir (function): Optional. Function taking the path to a
+            subdirectory and returning True if it (and its contents) should be
+            skipped.
+
+    Yields:
+        Tuples of *(dirpath, dirnames, filenames)*, as in :py:func:`os.walk`.
+        Directories are yielded in the order their listings finish, so parents
+        are yielded before their children but the order is otherwise undefined.
+        Listing of subdirectories proceeds while the caller processes each
+        result.
+    """
+    if scan_function is None:
+        scan_function = scan_dir
+    n_threads = max(int(n_threads), 1)
+
+    def _scan(path):
+        try:
+            return path, scan_function(path)
+        except OSError as exc:
+            _log.debug("Couldn't list '%s': %r", path, exc)
+            return path, None
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=n_threads, thread_name_prefix='walk'
+    )
+    try:
+        pending = {executor.submit(_scan, top)}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                root, result = future.result()
+                if result is None:
+                    continue
+                dirs, files = result
+                for d in dirs:
+                    path = os.path.join(root, d)
+                    if exclude_dir is None or not exclude_dir(path):
+                        pending.add(executor.submit(_scan, path))
+                yield root, dirs, files
+    finally:
+        # don't wait for queued listings if the caller stops iterating early
+        executor.shutdown(wait=True, cancel_futures=True)
+
 def check_dir(dir_, attr_name="", create=False):
     """Check existence of directories. No action is taken for directories that
     already exist; nonexistent directories either raise a
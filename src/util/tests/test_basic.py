@@ -50,6 +50,27 @@ class TestSingleton(unittest.TestCase):
         temp2 = Temp2()
         self.assertEqual(temp2.foo, 0)
 
+    def test_singleton_threads(self):
+        # concurrent first calls get the same instance
+        import threading
+        import time
+
+        class Temp3(util.Singleton):
+            def __init__(self):
+                time.sleep(0.05)  # widen window for a race
+                self.foo = 0
+        instances = []
+
+        def _get():
+            instances.append(Temp3())
+        threads = [threading.Thread(target=_get) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(set(id(x) for x in instances)), 1)
+        Temp3._reset()
+
 class TestMultiMap(unittest.TestCase):
     def test_multimap_inverse(self):
         # test inverse map
@@ -31,6 +31,45 @@ class TestRegexPattern(unittest.TestCase):
         self.assertEqual(b.foo, 3)
         self.assertEqual(b.bar, 4)
 
+    def test_from_strings(self):
+        regex = r"/(?P<foo>\d+)/(?P<bar>\d+)/other_text"
+        ppat = util.RegexPattern(regex, input_field='path')
+
+        @util.regex_dataclass(ppat)
+        class A():
+            path: str
+            foo: int
+            bar: int
+            baz: str = 'x'
+
+        self.assertIsNotNone(A._from_strings_plan)
+        strs = ['/1/2/other_text', 'bad', '/3/4/other_text', '/5/six/other_text']
+        errors = []
+        on_error = (lambda s, exc: errors.append(s))
+        objs = A.from_strings(strs, on_error=on_error)
+        self.assertEqual([(a.foo, a.bar) for a in objs], [(1, 2), (3, 4)])
+        self.assertEqual(errors, ['bad', '/5/six/other_text'])
+        errors.clear()
+        cols = A.from_strings(strs, columns=True, on_error=on_error)
+        self.assertDictEqual(cols, {
+            'path': ['/1/2/other_text', '/3/4/other_text'],
+            'foo': [1, 3], 'bar': [2, 4], 'baz': ['x', 'x']
+        })
+        self.assertEqual(errors, ['bad', '/5/six/other_text'])
+        with self.assertRaises(exceptions.RegexParseError):
+            _ = A.from_strings(strs, columns=True)
+
+    def test_from_strings_mandatory(self):
+        ppat = util.RegexPattern(r"(?P<foo>\d+)")
+
+        @util.regex_dataclass(ppat)
+        class A():
+            foo: int = util.MANDATORY
+            bar: int = util.MANDATORY
+
+        with self.assertRaises(exceptions.DataclassParseError):
+            _ = A.from_strings(['1'], columns=True)
+
 class TestRegexDataclassInheritance(unittest.TestCase):
     def test_initvar(self):
         grid_label_regex = util.RegexPattern(r"""
@@ -71,6 +110,17 @@ class TestRegexDataclassInheritance(unittest.TestCase):
             {'grid_label': 'gm6', 'grid_number': 6, 'spatial_avg': 'global_mean',
              'directory': '/CMIP6/bazinga/gm6/', 'activity_id': 'bazinga'}
         )
+        # composition: from_strings constructs instances to get column values
+        self.assertIsNone(CMIP6_DRSDirectory._from_strings_plan)
+        cols = CMIP6_DRSDirectory.from_strings(
+            ['/CMIP6/bazinga/gm6/', '/foo/g7/'], columns=True
+        )
+        self.assertDictEqual(cols, {
+            'grid_label': ['gm6', 'g7'], 'grid_number': [6, 7],
+            'spatial_avg': ['global_mean', None],
+            'directory': ['/CMIP6/bazinga/gm6/', '/foo/g7/'],
+            'activity_id': ['bazinga', 'foo']
+        })
 
     def test_conflicts(self):
         parent1_regex = util.RegexPattern(r"""
@@ -178,6 +228,29 @@ class TestMDTFDataclass(unittest.TestCase):
         with self.assertRaises(exceptions.DataclassParseError):
             _ = Dummy(a="a string")
 
+    def test_disable_type_checks(self):
+        @util.mdtf_dataclass
+        class Dummy(object):
+            a: str = None
+            b: int = None
+            c: str = util.MANDATORY
+
+            def __post_init__(self):
+                self.a = 5
+
+        self.assertEqual(len(Dummy._mdtf_dataclass_type_plan), 3)
+        with self.assertRaises(exceptions.DataclassParseError):
+            _ = Dummy(b="5", c="c")
+        try:
+            util.set_dataclass_type_checks(False)
+            dummy = Dummy(b="5", c="c")
+            self.assertEqual(dummy.a, 5)
+            self.assertEqual(dummy.b, 5) # coercion still done
+            with self.assertRaises(exceptions.DataclassParseError):
+                _ = Dummy(b="5")
+        finally:
+            util.set_dataclass_type_checks(True)
+
     def test_decorator_args(self):
         @util.mdtf_dataclass(frozen=True)
         class Dummy(object):
@@ -1,10 +1,11 @@
 import os
 import unittest
 import datetime
+import pickle
 from src.util.datelabel import Date as dt
 from src.util.datelabel import DateRange as dt_range
 from src.util.datelabel import DateFrequency as dt_freq
-from src.util.datelabel import FXDateMin, FXDateMax, FXDateRange
+from src.util.datelabel import FXDateMin, FXDateMax, FXDateRange, FXDateFrequency
 from src.util.exceptions import FXDateException, MixedDatePrecisionException
 
 class TestDate(unittest.TestCase):
@@ -275,6 +276,23 @@ class TestDateRange(unittest.TestCase):
         self.assertEqual(rng.start, dt('19800101'))
         self.assertEqual(rng.end, dt('19871225'))
 
+    def test_from_struct_interned(self):
+        self.assertIs(dt_range.from_struct('1980-1990'),
+            dt_range.from_struct('1980-1990'))
+        self.assertIsNot(dt_range.from_struct('1980-1990'),
+            dt_range.from_struct('198001-199012'))
+        d1 = dt.from_struct('198001')
+        d2 = dt.from_struct('198912')
+        self.assertIs(dt.from_struct('198001'), d1)
+        rng = dt_range.from_struct(d1, d2)
+        self.assertIs(dt_range.from_struct(d1, d2), rng)
+        self.assertEqual(rng, dt_range('198001-198912'))
+        self.assertEqual(hash(rng), hash(dt_range('198001-198912')))
+        # coercing to another precision mustn't modify the shared instance
+        d3 = dt._coerce_to_self(d1, precision=1)
+        self.assertEqual(d3.precision, 1)
+        self.assertEqual(dt.from_struct('198001').precision, 2)
+
 class TestFXDates(unittest.TestCase):
     def test_compare(self):
         dtr = dt_range('19800101-19901231')
@@ -340,6 +358,10 @@ class TestFXDates(unittest.TestCase):
         self.assertEqual(str(FXDateMax), "<N/A>")
         self.assertEqual(str(FXDateRange), "<N/A>")
 
+    def test_pickle(self):
+        for obj in [FXDateMin, FXDateMax, FXDateRange]:
+            self.assertIs(pickle.loads(pickle.dumps(obj)), obj)
+
 class TestDateFrequency(unittest.TestCase):
     def test_string_parsing(self):
         self.assertEqual(dt_freq('1hr'), dt_freq(1, 'hr'))
@@ -400,5 +422,18 @@ class TestDateFrequency(unittest.TestCase):
         self.assertFalse(dt_freq(6,'dy').is_static)
         self.assertFalse(dt_freq(1,'hr').is_static)
 
+    def test_from_struct_interned(self):
+        self.assertIs(dt_freq.from_struct('mon'), dt_freq.from_struct('mon'))
+        self.assertEqual(dt_freq.from_struct('mon'), dt_freq('mon'))
+
+    def test_pickle(self):
+        for obj in [dt_freq('6hr'), dt_freq('mon'), dt_freq('fx')]:
+            obj2 = pickle.loads(pickle.dumps(obj))
+            self.assertEqual(obj2, obj)
+            self.assertEqual(obj2.format(), obj.format())
+        self.assertIs(pickle.loads(pickle.dumps(FXDateFrequency)), FXDateFrequency)
+        dtr = dt_range('19800101-19901231')
+        self.assertEqual(pickle.loads(pickle.dumps(dtr)), dtr)
+
 if __name__ == '__main__':
     unittest.main()
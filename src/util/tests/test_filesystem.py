@@ -1,4 +1,7 @@
+import os
 import json
+import shutil
+import tempfile
 import textwrap
 import unittest
 import unittest.mock as mock
@@ -34,6 +37,82 @@ class TestCheckDirs(unittest.TestCase):
             self.fail()
         mock_makedirs.assert_called_once_with('DUMMY/PATH/NAME', exist_ok=False)
 
+class TestCopyPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp_dir, 'src.txt')
+        with open(self.src, 'w') as f:
+            f.write('contents')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_copy(self):
+        dest = os.path.join(self.tmp_dir, 'A', 'B', 'dest.txt')
+        util.copy_path(self.src, dest)
+        self.assertFalse(os.path.samefile(self.src, dest))
+        # modifying copy leaves original unchanged
+        with open(dest, 'w') as f:
+            f.write('new')
+        with open(self.src, 'r') as f:
+            self.assertEqual(f.read(), 'contents')
+
+    def test_overwrite(self):
+        dest = os.path.join(self.tmp_dir, 'dest.txt')
+        with open(dest, 'w') as f:
+            f.write('old')
+        with self.assertRaises(OSError):
+            util.copy_path(self.src, dest)
+        util.copy_path(self.src, dest, overwrite=True)
+        with open(dest, 'r') as f:
+            self.assertEqual(f.read(), 'contents')
+
+    def test_directory(self):
+        src_dir = os.path.join(self.tmp_dir, 'store')
+        os.makedirs(os.path.join(src_dir, 'var'))
+        src = os.path.join(src_dir, 'var', '0.0')
+        shutil.copy2(self.src, src)
+        dest_dir = os.path.join(self.tmp_dir, 'A', 'store')
+        dest = os.path.join(dest_dir, 'var', '0.0')
+        util.copy_path(src_dir, dest_dir)
+        self.assertTrue(os.path.isfile(dest))
+        self.assertFalse(os.path.samefile(src, dest))
+        with self.assertRaises(OSError):
+            util.copy_path(src_dir, dest_dir)
+        util.copy_path(src_dir, dest_dir, overwrite=True)
+        self.assertTrue(os.path.isfile(dest))
+
+class TestWalkParallel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for d in ['A/B/C', 'A/D', 'E']:
+            os.makedirs(os.path.join(self.tmp_dir, d))
+        for f in ['f1', 'A/f2', 'A/B/f3', 'A/B/C/f4', 'A/D/f5', 'E/f6']:
+            with open(os.path.join(self.tmp_dir, f), 'w') as f_:
+                f_.write('')
+        os.symlink(os.path.join(self.tmp_dir, 'A'), os.path.join(self.tmp_dir, 'E', 'link'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_walk_parallel(self):
+        for n_threads in [1, 4]:
+            found = {
+                root: sorted(files) for root, _, files in \
+                util.walk_parallel(self.tmp_dir, n_threads=n_threads)
+            }
+            expected = {
+                root: sorted(files) for root, _, files in os.walk(self.tmp_dir)
+            }
+            self.assertEqual(found, expected)
+
+    def test_walk_parallel_exclude(self):
+        found = [
+            os.path.relpath(root, self.tmp_dir) for root, _, _ in \
+            util.walk_parallel(self.tmp_dir, exclude_dir=lambda p: p.endswith('B'))
+        ]
+        self.assertCountEqual(found, ['.', 'A', 'A/D', 'E'])
+
 class TestBumpVersion(unittest.TestCase):
     @mock.patch('os.path.exists', return_value=False)
     def test_bump_version_noexist(self, mock_exists):
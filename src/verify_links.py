@@ -18,8 +18,10 @@ if sys.version_info[0] != 3 or sys.version_info[1] < 10:
 import os
 import argparse
 import collections
-import itertools
+import concurrent.futures
+import io
 from html.parser import HTMLParser
+import mimetypes
 import re
 import urllib.parse
 import urllib.request
@@ -40,12 +42,12 @@ Attributes:
 
 class LinkParser(HTMLParser):
     """Custom subclass of :py:class:`~html.parser.HTMLParser` which constructs
-    an iterable over each ``<a>`` tag. Adapted from
+    a list of the targets of each ``<a>`` tag. Adapted from
     `<https://stackoverflow.com/a/41663924>`__.
     """
     def reset(self):
         super(LinkParser, self).reset()
-        self.links = iter([])
+        self.links = []
 
     def handle_starttag(self, tag, attrs):
         """Custom code for this subclass that extracts contents of ``<a>`` tags.
@@ -53,11 +55,12 @@ class LinkParser(HTMLParser):
         if tag.lower() == 'a':
             for name, value in attrs:
                 if name.lower() == 'href':
-                    self.links = itertools.chain(self.links, [value])
+                    self.links.append(value)
 
 
 class LinkVerifier(object):
-    def __init__(self, root, rel_path_root=None, verbose=False, log=None):
+    def __init__(self, root, rel_path_root=None, verbose=False, log=None,
+        max_workers=None, cache=None):
         """Initialize search for broken links.
 
         Args:
@@ -70,6 +73,13 @@ class LinkVerifier(object):
                 file.)
             verbose (bool, default False): Set to True to print each file
                 examined.
+            log (optional): Logger to report missing files to.
+            max_workers (int, optional): Number of threads used to check links
+                to remote URLs. Links to local files are always checked in the
+                calling thread.
+            cache (dict, optional): Links found in each URL that has already
+                been checked, which can be shared between LinkVerifiers so
+                that each file is only examined once per run.
         """
         def munge_input_url(url):
             url_parts = urllib.parse.urlsplit(url)
@@ -101,6 +111,16 @@ class LinkVerifier(object):
             self.log = _log
         else:
             self.log = log
+        self.max_workers = max_workers
+        if cache is None:
+            self._cache = dict()
+        else:
+            self._cache = cache
+
+    @staticmethod
+    def is_local(url):
+        """True if *url* is a file:// URL on the local filesystem."""
+        return url.startswith(('file:///', 'file://localhost/'))
 
     @staticmethod
     def gen_links(f, parser):
@@ -123,9 +143,13 @@ class LinkVerifier(object):
         for line in f:
             parser.feed(line.decode(encoding))
             yield from parser.links
+            parser.links = []
 
     def check_one_url(self, link):
         """Get list of URLs linked to from the current URL (in *link*.target).
+        Local files are checked with :meth:`check_local_file`, and other URLs
+        with :meth:`check_remote_url`; the result for each URL (ignoring
+        fragments) is cached, unless it couldn't be opened.
 
         Args:
             link (:class:`Link`): Link to check. Only the URL in *link*.target
@@ -137,9 +161,44 @@ class LinkVerifier(object):
             contained in *link*.target, expressed as :class:`Link` objects.
         """
         if hasattr(link, 'target'):
-            url = link.target
+            url, _ = urllib.parse.urldefrag(link.target)
         else:
             return None
+        if url in self._cache:
+            return self._cache[url]
+        if self.is_local(url):
+            links = self.check_local_file(url)
+        else:
+            links = self.check_remote_url(url)
+        if links is not None:
+            self._cache[url] = links
+        return links
+
+    def check_local_file(self, url):
+        """Version of :meth:`check_remote_url` for file:// URLs, which reads the
+        file directly instead of going through :mod:`urllib`.
+        """
+        path = urllib.request.url2pathname(urllib.parse.urlsplit(url).path)
+        if not os.path.isfile(path):
+            str_ = util.abbreviate_path(path, self.WK_DIR, '$WK_DIR')
+            self.log.error("Missing '%s'.", str_, tags=util.ObjectLogTag.BANNER)
+            return None
+        # same test for html as urllib's FileHandler
+        mime_type = mimetypes.guess_type(path)[0] or 'text/plain'
+        if mime_type.split('/')[-1] != 'html':
+            return []
+        parser = LinkParser()
+        with io.open(path, 'r', encoding='utf-8', errors='replace') as f:
+            parser.feed(f.read())
+        return [
+            Link(origin=url, target=urllib.parse.urljoin(url, link_out)) \
+                for link_out in parser.links
+        ]
+
+    def check_remote_url(self, url):
+        """Open *url* with :mod:`urllib` and return the list of links it
+        contains, as in :meth:`check_one_url`.
+        """
         try:
             f = urllib.request.urlopen(url)
         except urllib.error.HTTPError as e:
@@ -192,30 +251,45 @@ class LinkVerifier(object):
         queue = [Link(origin=None, target=root_url)]
         if self.verbose:
             self.log.info("Checking '%s'.", root_url)
-        while queue:
-            current_link = queue.pop(0)
-            if self.verbose:
-                self.log.info("\tChecking {}".format(
-                    current_link.target[len(root_parent) + 1:]
-                ), end="")
-            new_links = self.check_one_url(current_link)
-            if new_links is None:
-                if self.verbose:
-                    self.log.info('...MISSING!')
-                missing.append(current_link)
-            else:
-                if self.verbose:
-                    self.log.info('...OK')
-                # restrict links to those that start with root_parent
-                new_links = [
-                    lnk for lnk in new_links if lnk.target not in known_urls \
-                        and lnk.target.startswith(root_parent)
-                ]
-                queue.extend(new_links)
-                # update known_urls so that we don't chase cycles
-                known_urls.update([lnk.target for lnk in new_links])
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers) as executor:
+            while queue:
+                # check each level of the search in parallel
+                level, queue = queue, []
+                for current_link, new_links in \
+                    zip(level, self.check_urls(level, executor)):
+                    if new_links is None:
+                        if self.verbose:
+                            self.log.info("\tChecking %s...MISSING!",
+                                current_link.target[len(root_parent) + 1:])
+                        missing.append(current_link)
+                        continue
+                    if self.verbose:
+                        self.log.info("\tChecking %s...OK",
+                            current_link.target[len(root_parent) + 1:])
+                    # restrict links to those that start with root_parent
+                    new_links = [
+                        lnk for lnk in new_links if lnk.target not in known_urls \
+                            and lnk.target.startswith(root_parent)
+                    ]
+                    queue.extend(new_links)
+                    # update known_urls so that we don't chase cycles
+                    known_urls.update([lnk.target for lnk in new_links])
         return missing
 
+    def check_urls(self, links, executor):
+        """Return the result of :meth:`check_one_url` for each of *links*, in
+        order. Remote URLs are checked in parallel by *executor*.
+        """
+        futures = [
+            None if self.is_local(lnk.target) \
+                else executor.submit(self.check_one_url, lnk) for lnk in links
+        ]
+        return [
+            self.check_one_url(lnk) if future is None else future.result() \
+                for lnk, future in zip(links, futures)
+        ]
+
     def group_relative_links(self, missing):
         """Format paths to missing linked files as relative paths, grouped by
         POD.
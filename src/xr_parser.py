@@ -5,6 +5,7 @@ package, used as a third-party dependency, as well as the :doc:`src.data_model`
 is recommended.
 """
 import collections
+import copy
 import functools
 import itertools
 import re
@@ -1285,8 +1286,18 @@ class DefaultDatasetParser:
             Except in specific cases, attributes of *var* are updated to reflect
             the 'ground truth' of data in *ds*.
         """
+        # Preprocessor worker threads share this parser, so keep the state for
+        # this call (attrs_backup, log) on a copy of it.
+        parser = copy.copy(self)
+        parser.attrs_backup = dict()
         if var is not None:
-            self.log = var.log
+            parser.log = var.log
+        return parser._parse(var, ds)
+
+    def _parse(self, var, ds):
+        """Implementation of :meth:`parse`, called on a copy of the parser
+        with its own :attr:`attrs_backup` and :attr:`log`.
+        """
         self.normalize_pre_decode(ds)
         ds = xr.decode_cf(ds,
                           decode_coords=True,  # parse coords attr
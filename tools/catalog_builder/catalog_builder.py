@@ -13,6 +13,7 @@
 # for the preprocessor and the MDTF-diagnostics framework
 
 import click
+import fnmatch
 import intake
 import os
 import pathlib
@@ -28,6 +29,10 @@ from ecgtools.builder import INVALID_ASSET, TRACEBACK
 from ecgtools.parsers import parse_cmip6
 from ecgtools.parsers.cesm import parse_cesm_timeseries
 
+# import the framework's utility functions for the directory crawler
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.util import walk_parallel
+
 
 # The ClassMaker is cribbed from SO
 # https://stackoverflow.com/questions/1176136/convert-string-to-python-class-object
@@ -172,6 +177,54 @@ class CatalogBase(object):
                           # should be equal to # threads you are using
                           extension='.nc'  # extension of target files
                           )
+        # settings for get_assets
+        self.data_paths = data_paths
+        self.exclude_patterns = exclude_patterns
+        self.include_patterns = include_patterns
+        self.dir_depth = dir_depth
+        self.nthreads = nthreads
+
+    def get_assets(self):
+        """Crawl the data_paths for netcdf files, listing directories in parallel
+        with a thread pool, instead of using ecgtools' directory listing.
+        Directories or files matching any of the exclude_patterns are skipped,
+        and files must match one of the include_patterns (if given).
+        """
+        nthreads = self.nthreads
+        if nthreads is None or nthreads < 1:
+            nthreads = os.cpu_count()
+        max_level = max(self.dir_depth - 1, 0)  # dir_depth=1: files in root dir
+
+        def _excluded(path):
+            return any(fnmatch.fnmatch(path, pat) for pat in (self.exclude_patterns or []))
+
+        def _included(path):
+            if not self.include_patterns:
+                return True
+            return any(fnmatch.fnmatch(path, pat) for pat in self.include_patterns)
+
+        assets = []
+        for top in self.data_paths:
+            top = os.path.abspath(top)
+
+            def _exclude_dir(path):
+                level = os.path.relpath(path, top).count(os.sep) + 1
+                return level > max_level or _excluded(path)
+
+            for root, _, files in walk_parallel(top, n_threads=nthreads,
+                                                exclude_dir=_exclude_dir):
+                for f in files:
+                    path = os.path.join(root, f)
+                    if f.endswith('.nc') and _included(path) and not _excluded(path):
+                        assets.append(path)
+        return sorted(assets)
+
+    def build_catalog(self, parsing_func):
+        """Parse the files found by :meth:`get_assets` with *parsing_func*.
+        """
+        self.cb.assets = self.get_assets()
+        print(f"Found {len(self.cb.assets)} files")
+        return self.cb.parse(parsing_func=parsing_func).clean_dataframe()
 
     def call_save(self, output_dir: str,
                   output_filename: str
@@ -207,7 +260,7 @@ class CatalogCMIP(CatalogBase):
             file_parse_method = parse_cmip6
         # see https://github.com/ncar-xdev/ecgtools/blob/main/ecgtools/parsers/cmip6.py
         # for more parsing methods
-        self.cb = self.cb.build(parsing_func=file_parse_method)
+        self.cb = self.build_catalog(file_parse_method)
         print('Build complete')
 
 
@@ -233,7 +286,7 @@ class CatalogGFDL(CatalogBase):
             file_parse_method = parse_gfdl_pp_ts
         # see https://github.com/ncar-xdev/ecgtools/blob/main/ecgtools/parsers/cmip6.py
         # for more parsing methods
-        self.cb = self.cb.build(parsing_func=file_parse_method)
+        self.cb = self.build_catalog(file_parse_method)
         print('Build complete')
 
 
@@ -266,7 +319,7 @@ class CatalogCESM(CatalogBase):
             file_parse_method = parse_cesm_timeseries
         # see https://github.com/ncar-xdev/ecgtools/blob/main/ecgtools/parsers/cesm.py
         # for more parsing methods
-        self.cb.build(file_parse_method)
+        self.cb = self.build_catalog(file_parse_method)
 
 
 def load_config(config):